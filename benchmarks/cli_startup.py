@@ -0,0 +1,59 @@
+"""
+Measure the startup of the CLI: wall time of --version, --help and the help of a subcommand, and the modules that
+took the longest to import according to python -X importtime.
+
+Usage:
+    python -m benchmarks.cli_startup [--runs 10] [--top 10]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+COMMAND = ["-m", "cognite.transformations_cli"]
+
+
+def wall_time(args: List[str], runs: int) -> float:
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *COMMAND, *args], capture_output=True, check=True)
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def slowest_imports(args: List[str], top: int) -> Tuple[float, List[Tuple[float, str]]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *COMMAND, *args], capture_output=True, text=True, check=True
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        if not line.startswith("import time:") or not fields[1].strip().isdigit():
+            continue
+        # Imports are indented by their nesting depth after the single space of the column separator
+        name = fields[2].rstrip()
+        if len(name) - len(name.lstrip()) == 1:
+            imports.append((int(fields[1]) / 1e6, name.strip()))
+    return sum(seconds for seconds, _ in imports), sorted(imports, reverse=True)[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    for command in [["--version"], ["--help"], ["deploy", "--help"]]:
+        total, imports = slowest_imports(command, args.top)
+        print(f"{' '.join(command)}")
+        print(f"  Wall time:    {wall_time(command, args.runs) * 1000:7.1f} ms (median of {args.runs})")
+        print(f"  Import time:  {total * 1000:7.1f} ms")
+        for seconds, name in imports:
+            print(f"    {seconds * 1000:7.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
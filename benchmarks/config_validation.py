@@ -0,0 +1,50 @@
+"""
+Measure building config objects from parsed manifests with the compiled construction plans, compared with
+dacite.from_dict, which resolves the type hints of every config class again for every manifest.
+
+Usage:
+    python -m benchmarks.config_validation [--manifests 5000]
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+import dacite
+
+from benchmarks.manifest_parsing import write_tree
+from cognite.transformations_cli.commands.deploy.config_builder import DACITE_CONFIG, build_config
+from cognite.transformations_cli.commands.deploy.load_yaml import _normalise_yaml
+from cognite.transformations_cli.commands.deploy.manifest_discovery import find_manifest_files
+from cognite.transformations_cli.commands.deploy.transformation_types import TransformationConfig
+
+
+def timed(action: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    action()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--manifests", type=int, default=5000)
+    args = parser.parse_args()
+
+    os.environ.setdefault("BENCH_CLIENT_ID", "bench-client")
+    os.environ.setdefault("BENCH_CLIENT_SECRET", "bench-secret")
+    with tempfile.TemporaryDirectory() as root:
+        manifests = write_tree(root, args.manifests)
+        config_dicts: List[Dict[str, Any]] = []
+        for path in find_manifest_files(manifests):
+            with open(path) as f:
+                config_dicts.append(_normalise_yaml(f.read(), "camel")[0])
+
+    before = timed(lambda: [dacite.from_dict(TransformationConfig, d, DACITE_CONFIG) for d in config_dicts])
+    after = timed(lambda: [build_config(TransformationConfig, d) for d in config_dicts])
+    print(f"{args.manifests} manifests")
+    print(f"  Config construction:  {before:6.2f} s with dacite, {after:6.2f} s compiled (x{before / after:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Count the requests deploy sends to a local stand-in API with adaptive batching, compared with the previous fixed
+batches of 5 items for every write.
+
+Usage:
+    python -m benchmarks.deploy_batching [--transformations 100 1000 10000] [--query-bytes 200] [--max-body-bytes N]
+"""
+import argparse
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from cognite.client.data_classes import Transformation, TransformationNotification, TransformationSchedule
+
+from benchmarks.stand_in_api import StandInAPI
+from cognite.transformations_cli.commands.deploy.batching import MAX_REQUEST_BYTES, AdaptiveBatcher
+from cognite.transformations_cli.commands.deploy.transformations_api import (
+    get_existing_schedules_dict,
+    get_existing_transformations,
+    upsert_notifications,
+    upsert_schedules,
+    upsert_transformations,
+)
+
+
+def _fixed_batcher(cls: Any, api: Any, operation: str, max_bytes: int = MAX_REQUEST_BYTES) -> AdaptiveBatcher:
+    # The previous behaviour: chunks of 5 items for every write, all external ids in one retrieve_multiple call
+    return AdaptiveBatcher(5 if operation != "retrieve" else 10**9, max_bytes=10**12)
+
+
+def deploy_once(n: int, query_bytes: int, max_body_bytes: Optional[int]) -> Tuple[int, float]:
+    with StandInAPI(max_body_bytes=max_body_bytes) as api:
+        client = api.client()
+        padding = "-- " + "x" * max(0, query_bytes - 20) + "\n"
+        transformations = [
+            Transformation(
+                external_id=f"bench-{i}",
+                name=f"bench-{i}",
+                query=f"{padding}select {i} as id",
+                conflict_mode="upsert",
+                is_public=True,
+                ignore_null_fields=True,
+            )
+            for i in range(n)
+        ]
+        ext_ids = [t.external_id for t in transformations]
+        schedules: Dict[str, TransformationSchedule] = {
+            ext_id: TransformationSchedule(external_id=ext_id, interval="0 * * * *") for ext_id in ext_ids
+        }
+        notifications: Dict[str, List[TransformationNotification]] = {
+            ext_id: [TransformationNotification(transformation_external_id=ext_id, destination="ops@example.com")]
+            for ext_id in ext_ids
+        }
+
+        start = time.perf_counter()
+        get_existing_transformations(client, ext_ids)
+        upsert_transformations(client, transformations, [], ext_ids, existing_transformations=[])
+        get_existing_schedules_dict(client, ext_ids)
+        upsert_schedules(client, {}, schedules, [], ext_ids)
+        upsert_notifications(client, {}, notifications, [], ext_ids)
+        return sum(api.state.requests.values()), time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transformations", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--query-bytes", type=int, default=200, help="Approximate size of every SQL query")
+    parser.add_argument(
+        "--max-body-bytes", type=int, default=None, help="Make the stand-in API answer 413 to larger request bodies"
+    )
+    args = parser.parse_args()
+
+    adaptive_for_api = AdaptiveBatcher.__dict__["for_api"]
+    print(f"SQL queries of about {args.query_bytes} bytes")
+    for n in args.transformations:
+        setattr(AdaptiveBatcher, "for_api", classmethod(_fixed_batcher))
+        try:
+            fixed_requests, fixed_elapsed = deploy_once(n, args.query_bytes, args.max_body_bytes)
+        finally:
+            setattr(AdaptiveBatcher, "for_api", adaptive_for_api)
+        requests, elapsed = deploy_once(n, args.query_bytes, args.max_body_bytes)
+        print(
+            f"  {n:>6} manifests: {fixed_requests:>6} requests ({fixed_elapsed:6.2f} s) with fixed batches, "
+            f"{requests:>6} requests ({elapsed:6.2f} s) with adaptive batches"
+        )
+
+
+if __name__ == "__main__":
+    main()
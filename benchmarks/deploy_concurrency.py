@@ -0,0 +1,72 @@
+"""
+Measure how the deploy upsert phases scale with ``--max-workers`` against a local stand-in API.
+
+Usage:
+    python -m benchmarks.deploy_concurrency [--transformations 500] [--latency 0.05] [--workers 1 2 4 8 16]
+"""
+import argparse
+import time
+from typing import Dict, List
+
+from cognite.client.data_classes import Transformation, TransformationNotification, TransformationSchedule
+
+from benchmarks.stand_in_api import StandInAPI
+from cognite.transformations_cli.commands.deploy.transformations_api import (
+    upsert_notifications,
+    upsert_schedules,
+    upsert_transformations,
+)
+
+
+def _transformations(n: int) -> List[Transformation]:
+    return [
+        Transformation(
+            external_id=f"bench-{i}",
+            name=f"bench-{i}",
+            query=f"select {i} as id",
+            destination=None,
+            conflict_mode="upsert",
+            is_public=True,
+            ignore_null_fields=True,
+        )
+        for i in range(n)
+    ]
+
+
+def deploy_once(n: int, latency: float, max_workers: int) -> float:
+    with StandInAPI(latency=latency) as api:
+        client = api.client()
+        transformations = _transformations(n)
+        ext_ids = [t.external_id for t in transformations]
+        schedules: Dict[str, TransformationSchedule] = {
+            ext_id: TransformationSchedule(external_id=ext_id, interval="0 * * * *") for ext_id in ext_ids
+        }
+        notifications: Dict[str, List[TransformationNotification]] = {
+            ext_id: [TransformationNotification(transformation_external_id=ext_id, destination="ops@example.com")]
+            for ext_id in ext_ids
+        }
+
+        start = time.perf_counter()
+        upsert_transformations(client, transformations, [], ext_ids, max_workers)
+        upsert_schedules(client, {}, schedules, [], ext_ids, max_workers)
+        upsert_notifications(client, {}, notifications, [], ext_ids, max_workers)
+        return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transformations", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every stand-in API request")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    print(f"{args.transformations} transformations, {args.latency * 1000:.0f} ms latency per request")
+    baseline = None
+    for workers in args.workers:
+        elapsed = deploy_once(args.transformations, args.latency, workers)
+        baseline = baseline or elapsed
+        print(f"  max-workers={workers:<3} {elapsed:7.2f} s  (speed-up x{baseline / elapsed:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Measure how manifest parsing scales with ``--parse-workers`` over a synthetic manifest tree, and parsing with a cold
+and a warm ``--parse-cache``, and loading the manifests from a compiled bundle.
+
+Usage:
+    python -m benchmarks.manifest_parsing [--manifests 5000] [--workers 1 2 4 8]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from cognite.transformations_cli.commands.deploy.bundle import compile_bundle, load_bundle, save_bundle
+from cognite.transformations_cli.commands.deploy.parse_cache import ParseCache
+from cognite.transformations_cli.commands.deploy.transformation_config import parse_transformation_configs
+
+MANIFEST = """externalId: bench-{i}
+name: Benchmark transformation {i}
+query:
+  file: ../../queries/bench-{i}.sql
+destination:
+  type: nodes
+  view:
+    space: bench_space
+    externalId: BenchView
+    version: "1"
+  instanceSpace: bench_instances
+dataSetExternalId: bench-data-set-{data_set}
+action: upsert
+shared: true
+ignoreNullFields: false
+schedule:
+  interval: "{minute} * * * *"
+  isPaused: false
+notifications:
+  - ops-{data_set}@example.com
+tags:
+  - team-{data_set}
+  - generated
+authentication:
+  read:
+    clientId: ${{BENCH_CLIENT_ID}}
+    clientSecret: ${{BENCH_CLIENT_SECRET}}
+    tokenUrl: https://login.example.com/token
+    scopes:
+      - https://bench.cognitedata.com/.default
+    cdfProjectName: bench
+  write:
+    clientId: ${{BENCH_CLIENT_ID}}
+    clientSecret: ${{BENCH_CLIENT_SECRET}}
+    tokenUrl: https://login.example.com/token
+    scopes:
+      - https://bench.cognitedata.com/.default
+    cdfProjectName: bench
+"""
+
+
+def write_tree(root: str, n: int) -> str:
+    manifests = os.path.join(root, "manifests")
+    queries = os.path.join(root, "queries")
+    os.makedirs(queries)
+    for i in range(n):
+        directory = os.path.join(manifests, f"team-{i % 20}")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"bench-{i}.yaml"), "w") as f:
+            f.write(MANIFEST.format(i=i, data_set=i % 12, minute=i % 60))
+        with open(os.path.join(queries, f"bench-{i}.sql"), "w") as f:
+            f.write(f"select {i} as id")
+    return manifests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--manifests", type=int, default=5000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    os.environ.setdefault("BENCH_CLIENT_ID", "bench-client")
+    os.environ.setdefault("BENCH_CLIENT_SECRET", "bench-secret")
+    with tempfile.TemporaryDirectory() as root:
+        manifests = write_tree(root, args.manifests)
+        print(f"{args.manifests} manifests, {os.cpu_count()} CPU cores")
+        baseline = None
+        for workers in args.workers:
+            start = time.perf_counter()
+            configs = parse_transformation_configs(manifests, parse_workers=workers)
+            elapsed = time.perf_counter() - start
+            assert len(configs) == args.manifests
+            baseline = baseline or elapsed
+            print(f"  parse-workers={workers:<3} {elapsed:7.2f} s  (speed-up x{baseline / elapsed:.1f})")
+
+        # Files modified just before they are read are hashed on every lookup, date them back as in a real checkout
+        an_hour_ago = time.time() - 3600
+        for directory, _, files in os.walk(root):
+            for name in files:
+                os.utime(os.path.join(directory, name), (an_hour_ago, an_hour_ago))
+        cache_path = os.path.join(root, "parse-cache")
+        for run in ("cold", "warm"):
+            start = time.perf_counter()
+            cache = ParseCache(cache_path)
+            configs = parse_transformation_configs(manifests, parse_cache=cache)
+            cache.save()
+            elapsed = time.perf_counter() - start
+            assert len(configs) == args.manifests
+            print(f"  parse-cache {run}  {elapsed:7.2f} s  (speed-up x{baseline / elapsed:.1f})")
+
+        bundle_path = os.path.join(root, "bundle.json")
+        save_bundle(compile_bundle(manifests), bundle_path)
+        start = time.perf_counter()
+        configs = load_bundle(bundle_path)
+        elapsed = time.perf_counter() - start
+        assert len(configs) == args.manifests
+        print(f"  bundle            {elapsed:7.2f} s  (speed-up x{baseline / elapsed:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+A small in-memory stand-in for the parts of the CDF API used by ``transformations-cli deploy``.
+
+The server runs on localhost, adds a configurable latency to every request and counts the requests it receives, so
+benchmarks can measure how deploy behaves against a slow API without touching a real CDF project.
+"""
+import gzip
+import itertools
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from cognite.client import CogniteClient
+from cognite.client.config import ClientConfig
+from cognite.client.credentials import Token
+
+PROJECT = "stand-in"
+
+
+class StandInState:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.transformations: Dict[str, Dict[str, Any]] = {}
+        self.schedules: Dict[str, Dict[str, Any]] = {}
+        self.notifications: Dict[int, Dict[str, Any]] = {}
+        self.data_sets: Dict[str, Dict[str, Any]] = {}
+        self.requests: Counter = Counter()
+
+    def next_id(self) -> int:
+        return next(self.ids)
+
+
+def _identifier(item: Dict[str, Any], by_id: Dict[int, str]) -> Optional[str]:
+    if "externalId" in item:
+        return item["externalId"]
+    return by_id.get(item.get("id"))
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    state: StandInState
+    latency: float
+    max_body_bytes: Optional[int]
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _read_body(self) -> Tuple[Dict[str, Any], int]:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b"{}"
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        return json.loads(body or b"{}"), len(body)
+
+    def _respond(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self) -> Tuple[str, Dict[str, List[str]]]:
+        url = urlparse(self.path)
+        prefix = f"/api/v1/projects/{PROJECT}"
+        return url.path[len(prefix) :] if url.path.startswith(prefix) else url.path, parse_qs(url.query)
+
+    def do_GET(self) -> None:
+        path, query = self._route()
+        time.sleep(self.latency)
+        with self.state.lock:
+            self.state.requests[f"GET {path}"] += 1
+            if path == "/transformations/notifications":
+                items = list(self.state.notifications.values())
+                transformation_id = query.get("transformationId")
+                if transformation_id:
+                    items = [n for n in items if n["transformationId"] == int(transformation_id[0])]
+                return self._respond(200, {"items": items})
+        self._respond(404, {"error": {"code": 404, "message": f"Unknown path {path}"}})
+
+    def do_POST(self) -> None:
+        path, _ = self._route()
+        body, size = self._read_body()
+        time.sleep(self.latency)
+        with self.state.lock:
+            self.state.requests[f"POST {path}"] += 1
+            if self.max_body_bytes is not None and size > self.max_body_bytes:
+                status, payload = 413, {"error": {"code": 413, "message": "Request entity too large"}}
+            else:
+                status, payload = self._handle_post(path, body)
+        self._respond(status, payload)
+
+    def _handle_post(self, path: str, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        state = self.state
+        items = body.get("items", [])
+        transformation_ids = {t["id"]: ext_id for ext_id, t in state.transformations.items()}
+        if path == "/transformations":
+            for item in items:
+                item = {**item, "id": state.next_id(), "createdTime": 0, "lastUpdatedTime": 0}
+                state.transformations[item["externalId"]] = item
+            return 200, {"items": [state.transformations[i["externalId"]] for i in items]}
+        if path == "/transformations/update":
+            updated = []
+            for item in items:
+                ext_id = _identifier(item, transformation_ids)
+                for field, change in item.get("update", {}).items():
+                    state.transformations[ext_id][field] = change.get("set")
+                updated.append(state.transformations[ext_id])
+            return 200, {"items": updated}
+        if path == "/transformations/byids":
+            found = [state.transformations[i["externalId"]] for i in items if i["externalId"] in state.transformations]
+            return 200, {"items": found}
+        if path == "/transformations/schedules":
+            for item in items:
+                transformation = state.transformations.get(item["externalId"], {})
+                state.schedules[item["externalId"]] = {**item, "id": transformation.get("id")}
+            return 200, {"items": [state.schedules[i["externalId"]] for i in items]}
+        if path == "/transformations/schedules/update":
+            for item in items:
+                for field, change in item.get("update", {}).items():
+                    state.schedules[item["externalId"]][field] = change.get("set")
+            return 200, {"items": [state.schedules[i["externalId"]] for i in items]}
+        if path == "/transformations/schedules/byids":
+            found = [state.schedules[i["externalId"]] for i in items if i["externalId"] in state.schedules]
+            return 200, {"items": found}
+        if path == "/transformations/schedules/delete":
+            for item in items:
+                state.schedules.pop(item["externalId"], None)
+            return 200, {}
+        if path == "/transformations/notifications":
+            created = []
+            for item in items:
+                ext_id = item.get("transformationExternalId")
+                notification = {
+                    "id": state.next_id(),
+                    "transformationId": item.get("transformationId") or state.transformations[ext_id]["id"],
+                    "destination": item["destination"],
+                    "createdTime": 0,
+                    "lastUpdatedTime": 0,
+                }
+                state.notifications[notification["id"]] = notification
+                created.append(notification)
+            return 200, {"items": created}
+        if path == "/transformations/notifications/delete":
+            for item in items:
+                state.notifications.pop(item["id"], None)
+            return 200, {}
+        if path == "/datasets/byids":
+            found = [state.data_sets[i["externalId"]] for i in items if i["externalId"] in state.data_sets]
+            return 200, {"items": found}
+        return 404, {"error": {"code": 404, "message": f"Unknown path {path}"}}
+
+
+class StandInAPI:
+    """
+    Context manager running the stand-in API in a background thread.
+    """
+
+    def __init__(self, latency: float = 0.0, max_body_bytes: Optional[int] = None) -> None:
+        self.state = StandInState()
+        handler = type(
+            "Handler",
+            (StandInHandler,),
+            {"state": self.state, "latency": latency, "max_body_bytes": max_body_bytes},
+        )
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def client(self) -> CogniteClient:
+        return CogniteClient(
+            ClientConfig(
+                client_name="transformations-cli-benchmark",
+                project=PROJECT,
+                credentials=Token("stand-in-token"),
+                base_url=self.base_url,
+            )
+        )
+
+    def __enter__(self) -> "StandInAPI":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.server.shutdown()
+        self.server.server_close()
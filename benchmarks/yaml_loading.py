@@ -0,0 +1,102 @@
+"""
+Measure manifest parse time with the prebuilt libyaml loader against the previous pure Python loader, which was
+rebuilt for every file, and the single-pass normalisation against key translation and fingerprinting in separate passes.
+
+Usage:
+    python -m benchmarks.yaml_loading [--manifests 5000]
+"""
+import argparse
+import json
+import os
+import re
+import tempfile
+import time
+import tracemalloc
+from hashlib import sha256
+from typing import Any, Callable, List
+
+import yaml
+
+from benchmarks.manifest_parsing import write_tree
+from cognite.transformations_cli.commands.deploy import load_yaml as load_yaml_module
+from cognite.transformations_cli.commands.deploy.manifest_discovery import find_manifest_files
+from cognite.transformations_cli.commands.deploy.transformation_config import parse_transformation_configs
+
+
+def load_per_call(source: str) -> Any:
+    # The loader as it was built before, once per file and without libyaml
+    def env_constructor(_: yaml.SafeLoader, node: Any) -> Any:
+        expanded_value = os.path.expandvars(node.value)
+        return {"true": True, "false": False}.get(expanded_value.lower(), expanded_value)
+
+    class EnvLoader(yaml.SafeLoader):
+        pass
+
+    EnvLoader.add_implicit_resolver("!env", re.compile(r"\$\{([^}^{]+)\}"), None)
+    EnvLoader.add_constructor("!env", env_constructor)
+    return yaml.load(source, Loader=EnvLoader)
+
+
+def timed(action: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    action()
+    return time.perf_counter() - start
+
+
+def peak_memory(action: Callable[[], Any]) -> float:
+    tracemalloc.start()
+    try:
+        action()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def normalise_in_passes(source: str) -> Any:
+    # Parsing, key translation and fingerprinting as separate passes over copies of the document
+    config_dict = load_yaml_module._to_snake_case(load_yaml_module._parse_yaml(source), "camel")
+    return config_dict, sha256(json.dumps(config_dict).encode("utf-8")).hexdigest()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--manifests", type=int, default=5000)
+    args = parser.parse_args()
+
+    os.environ.setdefault("BENCH_CLIENT_ID", "bench-client")
+    os.environ.setdefault("BENCH_CLIENT_SECRET", "bench-secret")
+    with tempfile.TemporaryDirectory() as root:
+        manifests = write_tree(root, args.manifests)
+        sources: List[str] = []
+        for path in find_manifest_files(manifests):
+            with open(path) as f:
+                sources.append(f.read())
+
+        print(f"{args.manifests} manifests, libyaml available: {yaml.__with_libyaml__}")
+        before = timed(lambda: [load_per_call(s) for s in sources])
+        after = timed(lambda: [load_yaml_module._parse_yaml(s) for s in sources])
+        print(f"  YAML loading:         {before:6.2f} s before, {after:6.2f} s after (x{before / after:.1f})")
+
+        env_loader = load_yaml_module.EnvLoader
+        load_yaml_module.EnvLoader = load_yaml_module.PyEnvLoader
+        try:
+            before = timed(lambda: parse_transformation_configs(manifests, parse_workers=1))
+        finally:
+            load_yaml_module.EnvLoader = env_loader
+        after = timed(lambda: parse_transformation_configs(manifests, parse_workers=1))
+        print(f"  Manifest parsing:     {before:6.2f} s with pure Python YAML, {after:6.2f} s with libyaml")
+
+        def in_passes() -> List[Any]:
+            return [normalise_in_passes(s) for s in sources]
+
+        def single_pass() -> List[Any]:
+            return [load_yaml_module._normalise_yaml(s, "camel") for s in sources]
+
+        before, after = timed(in_passes), timed(single_pass)
+        print(f"  Normalisation:        {before:6.2f} s in passes, {after:6.2f} s in one pass")
+        before, after = peak_memory(in_passes), peak_memory(single_pass)
+        print(f"  Normalisation memory: {before:6.1f} MiB in passes, {after:6.1f} MiB in one pass (peak)")
+
+
+if __name__ == "__main__":
+    main()
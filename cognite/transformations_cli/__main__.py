@@ -1,12 +1,23 @@
+import os
+import sys
+
 from dotenv import load_dotenv
 
 from cognite.transformations_cli.commands.base import transformations_cli
+from cognite.transformations_cli.serve_client import SERVE_SOCKET_ENV, forward_command
 
 
 def main() -> None:
     # support local .env file with environment-variables
     load_dotenv()
 
+    serve_socket = os.environ.get(SERVE_SOCKET_ENV)
+    if serve_socket:
+        # Run the command in the resident serve process when one is listening
+        exit_code = forward_command(serve_socket, sys.argv[1:])
+        if exit_code is not None:
+            sys.exit(exit_code)
+
     transformations_cli()
 
 
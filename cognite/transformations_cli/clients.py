@@ -1,15 +1,128 @@
+import json
 import logging
 import sys
-from typing import Dict
+import threading
+from functools import partial
+from hashlib import sha256
+from typing import Any, Callable, Dict, List, Optional, Union
 
-from cognite.client import CogniteClient
+from cognite.client import CogniteClient, global_config
 from cognite.client.config import ClientConfig
 from cognite.client.credentials import OAuthClientCredentials
 from cognite.client.exceptions import CogniteAPIError
 
+from cognite.transformations_cli.token_cache import CachedOAuthClientCredentials
+
 logger = logging.getLogger(name=None)
 
 
+def client_key(
+    cluster: str,
+    project: Optional[str],
+    client_id: Optional[str],
+    client_secret: Optional[str],
+    token_url: Optional[str],
+    scopes: Union[None, str, List[str]],
+    audience: Optional[str],
+    **options: Any,
+) -> str:
+    """
+    Identify the clients that can be shared: same cluster, project, credentials and client options. The key is a hash,
+    so that the secret is not kept in clear text next to the clients.
+    """
+    identity = [cluster, project, client_id, client_secret, token_url, scopes, audience, sorted(options.items())]
+    return sha256(json.dumps(identity).encode("utf-8")).hexdigest()
+
+
+class ClientRegistry:
+    """
+    Cognite clients shared by all the commands, deploy targets and credential checks of a CLI invocation using the
+    same cluster, project and credentials. A shared client reuses its token, its token session and the connection
+    pool of the SDK instead of repeating the token requests and TLS handshakes.
+    """
+
+    def __init__(self) -> None:
+        self._clients: Dict[str, CogniteClient] = dict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, create: Callable[[], CogniteClient]) -> CogniteClient:
+        """
+        The client registered with the key, created on first use.
+        """
+        with self._lock:
+            if key not in self._clients:
+                self._clients[key] = create()
+            return self._clients[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clients.clear()
+
+
+client_registry = ClientRegistry()
+
+
+def set_connection_pool_size(size: Optional[int]) -> None:
+    """
+    Set the number of connections the SDK keeps open per host, shared by all clients. Only applies before the first
+    client is created.
+    """
+    if size:
+        global_config.max_connection_pool_size = size
+
+
+def get_shared_client(
+    cluster: str,
+    project: Optional[str],
+    client_id: Optional[str],
+    client_secret: Optional[str],
+    token_url: Optional[str],
+    scopes: Union[None, str, List[str]],
+    audience: Optional[str] = None,
+    timeout: Optional[int] = None,
+    client_name: str = "transformations_cli",
+    token_cache: Optional[str] = None,
+) -> CogniteClient:
+    """
+    A client for the project authenticated with OAuth2 client credentials, shared with every caller asking for the
+    same project, credentials and options.
+    """
+
+    def create() -> CogniteClient:
+        token_custom_args = {"audience": audience} if audience else {}
+        credentials_type: Callable[..., OAuthClientCredentials] = (
+            partial(CachedOAuthClientCredentials, token_cache) if token_cache else OAuthClientCredentials
+        )
+        client_config = ClientConfig(
+            base_url=f"https://{cluster}.cognitedata.com",
+            client_name=client_name,
+            project=project,
+            timeout=timeout,
+            credentials=credentials_type(
+                client_id=client_id,
+                client_secret=client_secret,
+                token_url=token_url,
+                scopes=scopes,
+                **token_custom_args,
+            ),
+        )
+        return CogniteClient(client_config)
+
+    key = client_key(
+        cluster,
+        project,
+        client_id,
+        client_secret,
+        token_url,
+        scopes,
+        audience,
+        timeout=timeout,
+        client_name=client_name,
+        token_cache=token_cache,
+    )
+    return client_registry.get(key, create)
+
+
 def get_client(obj: Dict, timeout: int = 60) -> CogniteClient:
     client_id = obj.get("client_id")
     client_secret = obj.get("client_secret")
@@ -18,24 +131,20 @@ def get_client(obj: Dict, timeout: int = 60) -> CogniteClient:
     audience = obj.get("audience")
     cdf_project_name = obj.get("cdf_project_name")
     cluster = obj.get("cluster", "europe-west1-1")
-    base_url = f"https://{cluster}.cognitedata.com"
     if not audience:
         scopes = scopes.strip().split(" ") if scopes else [f"https://{cluster}.cognitedata.com/.default"]
+    set_connection_pool_size(obj.get("max_connections"))
     try:
-        token_custom_args = {"audience": audience} if audience else {}
-        client_config = ClientConfig(
-            base_url=base_url,
-            client_name="transformations_cli",
-            project=cdf_project_name,
+        return get_shared_client(
+            cluster,
+            cdf_project_name,
+            client_id,
+            client_secret,
+            token_url,
+            scopes,
+            audience,
             timeout=timeout,
-            credentials=OAuthClientCredentials(
-                client_id=client_id,
-                client_secret=client_secret,
-                token_url=token_url,
-                scopes=scopes,
-                **token_custom_args,
-            ),
+            token_cache=obj.get("token_cache"),
         )
-        return CogniteClient(client_config)
     except CogniteAPIError as e:
         sys.exit(f"Cognite client cannot be initialised: {e}.")
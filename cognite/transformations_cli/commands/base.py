@@ -1,19 +1,75 @@
-from typing import Optional
+import importlib
+import os
+from typing import Any, Dict, List, Optional, Tuple
 
 import click
-from click import Context
+from click import Command, Context, HelpFormatter
 
 from cognite.transformations_cli import __version__
-from cognite.transformations_cli.commands.delete import delete
-from cognite.transformations_cli.commands.deploy.deploy import deploy
-from cognite.transformations_cli.commands.jobs import jobs
-from cognite.transformations_cli.commands.list import list
-from cognite.transformations_cli.commands.query import query
-from cognite.transformations_cli.commands.run import run
-from cognite.transformations_cli.commands.show import show
 
+# The subcommands by name, with the module attribute defining them and their short help for the --help listing
+SUBCOMMANDS: Dict[str, Tuple[str, str]] = {
+    "batch": (
+        "cognite.transformations_cli.commands.batch:batch",
+        "Run a list of run, show, jobs and delete operations with one client, streaming results as NDJSON",
+    ),
+    "compile": (
+        "cognite.transformations_cli.commands.compile:compile",
+        "Compile a directory of transformation manifests into a bundle to deploy with deploy --bundle",
+    ),
+    "delete": ("cognite.transformations_cli.commands.delete:delete", "Delete a transformation"),
+    "deploy": (
+        "cognite.transformations_cli.commands.deploy.deploy:deploy",
+        "Deploy a set of transformations from a directory",
+    ),
+    "jobs": ("cognite.transformations_cli.commands.jobs:jobs", "Show latest jobs for a given transformation"),
+    "list": ("cognite.transformations_cli.commands.list:list", "List transformations"),
+    "query": ("cognite.transformations_cli.commands.query:query", "Make a SQL query and retrieve results"),
+    "run": ("cognite.transformations_cli.commands.run:run", "Start and/or watch transformation jobs"),
+    "serve": (
+        "cognite.transformations_cli.commands.serve:serve",
+        "Serve commands forwarded over a Unix socket from a resident process keeping its clients warm",
+    ),
+    "show": ("cognite.transformations_cli.commands.show:show", "Show details of a transformation"),
+}
 
-@click.group(context_settings={"help_option_names": ["-h", "--help"]})
+
+class LazyGroup(click.Group):
+    """
+    Group importing the module of a subcommand only when the subcommand is invoked. The subcommand modules import the
+    Cognite SDK and the other heavy dependencies, which --version, --help and usage errors do not need.
+    """
+
+    def __init__(self, *args: Any, lazy_subcommands: Optional[Dict[str, Tuple[str, str]]] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or dict()
+
+    def list_commands(self, ctx: Context) -> List[str]:
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx: Context, cmd_name: str) -> Optional[Command]:
+        if cmd_name not in self.commands and cmd_name in self.lazy_subcommands:
+            module_name, attribute = self.lazy_subcommands[cmd_name][0].split(":")
+            self.add_command(getattr(importlib.import_module(module_name), attribute), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(self, ctx: Context, formatter: HelpFormatter) -> None:
+        names = self.list_commands(ctx)
+        if not names:
+            return
+        limit = formatter.width - 6 - max(len(name) for name in names)
+        rows = []
+        for name in names:
+            command = self.commands.get(name)
+            if command is None:
+                rows.append((name, Command(name, help=self.lazy_subcommands[name][1]).get_short_help_str(limit)))
+            elif not command.hidden:
+                rows.append((name, command.get_short_help_str(limit)))
+        with formatter.section("Commands"):
+            formatter.write_dl(rows)
+
+
+@click.group(cls=LazyGroup, lazy_subcommands=SUBCOMMANDS, context_settings={"help_option_names": ["-h", "--help"]})
 @click.version_option(prog_name="transformations_cli", version=__version__)
 @click.option(
     "--cluster",
@@ -56,6 +112,28 @@ from cognite.transformations_cli.commands.show import show
     help="Project to interact with transformations API, 'TRANSFORMATIONS_PROJECT' environment variable can be used instead. Required for OAuth2 and optional for api-keys.",
     envvar="TRANSFORMATIONS_PROJECT",
 )
+@click.option(
+    "--token-cache",
+    help="Path to a file caching OAuth2 access tokens, e.g. ~/.cache/transformations-cli/tokens.json, so that "
+    "consecutive commands reuse a token until shortly before it expires. The file is only readable by its owner. "
+    "'TRANSFORMATIONS_TOKEN_CACHE' environment variable can be used instead.",
+    envvar="TRANSFORMATIONS_TOKEN_CACHE",
+)
+@click.option(
+    "--max-connections",
+    type=click.IntRange(min=1),
+    help="Maximum number of connections kept open per host by the Cognite SDK, shared by all clients of the command. "
+    "Defaults to the Cognite SDK default. 'TRANSFORMATIONS_MAX_CONNECTIONS' environment variable can be used instead.",
+    envvar="TRANSFORMATIONS_MAX_CONNECTIONS",
+)
+@click.option(
+    "--trace",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Path of a file to write the API requests of the command to, with their endpoint, status, items, bytes, "
+    "retries and timing, in the Chrome Trace Event format to open in chrome://tracing or https://ui.perfetto.dev. "
+    "'TRANSFORMATIONS_TRACE' environment variable can be used instead.",
+    envvar="TRANSFORMATIONS_TRACE",
+)
 @click.pass_context
 def transformations_cli(
     context: Context,
@@ -67,6 +145,9 @@ def transformations_cli(
     scopes: Optional[str] = None,
     audience: Optional[str] = None,
     cdf_project_name: Optional[str] = None,
+    token_cache: Optional[str] = None,
+    max_connections: Optional[int] = None,
+    trace: Optional[str] = None,
 ) -> None:
     context.obj = {
         "cluster": cluster,
@@ -77,13 +158,12 @@ def transformations_cli(
         "scopes": scopes,
         "audience": audience,
         "cdf_project_name": cdf_project_name,
+        "token_cache": os.path.expanduser(token_cache) if token_cache else None,
+        "max_connections": max_connections,
     }
+    if trace:
+        # Imported only when tracing, it imports the Cognite SDK
+        from cognite.transformations_cli.request_trace import request_tracing
 
-
-transformations_cli.add_command(deploy)
-transformations_cli.add_command(run)
-transformations_cli.add_command(query)
-transformations_cli.add_command(list)
-transformations_cli.add_command(show)
-transformations_cli.add_command(jobs)
-transformations_cli.add_command(delete)
+        # Written when the command completes or fails, as the context closes
+        context.with_resource(request_tracing(trace, context.invoked_subcommand))
@@ -0,0 +1,169 @@
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+import click
+from cognite.client import CogniteClient
+from cognite.client.exceptions import CogniteAPIError, CogniteNotFoundError
+
+from cognite.transformations_cli.clients import get_client
+from cognite.transformations_cli.commands.delete import delete_transformation
+from cognite.transformations_cli.commands.deploy.load_yaml import load_yaml
+from cognite.transformations_cli.commands.jobs import list_jobs
+from cognite.transformations_cli.commands.run import has_timed_out, run_transformation
+from cognite.transformations_cli.commands.show import show_job, show_transformation
+from cognite.transformations_cli.commands.utils import get_job_metrics, is_id_exclusive, is_id_provided
+
+BATCH_COMMANDS = ("delete", "jobs", "run", "show")
+
+
+@dataclass
+class BatchOperation:
+    """
+    A command to run in a batch, with the options of the command.
+    """
+
+    command: str
+    id: Optional[int] = None
+    external_id: Optional[str] = None
+    job_id: Optional[int] = None
+    watch: bool = False
+    watch_only: bool = False
+    time_out: int = 12 * 60 * 60
+    limit: int = 10
+    delete_schedule: bool = False
+
+
+@dataclass
+class BatchOperations:
+    operations: List[BatchOperation]
+
+
+def read_operations(source: TextIO) -> List[BatchOperation]:
+    """
+    Read the operations of a batch: a YAML file with an operations list, or NDJSON with one operation per line. All
+    invalid operations are reported together.
+    """
+    errors: List[str] = []
+    operations: List[BatchOperation] = []
+
+    def add(location: str, operation: BatchOperation) -> None:
+        if operation.command not in BATCH_COMMANDS:
+            errors.append(f"{location}: unknown command {operation.command}, use one of {', '.join(BATCH_COMMANDS)}")
+        operations.append(operation)
+
+    if source.name.endswith((".yaml", ".yml")):
+        try:
+            batch_operations = load_yaml(source, BatchOperations, case_style="camel").operations
+        except Exception as e:
+            sys.exit(f"Invalid operations in {source.name}: {e}")
+        for index, operation in enumerate(batch_operations, start=1):
+            add(f"operation {index}", operation)
+    else:
+        for number, line in enumerate(source, start=1):
+            if not line.strip():
+                continue
+            try:
+                add(f"line {number}", load_yaml(line, BatchOperation, case_style="camel"))
+            except Exception as e:
+                errors.append(f"line {number}: {e}")
+    if errors:
+        sys.exit("Invalid operations:\n" + "\n".join(errors))
+    return operations
+
+
+def run_operation(client: CogniteClient, operation: BatchOperation) -> Tuple[bool, Dict[str, Any]]:
+    """
+    Run an operation as its command would. Returns whether it succeeded, with the same outcome as the exit code of the
+    command, and its result.
+    """
+    id, external_id = operation.id, operation.external_id
+    is_id_exclusive(id, external_id)
+    if operation.command == "run":
+        is_id_provided(id, external_id)
+        try:
+            job, duration = run_transformation(
+                client, id, external_id, operation.watch, operation.watch_only, operation.time_out
+            )
+        except AttributeError:
+            # Raised by the SDK for unknown external ids, see the run command
+            sys.exit("Cognite API error has occurred: Transformation not found.")
+        if job is None:
+            return True, {"job": None}
+        # Jobs returned by the API always have an id
+        metrics = get_job_metrics(client, job.id) if job.id is not None else []
+        result = {"job": job.dump(camel_case=True), "metrics": [m.dump(camel_case=True) for m in metrics]}
+        if operation.watch or operation.watch_only:
+            if job.status == "Failed":
+                return False, {**result, "error": f"Job Failed, error details: {job.error}"}
+            if has_timed_out(job, duration, operation.time_out):
+                error = f"Transformation job runtime exceeds the provided timeout: {operation.time_out} seconds"
+                return False, {**result, "error": error}
+        return True, result
+    if operation.command == "show":
+        if not (id or external_id or operation.job_id):
+            sys.exit("Please provide id, external_id or job_id")
+        result = dict()
+        if id or external_id:
+            tr, notifications = show_transformation(client, id, external_id)
+            result["transformation"] = tr.dump(camel_case=True)
+            result["notifications"] = notifications.dump(camel_case=True)
+        if operation.job_id:
+            job, metrics = show_job(client, operation.job_id)
+            result["job"] = job.dump(camel_case=True)
+            result["metrics"] = [m.dump(camel_case=True) for m in metrics]
+        return True, result
+    if operation.command == "jobs":
+        jobs = list_jobs(client, id, external_id, operation.limit)
+        return True, {"jobs": jobs.dump(camel_case=True)}
+    is_id_provided(id, external_id)
+    delete_transformation(client, id, external_id, operation.delete_schedule)
+    return True, {"deleted": {"id": id} if id else {"externalId": external_id}}
+
+
+def execute_operation(client: CogniteClient, index: int, operation: BatchOperation) -> Dict[str, Any]:
+    """
+    Run an operation, turning its errors into a failed result, as the command would print them before exiting.
+    """
+    try:
+        succeeded, result = run_operation(client, operation)
+    except SystemExit as e:
+        succeeded, result = False, {"error": str(e.code)}
+    except (CogniteNotFoundError, CogniteAPIError) as e:
+        succeeded, result = False, {"error": f"Cognite API error has occurred: {e}"}
+    except Exception as e:
+        succeeded, result = False, {"error": f"{type(e).__name__}: {e}"}
+    return {"index": index, "command": operation.command, "succeeded": succeeded, **result}
+
+
+@click.command(help="Run a list of run, show, jobs and delete operations with one client, streaming results as NDJSON")
+@click.argument("operations", type=click.File("r"), default="-")
+@click.option(
+    "--max-workers",
+    default=4,
+    type=click.IntRange(min=1),
+    help="Maximum number of operations to run concurrently, defaults to 4.",
+)
+@click.pass_obj
+def batch(obj: Dict, operations: TextIO, max_workers: int = 4) -> None:
+    """
+    Args:
+        operations (TextIO): YAML file with an operations list, or NDJSON with one operation per line, read from stdin
+            by default
+    """
+    to_run = read_operations(operations)
+    if not to_run:
+        return
+    client = get_client(obj)
+    failed = 0
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(to_run))) as executor:
+        futures = [executor.submit(execute_operation, client, index, op) for index, op in enumerate(to_run)]
+        # Results are printed from this thread only, one line each, in the order the operations complete
+        for future in as_completed(futures):
+            result = future.result()
+            failed += not result["succeeded"]
+            click.echo(json.dumps(result, default=str))
+    if failed:
+        sys.exit(f"{failed} of {len(to_run)} operations failed.")
@@ -0,0 +1,39 @@
+from typing import Optional
+
+import click
+
+from cognite.transformations_cli.commands.deploy.bundle import compile_bundle, save_bundle
+from cognite.transformations_cli.commands.deploy.transformation_types import TransformationConfigError
+
+
+@click.command(help="Compile a directory of transformation manifests into a bundle to deploy with deploy --bundle")
+@click.argument(
+    "path",
+    default=".",
+)
+@click.option(
+    "-o",
+    "--output",
+    required=True,
+    help="Path of the bundle file to write, e.g. bundle.json.",
+)
+@click.option(
+    "--legacy-mode",
+    is_flag=True,
+    envvar="TRANSFORMATIONS_LEGACY_MODE",
+    help="Treat all configs as legacy.",
+)
+def compile(path: Optional[str], output: str, legacy_mode: bool = False) -> None:
+    """
+        Compile a set of transformations from a directory into a bundle
+    Args:
+        path (str): Root directory for transformations
+        output (str): Path of the bundle file
+    """
+    click.echo(click.style("Compiling transformations...", fg="red"))
+    try:
+        bundle = compile_bundle(path, legacy_mode)
+    except TransformationConfigError as e:
+        exit(e.message)
+    save_bundle(bundle, output)
+    click.echo(f"Number of manifests compiled into {output}: {len(bundle['manifests'])}")
@@ -0,0 +1,90 @@
+import json
+import threading
+from typing import Any, Callable, Generic, List, TypeVar
+
+from cognite.client.exceptions import CogniteAPIError
+
+from cognite.transformations_cli.commands.utils import request_slot, run_concurrently
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Budget for the serialized items of one request, well below the request size accepted by the API
+MAX_REQUEST_BYTES = 4 * 1024 * 1024
+DEFAULT_ITEM_LIMIT = 1000
+# Payload too large and too many requests, both answered by retrying with smaller batches
+SHRINK_STATUS_CODES = (413, 429)
+
+
+def estimate_size(item: Any) -> int:
+    """
+    Estimate the serialized size of one request item in bytes. Update items are (resource, changed fields) pairs.
+    """
+    if isinstance(item, tuple):
+        item = item[0]
+    if hasattr(item, "dump"):
+        item = item.dump(camel_case=True)
+    return len(json.dumps(item, default=str)) + 1
+
+
+class AdaptiveBatcher(Generic[T]):
+    """
+    Split the items of an API call into batches bounded by the item limit of the endpoint and by their estimated
+    serialized size. When the API answers 413 or 429, the failed batch is split in halves and sent again, and later
+    batches are kept to the smaller size.
+
+    Attributes:
+        item_limit -- maximum number of items per request
+        max_bytes -- maximum estimated size of the items of one request
+    """
+
+    def __init__(self, item_limit: int, max_bytes: int = MAX_REQUEST_BYTES):
+        self.item_limit = max(1, item_limit)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_api(cls, api: Any, operation: str, max_bytes: int = MAX_REQUEST_BYTES) -> "AdaptiveBatcher":
+        """
+        Use the item limit the SDK has for the operation (create, retrieve, update or delete) on the given API.
+        """
+        item_limit = getattr(api, f"_{operation.upper()}_LIMIT", DEFAULT_ITEM_LIMIT)
+        return cls(item_limit if isinstance(item_limit, int) else DEFAULT_ITEM_LIMIT, max_bytes)
+
+    def batches(self, items: List[T]) -> List[List[T]]:
+        batches: List[List[T]] = []
+        batch: List[T] = []
+        batch_bytes = 0
+        for item in items:
+            size = estimate_size(item)
+            if batch and (len(batch) >= self.item_limit or batch_bytes + size > self.max_bytes):
+                batches.append(batch)
+                batch, batch_bytes = [], 0
+            batch.append(item)
+            batch_bytes += size
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def run(self, action: Callable[[List[T]], R], items: List[T], max_workers: int = 1) -> List[R]:
+        """
+        Apply action to every batch of items, using up to max_workers concurrent requests. Returns the results of all
+        the requests sent, in the order of the items.
+        """
+        results = run_concurrently(lambda batch: self._send(action, batch), self.batches(items), max_workers)
+        return [result for batch_results in results for result in batch_results]
+
+    def _send(self, action: Callable[[List[T]], R], batch: List[T]) -> List[R]:
+        limit = self.item_limit
+        if len(batch) > limit:
+            return [result for i in range(0, len(batch), limit) for result in self._send(action, batch[i : i + limit])]
+        try:
+            with request_slot():
+                return [action(batch)]
+        except CogniteAPIError as e:
+            if e.code not in SHRINK_STATUS_CODES or len(batch) == 1:
+                raise
+            half = len(batch) // 2
+            with self._lock:
+                self.item_limit = min(self.item_limit, half)
+            return self._send(action, batch[:half]) + self._send(action, batch[half:])
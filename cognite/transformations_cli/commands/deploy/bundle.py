@@ -0,0 +1,140 @@
+import json
+import os
+from typing import Any, Dict, List, Mapping, Optional
+
+from cognite.transformations_cli import __version__
+from cognite.transformations_cli.commands.deploy.load_yaml import load_yaml_dict, parse_yaml_with_placeholders
+from cognite.transformations_cli.commands.deploy.manifest_discovery import find_manifest_files
+from cognite.transformations_cli.commands.deploy.query_store import QueryStore
+from cognite.transformations_cli.commands.deploy.transformation_config import (
+    _validate_config,
+    from_legacy_config,
+    is_legacy_manifest,
+)
+from cognite.transformations_cli.commands.deploy.transformation_types import (
+    QueryConfig,
+    TransformationConfig,
+    TransformationConfigError,
+)
+from cognite.transformations_cli.commands.deploy.transformation_types_legacy import TransformationConfigLegacy
+
+BUNDLE_VERSION = 1
+
+
+def _to_transformation_config(
+    manifest: Dict[str, Any], environ: Optional[Mapping[str, str]] = None
+) -> TransformationConfig:
+    """
+    Create and validate the config of a compiled manifest, expanding its environment variables from environ, defaulting
+    to os.environ. Legacy manifests always read their API keys from os.environ.
+    """
+    if manifest["legacy"]:
+        legacy_config = load_yaml_dict(
+            manifest["config"], TransformationConfigLegacy, manifest["sourceHash"], "camel", environ
+        )
+        config = from_legacy_config(legacy_config)
+    else:
+        config = load_yaml_dict(manifest["config"], TransformationConfig, manifest["sourceHash"], "camel", environ)
+    _validate_config(config)
+    return config
+
+
+def _read_manifest(path: str, legacy_mode: bool) -> Dict[str, Any]:
+    with open(path) as f:
+        data = f.read()
+    config_dict, source_hash = parse_yaml_with_placeholders(data, case_style="camel")
+    return {
+        "path": path,
+        "legacy": is_legacy_manifest(data, legacy_mode),
+        "sourceHash": source_hash,
+        "config": config_dict,
+        "query": None,
+    }
+
+
+def read_manifests(base_dir: Optional[str], legacy_mode: bool = False) -> List[Dict[str, Any]]:
+    """
+    Parse the manifests of a directory, keeping the values referencing environment variables as placeholders. The
+    manifests are not validated, and their SQL files are not read.
+    """
+    if base_dir is None:
+        base_dir = "."
+
+    if os.path.isdir(base_dir) is False:
+        raise TransformationConfigError(f"Transformation root folder not found: {base_dir}")
+
+    manifests = []
+    for path in find_manifest_files(base_dir):
+        try:
+            manifests.append(_read_manifest(path, legacy_mode))
+        except Exception as e:
+            raise TransformationConfigError(
+                f"Failed to parse transformation config, please check that you conform required fields and format: {e}"
+            )
+    return manifests
+
+
+def to_transformation_configs(
+    manifests: List[Dict[str, Any]], environ: Optional[Mapping[str, str]] = None
+) -> Dict[str, TransformationConfig]:
+    """
+    Create and validate the transformation configs of parsed or compiled manifests, keyed by the paths of the
+    manifests, expanding their environment variables from environ, defaulting to os.environ. Inlined queries replace
+    the SQL files of the manifests.
+    """
+    transformations: Dict[str, TransformationConfig] = dict()
+    for manifest in manifests:
+        try:
+            config = _to_transformation_config(manifest, environ)
+        except Exception as e:
+            raise TransformationConfigError(
+                "Failed to parse transformation config, please check that you conform required fields and format: "
+                f"{manifest['path']}: {e}"
+            )
+        if manifest["query"] is not None:
+            config.query = manifest["query"]
+        transformations[manifest["path"]] = config
+    return transformations
+
+
+def compile_bundle(base_dir: Optional[str], legacy_mode: bool = False) -> Dict[str, Any]:
+    """
+    Parse and validate the manifests of a directory, with their SQL files inlined, into a bundle for deploy --bundle.
+    Values referencing environment variables are kept as placeholders, and expanded when the bundle is deployed.
+    """
+    manifests = read_manifests(base_dir, legacy_mode)
+    # Validated in the environment of the compile, the placeholders are expanded again by every deploy
+    configs = to_transformation_configs(manifests)
+    queries = QueryStore.load(configs)
+    for manifest in manifests:
+        if isinstance(configs[manifest["path"]].query, QueryConfig):
+            manifest["query"] = queries.query(manifest["path"])
+    return {"version": BUNDLE_VERSION, "cliVersion": __version__, "manifests": manifests}
+
+
+def save_bundle(bundle: Dict[str, Any], path: str) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(bundle, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def load_bundle_manifests(path: str) -> List[Dict[str, Any]]:
+    """
+    Read the compiled manifests of a bundle, to be turned into configs by to_transformation_configs.
+    """
+    try:
+        with open(path) as f:
+            bundle = json.load(f)
+    except (OSError, ValueError) as e:
+        raise TransformationConfigError(f"Failed to read bundle file {path}: {e}")
+    if not isinstance(bundle, dict) or bundle.get("version") != BUNDLE_VERSION:
+        raise TransformationConfigError(f"Unsupported bundle file {path}, compile the manifests with this CLI version.")
+    return bundle["manifests"]
+
+
+def load_bundle(path: str) -> Dict[str, TransformationConfig]:
+    """
+    Read the transformation configs of a bundle, keyed by the paths of their manifests. No other files are read.
+    """
+    return to_transformation_configs(load_bundle_manifests(path))
@@ -0,0 +1,319 @@
+"""
+Construction plans for the config dataclasses, compiled once per class.
+
+A plan follows the rules of ``dacite.from_dict`` with ``Config(strict=True, cast=[Enum])``, which the manifests have
+always been loaded with: unknown keys are rejected, Enum fields are cast from their values, union members are tried in
+order and the first one that builds and type checks wins, missing Optional fields become None, and values are type
+checked after they are built. It raises the same dacite exceptions, so errors are reported the same way. The type
+hints are resolved when the plan is compiled instead of for every manifest.
+"""
+import dataclasses
+import threading
+import types
+from collections.abc import Collection, Mapping
+from enum import Enum
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+import dacite
+from dacite.exceptions import (
+    DaciteError,
+    DaciteFieldError,
+    ForwardReferenceError,
+    MissingValueError,
+    UnexpectedDataError,
+    UnionMatchError,
+    WrongTypeError,
+)
+
+T = TypeVar("T")
+
+Builder = Callable[[Any], Any]
+Checker = Callable[[Any], bool]
+
+DACITE_CONFIG = dacite.Config(strict=True, cast=[Enum])
+
+_UNION_TYPES: Tuple[Any, ...] = (Union, types.UnionType) if hasattr(types, "UnionType") else (Union,)
+
+# Errors of values that do not build as a union member: validation errors, and failed Enum casts and constructors
+_UNION_MEMBER_ERRORS = (DaciteError, ValueError, TypeError)
+
+
+class UnsupportedTypeError(Exception):
+    """
+    Raised when compiling a plan for a type hint the plans do not cover. Such config classes are built with dacite.
+    """
+
+
+def _is_union(type_: Any) -> bool:
+    return get_origin(type_) in _UNION_TYPES
+
+
+def _is_optional(type_: Any) -> bool:
+    return _is_union(type_) and type(None) in get_args(type_)
+
+
+def _collection_origin(type_: Any) -> Any:
+    origin = get_origin(type_)
+    try:
+        return origin if origin is not None and issubclass(origin, Collection) else None
+    except TypeError:
+        return None
+
+
+def _is_subclass(type_: Any, base: type) -> bool:
+    origin = _collection_origin(type_)
+    try:
+        return issubclass(origin or type_, base)
+    except TypeError:
+        return False
+
+
+def _build_value_for_collection(build_item: Builder, data: Any) -> Any:
+    # Named as in dacite: strings are collections too, and their "built" value names this generator in error messages
+    return data.__class__(build_item(item) for item in data)
+
+
+def _constant(value: Any) -> Callable[[], Any]:
+    return lambda: value
+
+
+class _PlanCompiler:
+    def __init__(self) -> None:
+        self.builders: Dict[Any, Builder] = dict()
+        self.checkers: Dict[Any, Checker] = dict()
+
+    def checker(self, type_: Any) -> Checker:
+        """
+        Compile the type check dacite applies to built values (dacite.types.is_instance).
+        """
+        if type_ not in self.checkers:
+            self.checkers[type_] = self._compile_checker(type_)
+        return self.checkers[type_]
+
+    def _compile_checker(self, type_: Any) -> Checker:
+        if type_ is Any:
+            return lambda value: True
+        if _is_union(type_):
+            checks = [self.checker(t) for t in get_args(type_)]
+            return lambda value: any(check(value) for check in checks)
+        origin = _collection_origin(type_)
+        if origin is not None:
+            if issubclass(origin, tuple):
+                raise UnsupportedTypeError(type_)
+            args = get_args(type_)
+            if not args:
+                return lambda value: isinstance(value, origin)
+            if issubclass(origin, Mapping):
+                check_key, check_value = self.checker(args[0]), self.checker(args[1])
+                return lambda value: isinstance(value, origin) and all(
+                    check_key(k) and check_value(v) for k, v in value.items()
+                )
+            check_item = self.checker(args[0])
+            return lambda value: isinstance(value, origin) and all(check_item(item) for item in value)
+        if get_origin(type_) is Literal:
+            values = get_args(type_)
+            return lambda value: value in values
+        if isinstance(type_, type):
+            if type_ in (float, complex):
+                return lambda value: isinstance(value, (int, float)) or isinstance(value, type_)
+            return lambda value: isinstance(value, type_)
+        raise UnsupportedTypeError(type_)
+
+    def builder(self, type_: Any) -> Builder:
+        """
+        Compile the construction of a value of the given type from loaded YAML (dacite.core._build_value).
+        """
+        if type_ not in self.builders:
+            if dataclasses.is_dataclass(type_):
+                # Registered before compiling, so that dataclasses referring to themselves are supported
+                plan: List[Builder] = []
+                self.builders[type_] = lambda data: plan[0](data)
+                plan.append(self._compile_builder(type_))
+            else:
+                self.builders[type_] = self._compile_builder(type_)
+        return self.builders[type_]
+
+    def _compile_builder(self, type_: Any) -> Builder:
+        optional = _is_optional(type_)
+        cast = type_ if _is_subclass(type_, Enum) else None
+        if _is_union(type_):
+            inner = self._compile_union(type_)
+        elif _collection_origin(type_) is not None:
+            inner = self._compile_collection(type_)
+        elif dataclasses.is_dataclass(type_):
+            build_dataclass = self._compile_dataclass(type_)
+
+            def inner(data: Any) -> Any:
+                return build_dataclass(data) if isinstance(data, Mapping) else data
+
+        elif type_ is Any or isinstance(type_, type) or get_origin(type_) is Literal:
+            inner = None
+        else:
+            raise UnsupportedTypeError(type_)
+
+        if inner is None and cast is None:
+            return lambda data: data
+
+        def build(data: Any) -> Any:
+            if optional and data is None:
+                return data
+            if inner is not None:
+                data = inner(data)
+            if cast is not None:
+                data = cast(data)
+            return data
+
+        return build
+
+    def _compile_union(self, union: Any) -> Builder:
+        members = get_args(union)
+        if _is_optional(union) and len(members) == 2:
+            return self.builder(members[0])
+        candidates = [(self.builder(t), self.checker(t)) for t in members]
+
+        def build_union(data: Any) -> Any:
+            for build, check in candidates:
+                try:
+                    value = build(data)
+                except _UNION_MEMBER_ERRORS:
+                    continue
+                if check(value):
+                    return value
+            raise UnionMatchError(field_type=union, value=data)
+
+        return build_union
+
+    def _compile_collection(self, collection: Any) -> Builder:
+        origin = _collection_origin(collection)
+        if issubclass(origin, tuple):
+            raise UnsupportedTypeError(collection)
+        args = get_args(collection)
+        # Items of data which is not a mapping are built as the first type argument, as dacite does
+        build_item = self.builder(args[0] if args else Any)
+        if issubclass(origin, Mapping):
+            build_value = self.builder(args[1] if len(args) == 2 else Any)
+
+            def build_mapping(data: Any) -> Any:
+                if isinstance(data, Mapping):
+                    data_type: Any = data.__class__
+                    return data_type((key, build_value(value)) for key, value in data.items())
+                if isinstance(data, Collection):
+                    return _build_value_for_collection(build_item, data)
+                return data
+
+            return build_mapping
+
+        def build_collection(data: Any) -> Any:
+            if isinstance(data, Collection):
+                return _build_value_for_collection(build_item, data)
+            return data
+
+        return build_collection
+
+    def _compile_dataclass(self, data_class: Any) -> Callable[[Mapping], Any]:
+        """
+        Compile the construction of a dataclass instance from a mapping (dacite.core.from_dict).
+        """
+        try:
+            hints = get_type_hints(data_class)
+        except NameError as error:
+            raise ForwardReferenceError(str(error)) from None
+        fields = [f for f in dataclasses.fields(data_class)]
+        if any(isinstance(hints[f.name], dataclasses.InitVar) for f in fields):
+            raise UnsupportedTypeError(data_class)
+        field_names = {f.name for f in fields}
+        frozen = data_class.__dataclass_params__.frozen
+
+        steps = []
+        for f in fields:
+            field_type = hints[f.name]
+            if f.default is not dataclasses.MISSING:
+                default: Optional[Callable[[], Any]] = _constant(f.default)
+            elif f.default_factory is not dataclasses.MISSING:  # type: ignore
+                default = f.default_factory  # type: ignore
+            elif _is_optional(field_type):
+                default = _constant(None)
+            else:
+                default = None
+            steps.append((f.name, field_type, self.builder(field_type), self.checker(field_type), default, f.init))
+
+        def build_dataclass(data: Mapping) -> Any:
+            extra_fields = set(data.keys()) - field_names
+            if extra_fields:
+                raise UnexpectedDataError(keys=extra_fields)
+            init_values = {}
+            post_init_values = {}
+            for name, field_type, build, check, default, init in steps:
+                if name in data:
+                    try:
+                        value = build(data[name])
+                    except DaciteFieldError as error:
+                        error.update_path(name)
+                        raise
+                    if not check(value):
+                        raise WrongTypeError(field_path=name, field_type=field_type, value=value)
+                elif default is not None:
+                    value = default()
+                elif not init:
+                    continue
+                else:
+                    raise MissingValueError(name)
+                if init:
+                    init_values[name] = value
+                elif not frozen:
+                    post_init_values[name] = value
+            instance = data_class(**init_values)
+            for name, value in post_init_values.items():
+                setattr(instance, name, value)
+            return instance
+
+        return build_dataclass
+
+
+_compiler = _PlanCompiler()
+_plans: Dict[Any, Callable[[Any], Any]] = dict()
+# Plans are compiled one at a time: while a plan is compiled, the builders of its dataclasses are placeholders
+_compile_lock = threading.Lock()
+
+
+def get_plan(data_class: Type[T]) -> Callable[[Any], T]:
+    """
+    Return the construction plan of a config dataclass, compiling it on first use. Plans are only published once
+    compiled, so that threads parsing manifests concurrently never use a partially compiled plan.
+    """
+    plan = _plans.get(data_class)
+    if plan is not None:
+        return plan
+    with _compile_lock:
+        plan = _plans.get(data_class)
+        if plan is None:
+            try:
+                build_dataclass = _compiler._compile_dataclass(data_class)
+            except UnsupportedTypeError:
+
+                def build_dataclass(data: Any) -> Any:
+                    return dacite.from_dict(data_class=data_class, data=data, config=DACITE_CONFIG)
+
+            plan = _plans[data_class] = build_dataclass
+    return plan
+
+
+def build_config(data_class: Type[T], data: Any) -> T:
+    """
+    Create a config dataclass instance from loaded YAML, as dacite.from_dict(data_class, data, DACITE_CONFIG) does.
+    """
+    return get_plan(data_class)(data)
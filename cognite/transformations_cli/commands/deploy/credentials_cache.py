@@ -0,0 +1,66 @@
+import json
+import os
+import threading
+import time
+from hashlib import sha256
+from typing import Dict, Iterable
+
+from cognite.client.data_classes import OidcCredentials
+
+from cognite.transformations_cli.commands.deploy.transformation_types import TransformationConfigError
+
+
+def credentials_key(credentials: OidcCredentials, cluster: str) -> str:
+    """
+    Identify a set of OIDC credentials. The key is a hash, so that secrets are never written to the cache file.
+    """
+    return sha256(
+        json.dumps(
+            [
+                cluster,
+                credentials.client_id,
+                credentials.client_secret,
+                credentials.token_uri,
+                credentials.scopes,
+                credentials.audience,
+                credentials.cdf_project_name,
+            ]
+        ).encode("utf-8")
+    ).hexdigest()
+
+
+class VerifiedCredentialsCache:
+    """
+    On-disk record of the credentials that passed verification, so that consecutive deploys can skip verifying them
+    again until ttl seconds have passed. A cache can be shared by concurrent deploys to several targets.
+    """
+
+    def __init__(self, path: str, ttl: int):
+        self.path = path
+        self.ttl = ttl
+        self.verified_at: Dict[str, float] = dict()
+        self._lock = threading.Lock()
+        if os.path.isfile(path):
+            try:
+                with open(path) as f:
+                    self.verified_at = {k: float(v) for k, v in json.load(f).items()}
+            except (OSError, ValueError, AttributeError) as e:
+                raise TransformationConfigError(f"Failed to read credentials cache file {path}: {e}")
+
+    def is_verified(self, key: str) -> bool:
+        return time.time() - self.verified_at.get(key, 0) < self.ttl
+
+    def mark_verified(self, keys: Iterable[str]) -> None:
+        now = time.time()
+        with self._lock:
+            for key in keys:
+                self.verified_at[key] = now
+
+    def save(self) -> None:
+        now = time.time()
+        with self._lock:
+            valid = {k: v for k, v in self.verified_at.items() if now - v < self.ttl}
+            tmp_path = f"{self.path}.tmp"
+            with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+                json.dump(valid, f)
+            os.replace(tmp_path, self.path)
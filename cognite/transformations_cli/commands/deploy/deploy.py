@@ -1,23 +1,55 @@
-from typing import Dict, Union
+import json
+import os
+import time
+from contextvars import ContextVar
+from typing import Any, Collection, Dict, List, Optional, Tuple, Union
 
 import click
 from cognite.client import CogniteClient
-from cognite.client.config import ClientConfig
-from cognite.client.credentials import OAuthClientCredentials
-from cognite.client.data_classes import OidcCredentials, Transformation
+from cognite.client.data_classes import (
+    OidcCredentials,
+    Transformation,
+    TransformationNotification,
+    TransformationSchedule,
+)
+from tabulate import tabulate
 
-from cognite.transformations_cli.clients import get_client
+from cognite.transformations_cli.clients import get_client, get_shared_client
+from cognite.transformations_cli.commands.deploy.bundle import (
+    load_bundle,
+    load_bundle_manifests,
+    read_manifests,
+    to_transformation_configs,
+)
+from cognite.transformations_cli.commands.deploy.credentials_cache import VerifiedCredentialsCache, credentials_key
+from cognite.transformations_cli.commands.deploy.deploy_plan import RemoteSnapshot, to_operation
+from cognite.transformations_cli.commands.deploy.deploy_report import (
+    active_report,
+    deploy_reporting,
+    report_drift,
+    report_phase,
+)
+from cognite.transformations_cli.commands.deploy.deploy_state import DeployState
+from cognite.transformations_cli.commands.deploy.parse_cache import ParseCache
+from cognite.transformations_cli.commands.deploy.query_store import QueryStore
+from cognite.transformations_cli.commands.deploy.targets import DeployTarget, load_targets
+from cognite.transformations_cli.commands.deploy.task_graph import TaskGraph
 from cognite.transformations_cli.commands.deploy.transformation_config import (
     TransformationConfigError,
     parse_transformation_configs,
 )
+from cognite.transformations_cli.commands.deploy.transformation_types import TransformationConfig
 from cognite.transformations_cli.commands.deploy.transformations_api import (
     StandardResult,
     TupleResult,
+    get_data_set_ids,
     get_existing_notifications_dict,
     get_existing_schedules_dict,
-    get_existing_transformation_ext_ids,
+    get_existing_transformations,
     get_new_transformation_ids,
+    plan_notifications,
+    plan_schedules,
+    plan_transformations,
     to_notification,
     to_schedule,
     to_transformation,
@@ -25,27 +57,27 @@ from cognite.transformations_cli.commands.deploy.transformations_api import (
     upsert_schedules,
     upsert_transformations,
 )
+from cognite.transformations_cli.commands.utils import limit_requests, request_slot, run_concurrently
+
+# Name of the target deployed by the current thread, when deploying to several targets
+_target_label: ContextVar[Optional[str]] = ContextVar("target_label", default=None)
 
 
 def verify_oidc_credentials(type: str, credentials: OidcCredentials, cluster: str) -> None:
     token_inspect = None
-    base_url = f"https://{cluster}.cognitedata.com"
     try:
-        token_custom_args = {"audience": credentials.audience} if credentials.audience else {}
-        client_config = ClientConfig(
-            base_url=base_url,
+        client = get_shared_client(
+            cluster,
+            credentials.cdf_project_name,
+            credentials.client_id,
+            credentials.client_secret,
+            credentials.token_uri,
+            credentials.scopes,
+            credentials.audience,
             client_name="transformations-cli-credentials-test",
-            project=credentials.cdf_project_name,
-            credentials=OAuthClientCredentials(
-                client_id=credentials.client_id,
-                client_secret=credentials.client_secret,
-                token_url=credentials.token_uri,
-                scopes=credentials.scopes,
-                **token_custom_args,
-            ),
         )
-        client = CogniteClient(client_config)
-        token_inspect = client.iam.token.inspect()
+        with request_slot():
+            token_inspect = client.iam.token.inspect()
     except Exception as ex:
         raise TransformationConfigError(f"Credentials for {type} failed to validate: {str(ex)}")
 
@@ -62,18 +94,411 @@ def verify_credentials(t: Transformation, cluster: str) -> None:
         verify_oidc_credentials(f"{t.name} read", t.source_oidc_credentials, cluster)
 
 
+def verify_all_credentials(
+    transformations: List[Transformation],
+    cluster: str,
+    max_workers: int = 1,
+    cache: Optional[VerifiedCredentialsCache] = None,
+) -> None:
+    """
+    Verify the credentials of all transformations. Credentials shared by several transformations are verified once,
+    distinct credentials are verified concurrently, and credentials found in the cache are not verified again.
+    Failures are reported for the first transformation using the credentials.
+    """
+    distinct: Dict[str, Tuple[str, OidcCredentials]] = dict()
+    for t in transformations:
+        if t.has_destination_oidc_credentials:
+            key = credentials_key(t.destination_oidc_credentials, cluster)
+            distinct.setdefault(key, (f"{t.name} write", t.destination_oidc_credentials))
+        if t.has_source_oidc_credentials:
+            key = credentials_key(t.source_oidc_credentials, cluster)
+            distinct.setdefault(key, (f"{t.name} read", t.source_oidc_credentials))
+
+    to_verify = [key for key in distinct if cache is None or not cache.is_verified(key)]
+    run_concurrently(lambda key: verify_oidc_credentials(*distinct[key], cluster), to_verify, max_workers)
+
+    if cache is not None:
+        cache.mark_verified(to_verify)
+        cache.save()
+
+
+def echo(message: str) -> None:
+    """
+    click.echo, prefixed with the name of the target deployed by the current thread when deploying to several targets.
+    """
+    label = _target_label.get()
+    click.echo(f"[{label}] {message}" if label else message)
+
+
 def print_results(
     resource_type: str, action: str, results: Union[StandardResult, TupleResult], debug: bool = False
 ) -> None:
     if results:
-        click.echo(click.style(f"Number of {resource_type}s {action}d: {len(results)}", fg="blue"))
+        echo(click.style(f"Number of {resource_type}s {action}d: {len(results)}", fg="blue"))
         if debug:
             if results:
-                click.echo(click.style(f"List of {resource_type}s {action}d:", fg="green"))
-                click.echo("  " + "\n  ".join([str(i) for i in results]))
+                echo(click.style(f"List of {resource_type}s {action}d:", fg="green"))
+                echo("  " + "\n  ".join([str(i) for i in results]))
     return None
 
 
+def to_requested_schedules_dict(
+    transformation_configs: Dict[str, TransformationConfig]
+) -> Dict[str, TransformationSchedule]:
+    return {
+        t.external_id: to_schedule(t.external_id, t.schedule) for t in transformation_configs.values() if t.schedule
+    }
+
+
+def to_requested_notifications_dict(
+    transformation_configs: Dict[str, TransformationConfig]
+) -> Dict[str, List[TransformationNotification]]:
+    requested_notifications_dict = dict()
+    for t in transformation_configs.values():
+        if t.notifications:
+            notifs = [to_notification(t.external_id, dest) for dest in t.notifications]
+            requested_notifications_dict[t.external_id] = notifs
+    return requested_notifications_dict
+
+
+def deploy_transformation_configs(
+    client: CogniteClient,
+    cluster: str,
+    transformation_configs: Dict[str, TransformationConfig],
+    debug: bool = False,
+    max_workers: int = 1,
+    unchanged_credentials: Collection[str] = (),
+    credentials_cache: Optional[VerifiedCredentialsCache] = None,
+    queries: Optional[QueryStore] = None,
+) -> None:
+    """
+    Create or update the given transformations together with their schedules and notifications. The queries are
+    read from the SQL files of the manifests unless given.
+
+    The phases run as a task graph: the lookups of existing transformations, schedules and notifications overlap
+    with converting the manifests and verifying credentials, and the schedule and notification writes run together
+    once the transformations are written. All the tasks together send at most max_workers requests at a time. The
+    critical path of the graph is printed at the end.
+    """
+    if queries is None:
+        queries = QueryStore.load(transformation_configs)
+    transformations_ext_ids = [t.external_id for t in transformation_configs.values()]
+
+    def convert(data_set_ids: Dict[str, int]) -> List[Transformation]:
+        return [
+            to_transformation(client, conf_path, transformation_configs[conf_path], cluster, data_set_ids, queries)
+            for conf_path in transformation_configs
+        ]
+
+    def write_transformations(
+        transformations: List[Transformation], _: None, existing_transformations: List[Transformation]
+    ) -> Tuple[List[str], List[str]]:
+        existing_transformations_ext_ids = [t.external_id for t in existing_transformations]
+        new_transformation_ext_ids = get_new_transformation_ids(
+            transformations_ext_ids, existing_transformations_ext_ids
+        )
+        _, updated_transformations, created_transformations = upsert_transformations(
+            client,
+            transformations,
+            existing_transformations_ext_ids,
+            new_transformation_ext_ids,
+            max_workers,
+            existing_transformations,
+            unchanged_credentials,
+        )
+        print_results("transformation", "update", updated_transformations, debug)
+        print_results("transformation", "create", created_transformations, debug)
+        return existing_transformations_ext_ids, new_transformation_ext_ids
+
+    def write_schedules(
+        ext_ids: Tuple[List[str], List[str]], existing_schedules_dict: Dict[str, TransformationSchedule]
+    ) -> Tuple[StandardResult, StandardResult, StandardResult]:
+        return upsert_schedules(
+            client,
+            existing_schedules_dict,
+            to_requested_schedules_dict(transformation_configs),
+            *ext_ids,
+            max_workers,
+        )
+
+    def write_notifications(
+        ext_ids: Tuple[List[str], List[str]], existing_notifications_dict: Dict[str, List[TransformationNotification]]
+    ) -> Tuple[TupleResult, TupleResult, TupleResult]:
+        return upsert_notifications(
+            client,
+            existing_notifications_dict,
+            to_requested_notifications_dict(transformation_configs),
+            *ext_ids,
+            max_workers,
+        )
+
+    graph = TaskGraph()
+    graph.add(
+        "data_sets",
+        lambda: get_data_set_ids(
+            client,
+            [conf.data_set_external_id for conf in transformation_configs.values() if conf.data_set_external_id],
+        ),
+    )
+    graph.add("convert", convert, ["data_sets"])
+    graph.add(
+        "verify_credentials",
+        lambda transformations: verify_all_credentials(transformations, cluster, max_workers, credentials_cache),
+        ["convert"],
+    )
+    graph.add(
+        "existing_transformations",
+        lambda: get_existing_transformations(client, transformations_ext_ids, max_workers),
+    )
+    graph.add(
+        "existing_schedules",
+        lambda: get_existing_schedules_dict(client, transformations_ext_ids, max_workers),
+    )
+    graph.add(
+        "existing_notifications",
+        lambda existing: get_existing_notifications_dict(client, transformations_ext_ids, existing),
+        ["existing_transformations"],
+    )
+    graph.add(
+        "upsert_transformations",
+        write_transformations,
+        ["convert", "verify_credentials", "existing_transformations"],
+    )
+    graph.add("upsert_schedules", write_schedules, ["upsert_transformations", "existing_schedules"])
+    graph.add("upsert_notifications", write_notifications, ["upsert_transformations", "existing_notifications"])
+    try:
+        # The tasks share the requests allowed in flight, however many of them run at the same time
+        with limit_requests(max_workers):
+            results = graph.run()
+    finally:
+        report = active_report()
+        if report is not None:
+            label = _target_label.get()
+            report.add_task_graph(graph.timings, graph.critical_path(), f"{label}/" if label else "")
+
+    deleted_schedules, updated_schedules, created_schedules = results["upsert_schedules"]
+    print_results("schedule", "delete", deleted_schedules, debug)
+    print_results("schedule", "update", updated_schedules, debug)
+    print_results("schedule", "create", created_schedules, debug)
+
+    deleted_notifications, _, created_notifications = results["upsert_notifications"]
+    print_results("notification", "delete", deleted_notifications, debug)
+    print_results("notification", "create", created_notifications, debug)
+
+    echo(click.style(graph.format_critical_path(), fg="blue"))
+
+
+def plan_transformation_configs(
+    client: CogniteClient,
+    cluster: str,
+    transformation_configs: Dict[str, TransformationConfig],
+    unchanged_credentials: Collection[str] = (),
+    snapshot: Optional[RemoteSnapshot] = None,
+    queries: Optional[QueryStore] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Compute the operations deploy_transformation_configs would apply, without writing anything. The existing
+    resources are read from the snapshot when given, otherwise from CDF. Credentials are reported as changed unless
+    their transformation is in unchanged_credentials, see get_changed_fields.
+    """
+    if queries is None:
+        queries = QueryStore.load(transformation_configs)
+    data_set_ext_ids = [
+        conf.data_set_external_id for conf in transformation_configs.values() if conf.data_set_external_id
+    ]
+    data_set_ids = (
+        snapshot.get_data_set_ids(data_set_ext_ids) if snapshot else get_data_set_ids(client, data_set_ext_ids)
+    )
+    transformations = [
+        to_transformation(client, conf_path, transformation_configs[conf_path], cluster, data_set_ids, queries)
+        for conf_path in transformation_configs
+    ]
+    transformations_ext_ids = [t.external_id for t in transformation_configs.values()]
+
+    if snapshot:
+        existing_transformations = snapshot.get_existing_transformations(transformations_ext_ids)
+        existing_schedules_dict = snapshot.get_existing_schedules_dict(transformations_ext_ids)
+        existing_notifications_dict = snapshot.get_existing_notifications_dict(transformations_ext_ids)
+    else:
+        existing_transformations = get_existing_transformations(client, transformations_ext_ids)
+        existing_schedules_dict = get_existing_schedules_dict(client, transformations_ext_ids)
+        existing_notifications_dict = get_existing_notifications_dict(
+            client, transformations_ext_ids, existing_transformations
+        )
+    existing_transformations_ext_ids = [t.external_id for t in existing_transformations]
+    new_transformation_ext_ids = sorted(
+        get_new_transformation_ids(transformations_ext_ids, existing_transformations_ext_ids)
+    )
+
+    operations = []
+    updated_transformations, created_transformations = plan_transformations(
+        transformations, existing_transformations, new_transformation_ext_ids, unchanged_credentials
+    )
+    operations += [
+        to_operation("transformation", "update", t.external_id, fields=f) for t, f in updated_transformations
+    ]
+    operations += [to_operation("transformation", "create", t.external_id) for t in created_transformations]
+
+    requested_schedules_dict = to_requested_schedules_dict(transformation_configs)
+    deleted_schedules, updated_schedules, created_schedules = plan_schedules(
+        existing_schedules_dict,
+        requested_schedules_dict,
+        existing_transformations_ext_ids,
+        new_transformation_ext_ids,
+    )
+    operations += [to_operation("schedule", "delete", ext_id) for ext_id in deleted_schedules]
+    for action, ext_ids in [("update", updated_schedules), ("create", created_schedules)]:
+        operations += [
+            to_operation(
+                "schedule",
+                action,
+                ext_id,
+                interval=requested_schedules_dict[ext_id].interval,
+                isPaused=bool(requested_schedules_dict[ext_id].is_paused),
+            )
+            for ext_id in ext_ids
+        ]
+
+    deleted_notifications, created_notifications = plan_notifications(
+        existing_notifications_dict,
+        to_requested_notifications_dict(transformation_configs),
+        existing_transformations_ext_ids,
+        new_transformation_ext_ids,
+    )
+    operations += [
+        to_operation("notification", "delete", ext_id, destination=destination)
+        for ext_id, destination in deleted_notifications.values()
+    ]
+    operations += [
+        to_operation("notification", "create", n.transformation_external_id, destination=n.destination)
+        for n in created_notifications
+    ]
+    return operations
+
+
+def apply_transformation_configs(
+    client: CogniteClient,
+    cluster: str,
+    target: str,
+    transformation_configs: Dict[str, TransformationConfig],
+    queries: QueryStore,
+    debug: bool = False,
+    max_workers: int = 1,
+    refresh_credentials: bool = False,
+    credentials_cache: Optional[VerifiedCredentialsCache] = None,
+    state_file: Optional[str] = None,
+) -> None:
+    """
+    Deploy the transformations to a target. With a state file, only the manifests changed since the last successful
+    deploy to the target are deployed, and the state file is updated. The credentials of every deployed manifest are
+    sent, except those the state file shows unchanged since the last deploy, unless refresh_credentials is set.
+    """
+    if state_file is None:
+        deploy_transformation_configs(
+            client, cluster, transformation_configs, debug, max_workers, (), credentials_cache, queries
+        )
+        return
+
+    state = DeployState.load(state_file, target)
+    fingerprints = {
+        conf_path: state.fingerprint_config(conf, queries.query_hash(conf_path))
+        for conf_path, conf in transformation_configs.items()
+    }
+    changed_configs = {
+        conf_path: conf
+        for conf_path, conf in transformation_configs.items()
+        if not state.is_unchanged(conf.external_id, fingerprints[conf_path])
+    }
+    unchanged = len(transformation_configs) - len(changed_configs)
+    if unchanged:
+        echo(click.style(f"Number of transformations unchanged since the last deploy: {unchanged}", fg="blue"))
+
+    if changed_configs:
+        unchanged_credentials = [
+            conf.external_id
+            for conf in changed_configs.values()
+            if not refresh_credentials and not state.credentials_changed(conf)
+        ]
+        deploy_transformation_configs(
+            client, cluster, changed_configs, debug, max_workers, unchanged_credentials, credentials_cache, queries
+        )
+
+    for conf_path, conf in changed_configs.items():
+        state.record(conf, fingerprints[conf_path], queries.query_hash(conf_path))
+    removed = state.forget_except([conf.external_id for conf in transformation_configs.values()])
+    if removed:
+        echo(click.style(f"Number of removed manifests dropped from the state file: {len(removed)}", fg="blue"))
+    state.save(state_file)
+
+
+def deploy_to_targets(
+    obj: Dict,
+    targets: List[DeployTarget],
+    manifests: List[Dict[str, Any]],
+    target_workers: int = 1,
+    debug: bool = False,
+    max_workers: int = 1,
+    refresh_credentials: bool = False,
+    credentials_cache: Optional[VerifiedCredentialsCache] = None,
+) -> List[Tuple[str, Optional[str], float]]:
+    """
+    Deploy the parsed manifests to every target, up to target_workers targets at a time, each with its own client.
+    A failing target does not stop the others. Returns the name, error message if it failed, and duration in seconds
+    of the deploy to each target.
+    """
+    shared_queries = QueryStore()
+
+    def deploy_target(target: DeployTarget) -> Tuple[str, Optional[str], float]:
+        label = target.label(obj)
+        token = _target_label.set(label)
+        start = time.monotonic()
+        error = None
+        try:
+            target_obj = target.to_client_obj(obj)
+            transformation_configs = to_transformation_configs(manifests, target.environ())
+            queries = QueryStore.load(transformation_configs, shared_queries)
+            client = get_client(target_obj, 90)
+            apply_transformation_configs(
+                client,
+                target_obj["cluster"],
+                f"{target_obj['cluster']}/{target.cdf_project_name}",
+                transformation_configs,
+                queries,
+                debug,
+                max_workers,
+                refresh_credentials,
+                credentials_cache,
+                target.state_file,
+            )
+        except TransformationConfigError as e:
+            error = e.message
+        except SystemExit as e:
+            # Raised by get_client and the API error handling of single target deploys
+            error = str(e.code)
+        except Exception as e:
+            error = str(e)
+        if error:
+            echo(click.style(f"Deploy failed: {error}", fg="red"))
+        _target_label.reset(token)
+        return label, error, time.monotonic() - start
+
+    return run_concurrently(deploy_target, targets, target_workers)
+
+
+def print_target_results(results: List[Tuple[str, Optional[str], float]]) -> None:
+    click.echo(
+        tabulate(
+            [["Target", "Result", "Duration"]]
+            + [
+                [label, f"failed: {error}" if error else "deployed", f"{seconds:.1f}s"]
+                for label, error, seconds in results
+            ],
+            headers="firstrow",
+            tablefmt="rst",
+        )
+    )
+
+
 @click.command(help="Deploy a set of transformations from a directory")
 @click.argument(
     "path",
@@ -91,73 +516,218 @@ def print_results(
     envvar="TRANSFORMATIONS_LEGACY_MODE",
     help="Treat all configs as legacy.",
 )
+@click.option(
+    "--parse-workers",
+    default=os.cpu_count() or 1,
+    type=click.IntRange(min=1),
+    envvar="TRANSFORMATIONS_PARSE_WORKERS",
+    help="Number of processes used to parse the manifests, defaults to the number of CPU cores.",
+)
+@click.option(
+    "--bundle",
+    envvar="TRANSFORMATIONS_BUNDLE",
+    help="Deploy the manifests compiled into this bundle file by the compile command instead of the manifests in "
+    "PATH. Environment variables are expanded from the environment of the deploy.",
+)
+@click.option(
+    "--targets",
+    envvar="TRANSFORMATIONS_TARGETS",
+    help="Path to a YAML file listing the CDF projects to deploy to. The manifests are parsed once and deployed to "
+    "every target concurrently, each with its own client. A failing target does not stop the others.",
+)
+@click.option(
+    "--target-workers",
+    default=4,
+    type=click.IntRange(min=1),
+    envvar="TRANSFORMATIONS_TARGET_WORKERS",
+    help="With --targets, maximum number of targets to deploy to concurrently, defaults to 4.",
+)
+@click.option(
+    "--parse-cache",
+    envvar="TRANSFORMATIONS_PARSE_CACHE",
+    help="Path to a file caching the parsed manifests, e.g. .transformations-parse-cache. Only manifests that changed, "
+    "or whose SQL file changed, since they were cached are parsed again. Environment variables are expanded on every "
+    "deploy and never written to the cache.",
+)
+@click.option(
+    "--max-workers",
+    default=1,
+    type=click.IntRange(min=1),
+    envvar="TRANSFORMATIONS_MAX_WORKERS",
+    help="Maximum number of API requests to send concurrently, shared by the lookups, credential checks and writes "
+    "of the deploy, defaults to 1. With --targets, applies to each target.",
+)
+@click.option(
+    "--refresh-credentials",
+    is_flag=True,
+    envvar="TRANSFORMATIONS_REFRESH_CREDENTIALS",
+    help="With --state-file, send the credentials of every deployed transformation, also when the state file shows "
+    "they did not change since the last deploy. With --plan, report the credentials of every transformation as "
+    "changed.",
+)
+@click.option(
+    "--credentials-cache",
+    envvar="TRANSFORMATIONS_CREDENTIALS_CACHE",
+    help="Path to a file recording which transformation credentials passed verification. Credentials verified within "
+    "--credentials-cache-ttl seconds are not verified again.",
+)
+@click.option(
+    "--credentials-cache-ttl",
+    default=3600,
+    type=click.IntRange(min=0),
+    envvar="TRANSFORMATIONS_CREDENTIALS_CACHE_TTL",
+    help="Number of seconds verified credentials are kept in --credentials-cache, defaults to 3600.",
+)
+@click.option(
+    "--state-file",
+    envvar="TRANSFORMATIONS_STATE_FILE",
+    help="Path to a deploy state file, e.g. .transformations-state.json. When given, only manifests that were added "
+    "or changed since the last successful deploy to the same project are deployed.",
+)
+@click.option(
+    "--plan",
+    is_flag=True,
+    help="Print the create, update and delete operations the deploy would apply as JSON, without applying them. "
+    "Exits with code 2 when there are operations to apply.",
+)
+@click.option(
+    "--snapshot",
+    help="With --plan, read the existing transformations, schedules, notifications and data sets from this remote "
+    "snapshot file instead of from CDF.",
+)
+@click.option(
+    "--save-snapshot",
+    help="With --plan, list the existing resources of the whole project and save them to this remote snapshot file "
+    "for later --snapshot runs.",
+)
+@click.option(
+    "--timings",
+    is_flag=True,
+    envvar="TRANSFORMATIONS_TIMINGS",
+    help="Print a JSON performance report to stderr at the end: wall time per phase, API calls, items and retries per "
+    "resource type, and the slowest requests.",
+)
+@click.option(
+    "--report-file",
+    envvar="TRANSFORMATIONS_REPORT_FILE",
+    help="Write the JSON performance report of --timings to this file.",
+)
+@click.option(
+    "--prometheus-file",
+    envvar="TRANSFORMATIONS_PROMETHEUS_FILE",
+    help="Write the performance report in the Prometheus text format to this file, e.g. for the textfile collector "
+    "of the node exporter.",
+)
 @click.pass_obj
-def deploy(obj: Dict, path: str, debug: bool = False, legacy_mode: bool = False) -> None:
+def deploy(
+    obj: Dict,
+    path: str,
+    debug: bool = False,
+    legacy_mode: bool = False,
+    parse_workers: int = 1,
+    bundle: Optional[str] = None,
+    targets: Optional[str] = None,
+    target_workers: int = 4,
+    parse_cache: Optional[str] = None,
+    max_workers: int = 1,
+    refresh_credentials: bool = False,
+    credentials_cache: Optional[str] = None,
+    credentials_cache_ttl: int = 3600,
+    state_file: Optional[str] = None,
+    plan: bool = False,
+    snapshot: Optional[str] = None,
+    save_snapshot: Optional[str] = None,
+    timings: bool = False,
+    report_file: Optional[str] = None,
+    prometheus_file: Optional[str] = None,
+) -> None:
     """
         Deploy a set of transformations from a directory
     Args:
         path (str): Root directory for transformations
     """
-    click.echo(click.style("Deploying transformations...", fg="red"))
-    try:
-        client = get_client(obj, 90)
-        cluster = obj["cluster"]
-        transformation_configs = parse_transformation_configs(path, legacy_mode)
-        transformations = [
-            to_transformation(client, conf_path, transformation_configs[conf_path], cluster)
-            for conf_path in transformation_configs
-        ]
-        transformations_ext_ids = [t.external_id for t in transformation_configs.values()]
-
-        for t in transformations:
-            verify_credentials(t, cluster)
+    if (snapshot or save_snapshot) and not plan:
+        exit("--snapshot and --save-snapshot can only be used together with --plan.")
+    if targets and (plan or state_file):
+        exit("--targets cannot be used together with --plan or --state-file, set stateFile per target instead.")
+    if plan:
+        # Keep stdout for the machine-readable plan
+        click.echo(click.style("Planning transformations...", fg="red"), err=True)
+    else:
+        click.echo(click.style("Deploying transformations...", fg="red"))
+    with deploy_reporting(timings, report_file, prometheus_file):
+        try:
+            if targets:
+                deploy_targets = load_targets(targets, obj)
+                with report_phase("parse"):
+                    manifests = load_bundle_manifests(bundle) if bundle else read_manifests(path, legacy_mode)
+                results = deploy_to_targets(
+                    obj,
+                    deploy_targets,
+                    manifests,
+                    target_workers,
+                    debug,
+                    max_workers,
+                    refresh_credentials,
+                    VerifiedCredentialsCache(credentials_cache, credentials_cache_ttl) if credentials_cache else None,
+                )
+                print_target_results(results)
+                failed = [label for label, error, _ in results if error]
+                if failed:
+                    exit(f"Deploy failed for {len(failed)} of {len(results)} targets: {', '.join(failed)}")
+                return
 
-        existing_transformations_ext_ids = get_existing_transformation_ext_ids(client, transformations_ext_ids)
-        new_transformation_ext_ids = get_new_transformation_ids(
-            transformations_ext_ids, existing_transformations_ext_ids
-        )
+            cluster = obj["cluster"]
+            with report_phase("parse"):
+                if bundle:
+                    transformation_configs = load_bundle(bundle)
+                else:
+                    parsed_manifests = ParseCache(parse_cache) if parse_cache else None
+                    transformation_configs = parse_transformation_configs(
+                        path, legacy_mode, parse_workers, parsed_manifests
+                    )
+                    if parsed_manifests is not None:
+                        parsed_manifests.save()
+            with report_phase("read_queries"):
+                queries = QueryStore.load(transformation_configs)
+            # Created once the manifests are valid, a deploy failing to parse them never authenticates
+            client = get_client(obj, 90)
 
-        _, updated_transformations, created_transformations = upsert_transformations(
-            client, transformations, existing_transformations_ext_ids, new_transformation_ext_ids
-        )
-
-        print_results("transformation", "update", updated_transformations, debug)
-        print_results("transformation", "create", created_transformations, debug)
-
-        existing_schedules_dict = get_existing_schedules_dict(client, transformations_ext_ids)
-        existing_notifications_dict = get_existing_notifications_dict(client, transformations_ext_ids)
-
-        requested_schedules_dict = {
-            t.external_id: to_schedule(t.external_id, t.schedule) for t in transformation_configs.values() if t.schedule
-        }
-
-        deleted_schedules, updated_schedules, created_schedules = upsert_schedules(
-            client,
-            existing_schedules_dict,
-            requested_schedules_dict,
-            existing_transformations_ext_ids,
-            new_transformation_ext_ids,
-        )
-
-        print_results("schedule", "delete", deleted_schedules, debug)
-        print_results("schedule", "update", updated_schedules, debug)
-        print_results("schedule", "create", created_schedules, debug)
-
-        requested_notifications_dict = dict()
-        for t in transformation_configs.values():
-            if t.notifications:
-                notifs = [to_notification(t.external_id, dest) for dest in t.notifications]
-                requested_notifications_dict[t.external_id] = notifs
-
-        deleted_notifications, _, created_notifications = upsert_notifications(
-            client,
-            existing_notifications_dict,
-            requested_notifications_dict,
-            existing_transformations_ext_ids,
-            new_transformation_ext_ids,
-        )
+            if plan:
+                target = f"{cluster}/{obj.get('cdf_project_name')}"
+                remote_snapshot = None
+                if save_snapshot:
+                    remote_snapshot = RemoteSnapshot.capture(client, target)
+                    remote_snapshot.save(save_snapshot)
+                elif snapshot:
+                    remote_snapshot = RemoteSnapshot.load(snapshot, target)
+                # Secrets cannot be compared, so the plan only reports credentials of another client or project
+                unchanged_credentials = (
+                    [] if refresh_credentials else [conf.external_id for conf in transformation_configs.values()]
+                )
+                operations = plan_transformation_configs(
+                    client, cluster, transformation_configs, unchanged_credentials, remote_snapshot, queries
+                )
+                click.echo(json.dumps({"target": target, "operations": operations}, indent=2))
+                if operations:
+                    report_drift()
+                    exit(2)
+                return
 
-        print_results("notification", "delete", deleted_notifications, debug)
-        print_results("notification", "create", created_notifications, debug)
-    except TransformationConfigError as e:
-        exit(e.message)
+            verified_credentials = (
+                VerifiedCredentialsCache(credentials_cache, credentials_cache_ttl) if credentials_cache else None
+            )
+            apply_transformation_configs(
+                client,
+                cluster,
+                f"{cluster}/{obj.get('cdf_project_name')}",
+                transformation_configs,
+                queries,
+                debug,
+                max_workers,
+                refresh_credentials,
+                verified_credentials,
+                state_file,
+            )
+        except TransformationConfigError as e:
+            exit(e.message)
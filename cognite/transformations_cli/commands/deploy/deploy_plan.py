@@ -0,0 +1,140 @@
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from cognite.client import CogniteClient
+from cognite.client.data_classes import Transformation, TransformationNotification, TransformationSchedule
+
+from cognite.transformations_cli.commands.deploy.transformation_types import TransformationConfigError
+
+SNAPSHOT_VERSION = 1
+
+# Fields of the existing transformations that deploy compares against, other fields are left out of snapshots
+SNAPSHOT_TRANSFORMATION_FIELDS = [
+    "id",
+    "externalId",
+    "name",
+    "query",
+    "destination",
+    "conflictMode",
+    "isPublic",
+    "ignoreNullFields",
+    "dataSetId",
+    "tags",
+    "sourceSession",
+    "destinationSession",
+]
+
+
+class RemoteSnapshot:
+    """
+    The transformations, schedules, notifications and data sets of a CDF project, as needed to plan a deploy without
+    reading them from the API again.
+
+    Attributes:
+        target -- the cluster and CDF project the snapshot was captured from
+        captured_at -- capture time in seconds since the epoch
+    """
+
+    def __init__(
+        self,
+        target: str,
+        transformations: List[Transformation],
+        schedules: List[TransformationSchedule],
+        notifications: Dict[str, List[TransformationNotification]],
+        data_sets: Dict[str, int],
+        captured_at: Optional[float] = None,
+    ):
+        self.target = target
+        self.transformations = {t.external_id: t for t in transformations}
+        self.schedules = {s.external_id: s for s in schedules}
+        self.notifications = notifications
+        self.data_sets = data_sets
+        self.captured_at = captured_at or time.time()
+
+    @classmethod
+    def capture(cls, client: CogniteClient, target: str) -> "RemoteSnapshot":
+        """
+        List the whole project, so that the snapshot also covers manifests added after it was captured.
+        """
+        transformations = client.transformations.list(limit=-1)
+        ext_ids_by_id = {t.id: t.external_id for t in transformations}
+        notifications: Dict[str, List[TransformationNotification]] = dict()
+        for notification in client.transformations.notifications.list(limit=-1):
+            ext_id = ext_ids_by_id.get(notification.transformation_id)
+            if ext_id is not None:
+                notifications.setdefault(ext_id, []).append(notification)
+        return cls(
+            target,
+            list(transformations),
+            list(client.transformations.schedules.list(limit=-1)),
+            notifications,
+            {ds.external_id: ds.id for ds in client.data_sets.list(limit=-1) if ds.external_id and ds.id},
+        )
+
+    @classmethod
+    def load(cls, path: str, target: str) -> "RemoteSnapshot":
+        try:
+            with open(path) as f:
+                content = json.load(f)
+        except (OSError, ValueError) as e:
+            raise TransformationConfigError(f"Failed to read remote snapshot file {path}: {e}")
+        if not isinstance(content, dict) or content.get("version") != SNAPSHOT_VERSION:
+            raise TransformationConfigError(f"Unsupported remote snapshot file {path}, please capture it again.")
+        if content.get("target") != target:
+            raise TransformationConfigError(
+                f"Remote snapshot file {path} was captured from {content.get('target')}, not from {target}."
+            )
+        return cls(
+            target,
+            [Transformation._load(t) for t in content["transformations"]],
+            [TransformationSchedule._load(s) for s in content["schedules"]],
+            {
+                ext_id: [TransformationNotification._load(n) for n in notifs]
+                for ext_id, notifs in content["notifications"].items()
+            },
+            content["dataSets"],
+            content.get("capturedAt"),
+        )
+
+    def save(self, path: str) -> None:
+        content = {
+            "version": SNAPSHOT_VERSION,
+            "target": self.target,
+            "capturedAt": self.captured_at,
+            "transformations": [
+                {k: v for k, v in t.dump(camel_case=True).items() if k in SNAPSHOT_TRANSFORMATION_FIELDS}
+                for t in self.transformations.values()
+            ],
+            "schedules": [s.dump(camel_case=True) for s in self.schedules.values()],
+            "notifications": {
+                ext_id: [n.dump(camel_case=True) for n in notifs] for ext_id, notifs in self.notifications.items()
+            },
+            "dataSets": self.data_sets,
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(content, f, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def get_existing_transformations(self, all_ext_ids: List[str]) -> List[Transformation]:
+        return [self.transformations[ext_id] for ext_id in all_ext_ids if ext_id in self.transformations]
+
+    def get_existing_schedules_dict(self, all_ext_ids: List[str]) -> Dict[str, TransformationSchedule]:
+        return {ext_id: self.schedules[ext_id] for ext_id in all_ext_ids if ext_id in self.schedules}
+
+    def get_existing_notifications_dict(self, all_ext_ids: List[str]) -> Dict[str, List[TransformationNotification]]:
+        return {ext_id: self.notifications[ext_id] for ext_id in all_ext_ids if ext_id in self.notifications}
+
+    def get_data_set_ids(self, data_set_external_ids: List[str]) -> Dict[str, int]:
+        missing = sorted({ext_id for ext_id in data_set_external_ids if ext_id not in self.data_sets})
+        if missing:
+            raise TransformationConfigError(
+                f"Invalid data set external id, not found in the remote snapshot: {', '.join(missing)}"
+            )
+        return {ext_id: self.data_sets[ext_id] for ext_id in data_set_external_ids}
+
+
+def to_operation(resource: str, action: str, external_id: Optional[str], **details: Any) -> Dict[str, Any]:
+    return {"resource": resource, "action": action, "externalId": external_id, **details}
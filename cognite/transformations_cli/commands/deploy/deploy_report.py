@@ -0,0 +1,278 @@
+import heapq
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import click
+
+from cognite.transformations_cli.request_trace import RecordedRequest, recording_requests
+
+SLOWEST_REQUESTS = 10
+
+# Last segments of API paths naming the operation, for the other paths it follows from the method
+OPERATIONS = {
+    "byids": "retrieve",
+    "update": "update",
+    "delete": "delete",
+    "list": "list",
+    "filter": "list",
+    "inspect": "inspect",
+}
+
+PROMETHEUS_PREFIX = "transformations_cli_deploy"
+
+_active: Optional["DeployReport"] = None
+
+
+def active_report() -> Optional["DeployReport"]:
+    """
+    The report recording the running deploy, if any.
+    """
+    return _active
+
+
+def report_phase(name: str) -> ContextManager:
+    """
+    Time a phase of the running deploy, when a report is recording it.
+    """
+    report = _active
+    return report.phase(name) if report is not None else nullcontext()
+
+
+def report_drift() -> None:
+    """
+    Record that the running plan found drift, so that its exit code 2 is not reported as a failure.
+    """
+    report = _active
+    if report is not None:
+        report.drift = True
+
+
+def classify_request(method: str, url: str) -> Tuple[str, str]:
+    """
+    The resource type and operation of an API request, e.g. ("transformations/schedules", "delete").
+    """
+    segments = [segment for segment in urlparse(url).path.split("/") if segment]
+    if "v1" in segments:
+        segments = segments[segments.index("v1") + 1 :]
+    if segments[:1] == ["projects"]:
+        segments = segments[2:]
+    has_id = any(segment.isdigit() for segment in segments)
+    segments = [segment for segment in segments if not segment.isdigit()]
+    if segments and segments[-1] in OPERATIONS:
+        operation = OPERATIONS[segments.pop()]
+    elif method == "GET":
+        operation = "retrieve" if has_id else "list"
+    else:
+        operation = "create" if method == "POST" else method.lower()
+    return "/".join(segments) or "unknown", operation
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class DeployReport:
+    """
+    Performance report of a deploy: wall time per phase, and the API requests sent while recording, counted per
+    resource type and operation together with their items and retries, and the slowest of them.
+
+    Attributes:
+        phases -- wall time in seconds per phase
+        critical_path -- phases that determined the wall time of the last deploy task graph
+        api -- per resource type and operation: number of calls and items, retries and seconds spent
+        success -- whether the deploy succeeded, None while it runs. A plan finding drift succeeded
+        drift -- whether the plan found operations to apply
+        exit_code -- exit code of the deploy, None while it runs
+    """
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, float] = dict()
+        self.critical_path: List[str] = []
+        self.api: Dict[Tuple[str, str], Dict[str, float]] = dict()
+        self.success: Optional[bool] = None
+        self.drift = False
+        self.exit_code: Optional[int] = None
+        self._slowest: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._request_count = 0
+        self._start = time.monotonic()
+        self._duration: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add_phase(name, time.monotonic() - start)
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def add_task_graph(
+        self, timings: Dict[str, Tuple[float, float]], critical_path: List[str], prefix: str = ""
+    ) -> None:
+        for name, (start, end) in timings.items():
+            self.add_phase(f"{prefix}{name}", end - start)
+        self.critical_path = [f"{prefix}{name}" for name in critical_path]
+
+    def record_request(
+        self, method: str, url: str, status: Optional[int], seconds: float, items: int, attempts: int
+    ) -> None:
+        resource, operation = classify_request(method, url)
+        request = {
+            "method": method,
+            "resource": resource,
+            "operation": operation,
+            "status": status,
+            "seconds": round(seconds, 4),
+            "items": items,
+            "attempts": attempts,
+        }
+        with self._lock:
+            stats = self.api.setdefault((resource, operation), {"calls": 0, "items": 0, "retries": 0, "seconds": 0.0})
+            stats["calls"] += 1
+            stats["items"] += items
+            stats["retries"] += max(0, attempts - 1)
+            stats["seconds"] += seconds
+            self._request_count += 1
+            entry = (seconds, self._request_count, request)
+            if len(self._slowest) < SLOWEST_REQUESTS:
+                heapq.heappush(self._slowest, entry)
+            else:
+                heapq.heappushpop(self._slowest, entry)
+
+    def _record(self, request: RecordedRequest) -> None:
+        self.record_request(
+            request.method, request.url, request.status, request.seconds, request.items, len(request.attempts)
+        )
+
+    @contextmanager
+    def recording(self) -> Iterator["DeployReport"]:
+        """
+        Record the requests sent by every Cognite client, from all threads, while the context is active.
+        """
+        global _active
+        _active = self
+        try:
+            with recording_requests(self._record):
+                yield self
+        finally:
+            _active = None
+            self._duration = time.monotonic() - self._start
+
+    @property
+    def duration(self) -> float:
+        return self._duration if self._duration is not None else time.monotonic() - self._start
+
+    def to_dict(self) -> Dict[str, Any]:
+        api: Dict[str, Dict[str, Any]] = dict()
+        for (resource, operation), stats in sorted(self.api.items()):
+            api.setdefault(resource, dict())[operation] = {
+                "calls": int(stats["calls"]),
+                "items": int(stats["items"]),
+                "retries": int(stats["retries"]),
+                "seconds": round(stats["seconds"], 4),
+            }
+        return {
+            "success": self.success,
+            "exitCode": self.exit_code,
+            "drift": self.drift,
+            "seconds": round(self.duration, 4),
+            "phases": {name: round(seconds, 4) for name, seconds in self.phases.items()},
+            "criticalPath": self.critical_path,
+            "api": api,
+            "retries": int(sum(stats["retries"] for stats in self.api.values())),
+            "slowestRequests": [request for _, _, request in sorted(self._slowest, reverse=True)],
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """
+        The report in the Prometheus text exposition format, for the textfile collector of the node exporter.
+        """
+        lines: List[str] = []
+
+        def gauge(name: str, help: str, samples: List[Tuple[Dict[str, str], float]]) -> None:
+            lines.append(f"# HELP {PROMETHEUS_PREFIX}_{name} {help}")
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{name} gauge")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{_escape_label(label)}"' for key, label in labels.items())
+                lines.append(
+                    f"{PROMETHEUS_PREFIX}_{name}{{{label_text}}} {value}"
+                    if labels
+                    else f"{PROMETHEUS_PREFIX}_{name} {value}"
+                )
+
+        gauge("success", "Whether the last deploy succeeded.", [({}, 1 if self.success else 0)])
+        gauge("drift", "Whether the last plan found operations to apply.", [({}, 1 if self.drift else 0)])
+        gauge("duration_seconds", "Wall time of the last deploy.", [({}, round(self.duration, 4))])
+        gauge(
+            "phase_seconds",
+            "Wall time of the phases of the last deploy.",
+            [({"phase": name}, round(seconds, 4)) for name, seconds in self.phases.items()],
+        )
+        for field, help in [
+            ("calls", "Number of API requests of the last deploy."),
+            ("items", "Number of items sent or received by the API requests of the last deploy."),
+            ("retries", "Number of retried API requests of the last deploy."),
+            ("seconds", "Time spent in API requests of the last deploy."),
+        ]:
+            gauge(
+                f"api_{field}",
+                help,
+                [
+                    ({"resource": resource, "operation": operation}, round(stats[field], 4))
+                    for (resource, operation), stats in sorted(self.api.items())
+                ],
+            )
+        return "\n".join(lines) + "\n"
+
+    def save(self, path: str, prometheus: bool = False) -> None:
+        # Written atomically, the textfile collector may read the file at any time
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.to_prometheus() if prometheus else self.to_json())
+        os.replace(tmp_path, path)
+
+
+@contextmanager
+def deploy_reporting(
+    timings: bool = False, report_file: Optional[str] = None, prometheus_file: Optional[str] = None
+) -> Iterator[Optional[DeployReport]]:
+    """
+    Record a report of the deploy run in the context when any output for it is requested, and emit it when the
+    context exits, also when the deploy fails.
+    """
+    if not (timings or report_file or prometheus_file):
+        yield None
+        return
+    report = DeployReport()
+    try:
+        with report.recording():
+            yield report
+        report.exit_code = 0
+    except SystemExit as e:
+        # As the interpreter exits: without a code is success, with a message is failure
+        report.exit_code = e.code if isinstance(e.code, int) else 0 if e.code is None else 1
+        raise
+    except BaseException:
+        report.exit_code = 1
+        raise
+    finally:
+        # A plan exits with code 2 when it finds drift, which is not a failure
+        report.success = report.exit_code == 0 or (report.drift and report.exit_code == 2)
+        if report_file:
+            report.save(report_file)
+        if prometheus_file:
+            report.save(prometheus_file, prometheus=True)
+        if timings:
+            click.echo(report.to_json(), err=True)
@@ -0,0 +1,108 @@
+import hmac
+import json
+import os
+import secrets
+from dataclasses import asdict
+from hashlib import sha256
+from typing import Any, Dict, List, Optional
+
+from cognite.transformations_cli.commands.deploy.transformation_types import (
+    ScheduleConfig,
+    TransformationConfig,
+    TransformationConfigError,
+)
+
+# Bumped whenever the fingerprints change, so that state files written by older versions are discarded
+STATE_VERSION = 3
+
+
+def hash_text(text: str) -> str:
+    return sha256(text.encode("utf-8")).hexdigest()
+
+
+class DeployState:
+    """
+    Fingerprints of the manifests applied by the last successful deploy to a CDF project, keyed by external id.
+
+    Manifests and credentials hold secrets, so their fingerprints are HMACs keyed by a random salt of the state file.
+    A fingerprint cannot be checked against a guessed secret without the salt, or compared across state files.
+
+    Attributes:
+        target -- the cluster and CDF project the state belongs to
+        entries -- per external id: manifest fingerprint, query hash, credentials fingerprint, and the schedule and
+            notifications applied
+        salt -- the key of the fingerprints, generated for a new state file
+    """
+
+    def __init__(self, target: str, entries: Optional[Dict[str, Dict[str, Any]]] = None, salt: Optional[str] = None):
+        self.target = target
+        self.entries: Dict[str, Dict[str, Any]] = entries or dict()
+        self.salt = salt or secrets.token_hex(32)
+
+    @classmethod
+    def load(cls, path: str, target: str) -> "DeployState":
+        """
+        Read the state file at path. A missing state file, or a state file written for another target, gives an
+        empty state so that every manifest is deployed.
+        """
+        if not os.path.isfile(path):
+            return cls(target)
+        try:
+            with open(path) as f:
+                content = json.load(f)
+        except (OSError, ValueError) as e:
+            raise TransformationConfigError(f"Failed to read deploy state file {path}: {e}")
+        if not isinstance(content, dict) or content.get("version") != STATE_VERSION or content.get("target") != target:
+            return cls(target)
+        salt = content.get("salt")
+        if not isinstance(salt, str) or not salt:
+            return cls(target)
+        return cls(target, content.get("transformations", dict()), salt)
+
+    def _keyed_hash(self, text: str) -> str:
+        return hmac.new(self.salt.encode("utf-8"), text.encode("utf-8"), sha256).hexdigest()
+
+    def fingerprint_config(self, config: TransformationConfig, query_hash: str) -> str:
+        """
+        Fingerprint of a resolved manifest, covering the manifest contents (after environment variable expansion) and
+        the content hash of its SQL query.
+        """
+        return self._keyed_hash(f"{config._file_hash}:{query_hash}")
+
+    def fingerprint_credentials(self, config: TransformationConfig) -> str:
+        return self._keyed_hash(json.dumps(asdict(config.authentication), sort_keys=True))
+
+    def is_unchanged(self, external_id: str, fingerprint: str) -> bool:
+        entry = self.entries.get(external_id)
+        return entry is not None and entry.get("fingerprint") == fingerprint
+
+    def credentials_changed(self, config: TransformationConfig) -> bool:
+        entry = self.entries.get(config.external_id)
+        return entry is None or entry.get("credentials") != self.fingerprint_credentials(config)
+
+    def record(self, config: TransformationConfig, fingerprint: str, query_hash: str) -> None:
+        schedule = config.schedule.interval if isinstance(config.schedule, ScheduleConfig) else config.schedule
+        self.entries[config.external_id] = {
+            "fingerprint": fingerprint,
+            "query": query_hash,
+            "credentials": self.fingerprint_credentials(config),
+            "schedule": schedule,
+            "notifications": sorted(config.notifications),
+        }
+
+    def forget_except(self, external_ids: List[str]) -> List[str]:
+        """
+        Drop the entries of manifests that no longer exist, returning their external ids.
+        """
+        keep = set(external_ids)
+        removed = sorted(ext_id for ext_id in self.entries if ext_id not in keep)
+        for ext_id in removed:
+            del self.entries[ext_id]
+        return removed
+
+    def save(self, path: str) -> None:
+        content = {"version": STATE_VERSION, "target": self.target, "salt": self.salt, "transformations": self.entries}
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(content, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
@@ -7,16 +7,24 @@ dataclasses from a config file.
 import json
 import os
 import re
-from enum import Enum
 from hashlib import sha256
-from typing import Any, Callable, Dict, Iterable, TextIO, Type, TypeVar, Union
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Match, Optional, TextIO, Tuple, Type, TypeVar, Union
 
 import dacite
 import yaml
 from yaml.scanner import ScannerError
 
+from cognite.transformations_cli.commands.deploy.config_builder import build_config
+
 CustomConfigClass = TypeVar("CustomConfigClass")
 
+ENV_VAR_PATTERN = re.compile(r"\$\{([^}^{]+)\}")
+# The references os.path.expandvars expands
+ENV_VARIABLE_PATTERN = re.compile(r"\$(\w+|\{[^}]*\})", re.ASCII)
+CAMEL_CASE_PATTERN = re.compile(r"([A-Z]+)")
+# Key of the mappings standing in for values referencing environment variables in documents parsed with placeholders
+ENV_PLACEHOLDER = "$env"
+
 
 class InvalidConfigError(Exception):
     """
@@ -38,6 +46,23 @@ class InvalidConfigError(Exception):
         return self.__str__()
 
 
+def _translate_hyphen(key: str) -> str:
+    return key.replace("-", "_")
+
+
+def _translate_camel(key: str) -> str:
+    return CAMEL_CASE_PATTERN.sub(r"_\1", key).strip("_").lower()
+
+
+_KEY_TRANSLATORS: Dict[str, Callable[[str], str]] = {
+    "hyphen": _translate_hyphen,
+    "kebab": _translate_hyphen,
+    "camel": _translate_camel,
+    "pascal": _translate_camel,
+}
+_UNCHANGED_CASE_STYLES = ("snake", "underscore")
+
+
 def _to_snake_case(dictionary: Dict[str, Any], case_style: str) -> Dict[str, Any]:
     """
     Ensure that all keys in the dictionary follows the snake casing convention (recursively, so any sub-dictionaries are
@@ -79,61 +104,236 @@ def _to_snake_case(dictionary: Dict[str, Any], case_style: str) -> Dict[str, Any
                 new_dict[key_translator(key)] = dict_[key]
         return new_dict
 
-    def translate_hyphen(key):
-        return key.replace("-", "_")
-
-    def translate_camel(key):
-        return re.sub(r"([A-Z]+)", r"_\1", key).strip("_").lower()
-
-    if case_style == "snake" or case_style == "underscore":
+    if case_style in _UNCHANGED_CASE_STYLES:
         return dictionary
-    elif case_style == "hyphen" or case_style == "kebab":
-        return fix_dict(dictionary, translate_hyphen)
-    elif case_style == "camel" or case_style == "pascal":
-        return fix_dict(dictionary, translate_camel)
+    elif case_style in _KEY_TRANSLATORS:
+        return fix_dict(dictionary, _KEY_TRANSLATORS[case_style])
     else:
         raise ValueError(f"Invalid case style: {case_style}")
 
 
+class _KeyTable(dict):
+    """
+    Memoised translation of config keys, shared by all manifests loaded in the process.
+    """
+
+    def __init__(self, translate: Callable[[str], str]):
+        super().__init__()
+        self.translate = translate
+
+    def __missing__(self, key: str) -> str:
+        translated = self[key] = self.translate(key)
+        return translated
+
+
+_KEY_TABLES: Dict[str, _KeyTable] = {style: _KeyTable(translate) for style, translate in _KEY_TRANSLATORS.items()}
+
+
+def _expandvars(value: str, environ: Mapping[str, str]) -> str:
+    """
+    os.path.expandvars, reading the variables from environ instead of os.environ.
+    """
+    if "$" not in value:
+        return value
+
+    def expand(match: Match) -> str:
+        name = match.group(1)
+        if name.startswith("{"):
+            name = name[1:-1]
+        return environ.get(name, match.group(0))
+
+    return ENV_VARIABLE_PATTERN.sub(expand, value)
+
+
+def _expand_env_value(
+    value: str, env_values: Optional[List[Tuple[str, str]]] = None, environ: Optional[Mapping[str, str]] = None
+) -> Any:
+    bool_values = {
+        "true": True,
+        "false": False,
+    }
+    expanded_value = os.path.expandvars(value) if environ is None else _expandvars(value, environ)
+    # Expanded values are part of the fingerprint of the document
+    if env_values is not None:
+        env_values.append((value, expanded_value))
+    return bool_values.get(expanded_value.lower(), expanded_value)
+
+
+def _env_constructor(loader: yaml.SafeLoader, node):
+    return _expand_env_value(node.value, getattr(loader, "env_values", None))
+
+
+def _placeholder_constructor(_: yaml.SafeLoader, node):
+    return {ENV_PLACEHOLDER: node.value}
+
+
+def _build_env_loader(base: Type[yaml.SafeLoader], constructor=_env_constructor) -> Type[yaml.SafeLoader]:
+    class EnvLoader(base):
+        pass
+
+    EnvLoader.add_implicit_resolver("!env", ENV_VAR_PATTERN, None)
+    EnvLoader.add_constructor("!env", constructor)
+    return EnvLoader
+
+
+# The loaders are built once. libyaml backs them when PyYAML is built with it, the pure Python loaders are used
+# otherwise and to word the errors of invalid files.
+PyEnvLoader = _build_env_loader(yaml.SafeLoader)
+PyPlaceholderLoader = _build_env_loader(yaml.SafeLoader, _placeholder_constructor)
+PySafeLoader = yaml.SafeLoader
+if getattr(yaml, "__with_libyaml__", False):
+    EnvLoader = _build_env_loader(yaml.CSafeLoader)
+    PlaceholderLoader = _build_env_loader(yaml.CSafeLoader, _placeholder_constructor)
+    SafeLoader = yaml.CSafeLoader
+else:
+    EnvLoader = PyEnvLoader
+    PlaceholderLoader = PyPlaceholderLoader
+    SafeLoader = PySafeLoader
+
+
+_normalising_loaders: Dict[Tuple[Type[yaml.SafeLoader], str], Type[yaml.SafeLoader]] = {}
+
+
+def _normalising_loader(base: Type[yaml.SafeLoader], case_style: str) -> Type[yaml.SafeLoader]:
+    """
+    Loader translating the keys of mappings to snake case while they are constructed, and recording the expanded
+    environment variables. Built once per base loader and case style.
+    """
+    loader = _normalising_loaders.get((base, case_style))
+    if loader is not None:
+        return loader
+
+    class NormalisingLoader(base):
+        def __init__(self, stream):
+            super().__init__(stream)
+            self.env_values = []
+
+    if case_style not in _UNCHANGED_CASE_STYLES:
+        key_table = _KEY_TABLES[case_style]
+
+        def construct_mapping(loader: yaml.SafeLoader, node: yaml.MappingNode):
+            data = {}
+            yield data
+            for key, value in loader.construct_mapping(node).items():
+                data[key_table[key]] = value
+
+        NormalisingLoader.add_constructor("tag:yaml.org,2002:map", construct_mapping)
+
+    _normalising_loaders[(base, case_style)] = NormalisingLoader
+    return NormalisingLoader
+
+
+def _load_document(source: str, loader_class: Type[yaml.SafeLoader]) -> Tuple[Any, List[Tuple[str, str]]]:
+    loader = loader_class(source)
+    try:
+        return loader.get_single_data(), loader.env_values
+    finally:
+        loader.dispose()
+
+
+def hash_source(source: str) -> str:
+    return sha256(source.encode("utf-8")).hexdigest()
+
+
+def fingerprint_document(source_hash: str, env_values: Iterable[Tuple[str, str]]) -> str:
+    """
+    Fingerprint of a document from the hash of its text and its environment variable references with their expanded
+    values. The references are sorted, so that the order they were expanded in does not matter.
+    """
+    fingerprint = sha256(source_hash.encode("utf-8"))
+    for value, expanded_value in sorted(env_values):
+        fingerprint.update(b"\0" + value.encode("utf-8") + b"\0" + expanded_value.encode("utf-8"))
+    return fingerprint.hexdigest()
+
+
+def _normalise_yaml(
+    source: Union[TextIO, str], case_style: str = "snake", expand_envvars: bool = True, placeholders: bool = False
+) -> Tuple[Any, str]:
+    """
+    Parse a YAML document in one pass: keys are translated to snake case as mappings are constructed, environment
+    variables are expanded, and the document is fingerprinted from its text and the expanded values.
+
+    With placeholders, the values referencing environment variables are kept as {"$env": "${VAR}"} mappings for
+    expand_placeholders, and the fingerprint only covers the text of the document.
+
+    Returns:
+        The parsed document and its fingerprint.
+    """
+    if case_style not in _UNCHANGED_CASE_STYLES and case_style not in _KEY_TRANSLATORS:
+        raise ValueError(f"Invalid case style: {case_style}")
+    if not isinstance(source, str):
+        source = source.read()
+    if placeholders:
+        loader, fallback = PlaceholderLoader, PyPlaceholderLoader
+    else:
+        loader, fallback = (EnvLoader, PyEnvLoader) if expand_envvars else (SafeLoader, PySafeLoader)
+    try:
+        data, env_values = _load_document(source, _normalising_loader(loader, case_style))
+    except yaml.YAMLError:
+        if loader is fallback:
+            raise
+        # Parse again with the pure Python loader, so that errors are reported the same with and without libyaml
+        data, env_values = _load_document(source, _normalising_loader(fallback, case_style))
+
+    if not isinstance(data, dict):
+        # Empty documents become empty configs, other documents fail as they always have
+        data = _to_snake_case(data, case_style)
+
+    return data, fingerprint_document(hash_source(source), env_values)
+
+
+def expand_placeholders(
+    data: Any, env_values: Optional[List[Tuple[str, str]]] = None, environ: Optional[Mapping[str, str]] = None
+) -> Any:
+    """
+    Expand the environment variable placeholders of a document parsed with placeholders, as parsing without them
+    would have. The variables are read from environ, defaulting to os.environ, and the expanded references are
+    appended to env_values.
+    """
+    if isinstance(data, dict):
+        if len(data) == 1 and ENV_PLACEHOLDER in data:
+            return _expand_env_value(data[ENV_PLACEHOLDER], env_values, environ)
+        return {key: expand_placeholders(value, env_values, environ) for key, value in data.items()}
+    if isinstance(data, list):
+        return [expand_placeholders(value, env_values, environ) for value in data]
+    return data
+
+
+def _parse_yaml(source: Union[TextIO, str], expand_envvars: bool = True) -> Any:
+    return _normalise_yaml(source, "snake", expand_envvars)[0]
+
+
 def _load_yaml(
     source: Union[TextIO, str],
     config_type: Type[CustomConfigClass],
     case_style: str = "hyphen",
     expand_envvars=True,
-    dict_manipulator: Callable[[Dict[str, Any]], Dict[str, Any]] = lambda x: x,
+    dict_manipulator: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
 ) -> CustomConfigClass:
-    def env_constructor(_: yaml.SafeLoader, node):
-        bool_values = {
-            "true": True,
-            "false": False,
-        }
-        expanded_value = os.path.expandvars(node.value)
-        return bool_values.get(expanded_value.lower(), expanded_value)
-
-    class EnvLoader(yaml.SafeLoader):
-        pass
+    try:
+        if dict_manipulator is None:
+            config_dict, file_hash = _normalise_yaml(source, case_style, expand_envvars)
+        else:
+            config_dict = _to_snake_case(dict_manipulator(_parse_yaml(source, expand_envvars)), case_style)
+            file_hash = sha256(json.dumps(config_dict).encode("utf-8")).hexdigest()
+    except ScannerError as e:
+        raise _invalid_yaml(e) from e
 
-    EnvLoader.add_implicit_resolver("!env", re.compile(r"\$\{([^}^{]+)\}"), None)
-    EnvLoader.add_constructor("!env", env_constructor)
+    config = _to_config(config_dict, config_type, case_style)
+    config._file_hash = file_hash
+    return config
 
-    loader = EnvLoader if expand_envvars else yaml.SafeLoader
 
-    # Safe to use load instead of safe_load since both loader classes are based on SafeLoader
-    try:
-        config_dict = yaml.load(source, Loader=loader)
-    except ScannerError as e:
-        location = e.problem_mark or e.context_mark
-        formatted_location = f" at line {location.line+1}, column {location.column+1}" if location is not None else ""
-        cause = e.problem or e.context
-        raise InvalidConfigError(f"Invalid YAML{formatted_location}: {cause or ''}") from e
+def _invalid_yaml(e: ScannerError) -> InvalidConfigError:
+    location = e.problem_mark or e.context_mark
+    formatted_location = f" at line {location.line+1}, column {location.column+1}" if location is not None else ""
+    cause = e.problem or e.context
+    return InvalidConfigError(f"Invalid YAML{formatted_location}: {cause or ''}")
 
-    config_dict = dict_manipulator(config_dict)
-    config_dict = _to_snake_case(config_dict, case_style)
 
+def _to_config(config_dict: Dict[str, Any], config_type: Type[CustomConfigClass], case_style: str) -> CustomConfigClass:
     try:
-        config = dacite.from_dict(
-            data=config_dict, data_class=config_type, config=dacite.Config(strict=True, cast=[Enum])
-        )
+        return build_config(config_type, config_dict)
     except dacite.UnexpectedDataError as e:
         unknowns = [f'"{k.replace("_", "-") if case_style == "hyphen" else k}"' for k in e.keys]
         raise InvalidConfigError(f"Unknown config parameter{'s' if len(unknowns) > 1 else ''} {', '.join(unknowns)}")
@@ -159,10 +359,6 @@ def _load_yaml(
     except dacite.ForwardReferenceError as e:
         raise ValueError(f"Invalid config class: {str(e)}")
 
-    config._file_hash = sha256(json.dumps(config_dict).encode("utf-8")).hexdigest()
-
-    return config
-
 
 def load_yaml(
     source: Union[TextIO, str], config_type: Type[CustomConfigClass], case_style: str = "hyphen", expand_envvars=True
@@ -186,4 +382,45 @@ def load_yaml(
     return _load_yaml(source=source, config_type=config_type, case_style=case_style, expand_envvars=expand_envvars)
 
 
+def parse_yaml_with_placeholders(source: Union[TextIO, str], case_style: str = "hyphen") -> Tuple[Dict[str, Any], str]:
+    """
+    Read a YAML file into a dictionary with keys in snake case, keeping the values referencing environment variables
+    as placeholders so that they can be expanded in another environment by load_yaml_dict.
+
+    Returns:
+        The dictionary and the hash of the YAML text.
+
+    Raises:
+        InvalidConfigError: If the YAML is invalid
+    """
+    if not isinstance(source, str):
+        source = source.read()
+    try:
+        config_dict, _ = _normalise_yaml(source, case_style, placeholders=True)
+    except ScannerError as e:
+        raise _invalid_yaml(e) from e
+    return config_dict, hash_source(source)
+
+
+def load_yaml_dict(
+    config_dict: Dict[str, Any],
+    config_type: Type[CustomConfigClass],
+    source_hash: str,
+    case_style: str = "hyphen",
+    environ: Optional[Mapping[str, str]] = None,
+) -> CustomConfigClass:
+    """
+    Create a config object from a dictionary returned by parse_yaml_with_placeholders, expanding its environment
+    variables from environ, defaulting to os.environ. The config is fingerprinted as if load_yaml had read the YAML
+    file in that environment.
+
+    Raises:
+        InvalidConfigError: If any config field is given as an invalid type, is missing or is unknown
+    """
+    env_values: List[Tuple[str, str]] = []
+    config = _to_config(expand_placeholders(config_dict, env_values, environ), config_type, case_style)
+    config._file_hash = fingerprint_document(source_hash, env_values)
+    return config
+
+
 T = TypeVar("T")
@@ -0,0 +1,167 @@
+import os
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Pattern, Set, Tuple
+
+IGNORE_FILE = ".transformationsignore"
+MANIFEST_EXTENSIONS = (".yaml", ".yml")
+
+
+@dataclass
+class IgnoreRule:
+    """
+    One pattern of a .transformationsignore file, following gitignore semantics.
+
+    Attributes:
+        base -- path of the directory holding the ignore file, relative to the deploy root ("" for the root)
+        regex -- compiled pattern, matched against paths relative to base
+        negated -- pattern started with "!" and re-includes what earlier patterns excluded
+        dir_only -- pattern ended with "/" and only matches directories
+    """
+
+    base: str
+    regex: Pattern[str]
+    negated: bool
+    dir_only: bool
+
+    def matches(self, rel_path: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        if self.base:
+            if not rel_path.startswith(self.base + "/"):
+                return False
+            rel_path = rel_path[len(self.base) + 1 :]
+        return self.regex.match(rel_path) is not None
+
+
+def _translate(pattern: str) -> str:
+    """
+    Translate the glob part of a gitignore pattern to a regular expression.
+    """
+    i, n = 0, len(pattern)
+    out = []
+    while i < n:
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == n:
+            out.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        else:
+            c = pattern[i]
+            i += 1
+            if c == "*":
+                out.append("[^/]*")
+            elif c == "?":
+                out.append("[^/]")
+            elif c == "\\" and i < n:
+                out.append(re.escape(pattern[i]))
+                i += 1
+            elif c == "[":
+                end = pattern.find("]", i + 1 if i < n and pattern[i] in "!^" else i)
+                if end == -1:
+                    out.append(re.escape(c))
+                else:
+                    body = pattern[i:end].replace("\\", "\\\\")
+                    if body[:1] in ("!", "^"):
+                        body = "^" + body[1:]
+                    out.append(f"[{body}]")
+                    i = end + 1
+            else:
+                out.append(re.escape(c))
+    return "".join(out)
+
+
+def parse_ignore_rules(content: str, base: str = "") -> List[IgnoreRule]:
+    """
+    Parse the patterns of a .transformationsignore file located in the directory base.
+    """
+    rules = []
+    for line in content.splitlines():
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        elif line.startswith("\\!") or line.startswith("\\#"):
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        # A slash anywhere but at the end anchors the pattern to the directory of the ignore file
+        anchored = "/" in line
+        prefix = "" if anchored else "(?:.*/)?"
+        regex = re.compile(f"{prefix}{_translate(line.lstrip('/'))}$", flags=re.DOTALL)
+        rules.append(IgnoreRule(base, regex, negated, dir_only))
+    return rules
+
+
+def is_ignored(rules: List[IgnoreRule], rel_path: str, is_dir: bool) -> bool:
+    ignored = False
+    for rule in rules:
+        if rule.negated == ignored and rule.matches(rel_path, is_dir):
+            ignored = not rule.negated
+    return ignored
+
+
+def _read_ignore_rules(path: str, base: str) -> List[IgnoreRule]:
+    try:
+        with open(path) as f:
+            return parse_ignore_rules(f.read(), base)
+    except OSError:
+        return []
+
+
+def find_manifest_files(base_dir: str) -> List[str]:
+    """
+    Find the .yaml and .yml files below base_dir in one traversal, in sorted order. Hidden files and directories are
+    skipped, as are the paths excluded by .transformationsignore files. Excluded directories are not descended into.
+    """
+    paths: List[str] = []
+    _walk(base_dir, "", [], paths, set())
+    return paths
+
+
+def _walk(
+    directory: str, rel_dir: str, rules: List[IgnoreRule], paths: List[str], ancestors: Set[Tuple[int, int]]
+) -> None:
+    try:
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda e: e.name)
+        stat = os.stat(directory)
+    except OSError:
+        return
+    # Guard against symbolic links pointing back up the tree
+    key = (stat.st_dev, stat.st_ino)
+    if key in ancestors:
+        return
+    ancestors.add(key)
+
+    if any(entry.name == IGNORE_FILE for entry in entries):
+        rules = rules + _read_ignore_rules(os.path.join(directory, IGNORE_FILE), rel_dir)
+
+    for entry in entries:
+        if entry.name.startswith("."):
+            continue
+        rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+        is_dir = _is_dir(entry)
+        if is_dir is None or (rules and is_ignored(rules, rel_path, is_dir)):
+            continue
+        if is_dir:
+            _walk(entry.path, rel_path, rules, paths, ancestors)
+        elif entry.name.endswith(MANIFEST_EXTENSIONS):
+            paths.append(entry.path)
+
+    ancestors.discard(key)
+
+
+def _is_dir(entry: os.DirEntry) -> Optional[bool]:
+    try:
+        return entry.is_dir()
+    except OSError:
+        return None
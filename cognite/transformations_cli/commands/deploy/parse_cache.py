@@ -0,0 +1,170 @@
+import json
+import os
+import time
+from hashlib import sha256
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from cognite.transformations_cli import __version__
+from cognite.transformations_cli.commands.deploy.transformation_types import QueryConfig, TransformationConfig
+
+PARSE_CACHE_VERSION = 2
+
+# Files modified this close to the time they were read may change again within the same mtime, their contents are
+# compared instead of their stat
+RACY_MTIME_NS = 2 * 10**9
+
+# mtime, size and content hash of a file, and when it was read
+FileIdentity = Tuple[int, int, str, int]
+
+# A manifest parsed with its environment variable references kept as placeholders, and the hash of its text
+CachedDocument = Tuple[Dict[str, Any], str]
+
+
+def _hash_bytes(content: bytes) -> str:
+    return sha256(content).hexdigest()
+
+
+def _identify(path: str) -> Tuple[FileIdentity, bytes]:
+    """
+    Identify a file by its mtime, size and content hash, returning the content too.
+    """
+    read_at_ns = time.time_ns()
+    with open(path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        content = f.read()
+    return (stat.st_mtime_ns, stat.st_size, _hash_bytes(content), read_at_ns), content
+
+
+def _current_identity(path: str, identity: FileIdentity) -> Optional[FileIdentity]:
+    """
+    The identity of a file if its contents are unchanged, None otherwise. The stat of the file is trusted when it
+    matches and predates the time the file was read by a safe margin, the contents are hashed again otherwise.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    mtime_ns, size, content_hash, read_at_ns = identity
+    if stat.st_size != size:
+        return None
+    if stat.st_mtime_ns == mtime_ns and mtime_ns < read_at_ns - RACY_MTIME_NS:
+        return identity
+    try:
+        current = _identify(path)[0]
+    except OSError:
+        return None
+    return current if current[2] == content_hash else None
+
+
+class ParseCache:
+    """
+    On-disk cache of the parsed manifests, so that consecutive deploys only parse the manifests that changed. An entry
+    is used while the manifest and the SQL file it references are unchanged. Entries keep the environment variable
+    references of the manifests as placeholders, expanded each time the config is built, so that no secret read from
+    the environment is written to the cache. Legacy manifests are always parsed.
+
+    Attributes:
+        path -- the cache file
+        entries -- per absolute manifest path: file identities, and the parsed document with the hash of its text
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = dict()
+        self._pending: Dict[str, FileIdentity] = dict()
+        self._changed = False
+        try:
+            with open(path) as f:
+                if os.name == "posix":
+                    stat = os.fstat(f.fileno())
+                    # A cache written by another user, or writable by others, could stand in for any manifest
+                    if stat.st_uid != os.geteuid() or stat.st_mode & 0o077:
+                        return
+                content = json.load(f)
+        except (OSError, ValueError):
+            # Missing, unreadable and invalid caches, e.g. the pickled caches of earlier versions, are rewritten
+            return
+        # Caches written by other versions may hold documents of another shape, they are discarded
+        if (
+            isinstance(content, dict)
+            and content.get("version") == PARSE_CACHE_VERSION
+            and content.get("cli_version") == __version__
+        ):
+            self.entries = content["entries"]
+
+    def lookup(self, path: str, legacy_mode: bool = False) -> Optional[CachedDocument]:
+        """
+        Return the cached document of a manifest if it is still valid, None when the manifest has to be parsed.
+        """
+        if legacy_mode:
+            return None
+        key = os.path.abspath(path)
+        entry = self.entries.get(key)
+        if entry is not None and self._is_valid(key, entry):
+            return entry["document"], entry["sourceHash"]
+        try:
+            self._pending[key] = _identify(key)[0]
+        except OSError:
+            pass
+        return None
+
+    def _is_valid(self, key: str, entry: Dict[str, Any]) -> bool:
+        manifest = _current_identity(key, entry["manifest"])
+        if manifest is None:
+            return False
+        sql = entry["sql"]
+        sql_identity = None if sql is None else _current_identity(sql[0], sql[1])
+        if sql is not None and sql_identity is None:
+            return False
+        # Identities read again, e.g. after a checkout touched the files, are kept so that their stat is trusted later
+        if manifest is not entry["manifest"] or (sql is not None and sql_identity is not sql[1]):
+            entry["manifest"] = manifest
+            entry["sql"] = None if sql is None else (sql[0], sql_identity)
+            self._changed = True
+        return True
+
+    def store(self, path: str, config: TransformationConfig, document: Optional[CachedDocument]) -> None:
+        """
+        Cache the document parsed from a manifest, with the identity the manifest had when lookup was called. The config
+        built from it tells the SQL file it references.
+        """
+        key = os.path.abspath(path)
+        pending = self._pending.pop(key, None)
+        # Legacy configs read environment variables named by plain values, they are always parsed
+        if pending is None or document is None or config.legacy:
+            return
+        try:
+            json.dumps(document[0])
+        except (TypeError, ValueError):
+            # e.g. dates, which YAML reads from plain values, parse the manifest again next time
+            return
+        sql = None
+        if isinstance(config.query, QueryConfig):
+            sql_path = os.path.join(os.path.dirname(key), config.query.file)
+            try:
+                sql = (sql_path, _identify(sql_path)[0])
+            except OSError:
+                # Deploy reports the missing file, parse the manifest again next time
+                return
+        self.entries[key] = {"manifest": pending, "sql": sql, "document": document[0], "sourceHash": document[1]}
+        self._changed = True
+
+    def forget_except(self, paths: Iterable[str]) -> None:
+        keep = {os.path.abspath(path) for path in paths}
+        if any(key not in keep for key in self.entries):
+            self.entries = {key: entry for key, entry in self.entries.items() if key in keep}
+            self._changed = True
+
+    def save(self) -> None:
+        """
+        Write the cache file, if any entry changed since it was read.
+        """
+        if not self._changed:
+            return
+        content = {"version": PARSE_CACHE_VERSION, "cli_version": __version__, "entries": self.entries}
+        tmp_path = f"{self.path}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), "w") as f:
+            json.dump(content, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,76 @@
+import os
+from typing import Dict, List, Mapping, Optional
+
+from cognite.transformations_cli.commands.deploy.deploy_state import hash_text
+from cognite.transformations_cli.commands.deploy.transformation_types import (
+    QueryConfig,
+    TransformationConfig,
+    TransformationConfigError,
+)
+
+
+class QueryStore:
+    """
+    Content-addressed store of the queries of a set of manifests. Every SQL file is read and hashed once, however
+    many manifests share it, and queries with the same contents are stored once.
+
+    Attributes:
+        file_hashes -- content hash per resolved SQL file path
+        queries -- query per content hash
+        query_hashes -- content hash of the query per manifest path
+    """
+
+    def __init__(self, shared: Optional["QueryStore"] = None) -> None:
+        # Stores for several sets of configs of the same manifests, e.g. one per deploy target, share their files
+        self.file_hashes: Dict[str, str] = dict() if shared is None else shared.file_hashes
+        self.queries: Dict[str, str] = dict() if shared is None else shared.queries
+        self.query_hashes: Dict[str, str] = dict()
+
+    @classmethod
+    def load(
+        cls, transformation_configs: Mapping[str, TransformationConfig], shared: Optional["QueryStore"] = None
+    ) -> "QueryStore":
+        """
+        Resolve the queries of the manifests, reading their SQL files unless already read by the shared store. All
+        missing or unreadable SQL files are reported together.
+        """
+        store = cls(shared)
+        store.add_all(transformation_configs)
+        return store
+
+    def _add_text(self, query: str) -> str:
+        query_hash = hash_text(query)
+        self.queries.setdefault(query_hash, query)
+        return query_hash
+
+    def _add_file(self, sql_path: str) -> str:
+        sql_path = os.path.realpath(sql_path)
+        query_hash = self.file_hashes.get(sql_path)
+        if query_hash is None:
+            with open(sql_path, "r") as f:
+                query_hash = self._add_text(f.read())
+            self.file_hashes[sql_path] = query_hash
+        return query_hash
+
+    def add_all(self, transformation_configs: Mapping[str, TransformationConfig]) -> None:
+        failures: List[str] = []
+        for conf_path, config in transformation_configs.items():
+            if isinstance(config.query, QueryConfig):
+                sql_path = os.path.join(os.path.dirname(conf_path), config.query.file)
+                try:
+                    self.query_hashes[conf_path] = self._add_file(sql_path)
+                except (OSError, UnicodeDecodeError) as e:
+                    failures.append(f"{conf_path}: {sql_path} ({e.strerror if isinstance(e, OSError) else e})")
+            else:
+                self.query_hashes[conf_path] = self._add_text(config.query)
+        if failures:
+            raise TransformationConfigError(
+                "Please provide a valid path for sql file. Failed to read the sql files of "
+                f"{len(failures)} manifest(s):\n" + "\n".join(failures)
+            )
+
+    def query_hash(self, conf_path: str) -> str:
+        return self.query_hashes[conf_path]
+
+    def query(self, conf_path: str) -> str:
+        return self.queries[self.query_hashes[conf_path]]
@@ -0,0 +1,79 @@
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from cognite.transformations_cli.commands.deploy.load_yaml import load_yaml
+from cognite.transformations_cli.commands.deploy.transformation_types import TransformationConfigError
+
+CLIENT_FIELDS = ["cluster", "client_id", "client_secret", "token_url", "scopes", "audience", "cdf_project_name"]
+
+
+@dataclass
+class EnvironmentVariable:
+    name: str
+    value: str
+
+
+@dataclass
+class DeployTarget:
+    """
+    A CDF project to deploy the manifests to. Client fields which are not set default to the global options of the
+    CLI, and env overrides the environment variables expanded in the manifests.
+    """
+
+    cdf_project_name: str
+    name: Optional[str] = None
+    cluster: Optional[str] = None
+    client_id: Optional[str] = None
+    client_secret: Optional[str] = None
+    token_url: Optional[str] = None
+    scopes: Optional[str] = None
+    audience: Optional[str] = None
+    state_file: Optional[str] = None
+    env: List[EnvironmentVariable] = field(default_factory=list)
+
+    def to_client_obj(self, obj: Dict) -> Dict:
+        """
+        The CLI context object of the target, to create its client with get_client.
+        """
+        target_obj = dict(obj)
+        for client_field in CLIENT_FIELDS:
+            value = getattr(self, client_field)
+            if value is not None:
+                target_obj[client_field] = value
+        return target_obj
+
+    def environ(self) -> Optional[Dict[str, str]]:
+        """
+        The environment to expand the manifests in, None to use os.environ unchanged.
+        """
+        if not self.env:
+            return None
+        return {**os.environ, **{variable.name: variable.value for variable in self.env}}
+
+    def label(self, obj: Dict) -> str:
+        return self.name or f"{self.cluster or obj.get('cluster')}/{self.cdf_project_name}"
+
+
+@dataclass
+class DeployTargets:
+    targets: List[DeployTarget]
+
+
+def load_targets(path: str, obj: Dict) -> List[DeployTarget]:
+    """
+    Read a targets file. Environment variables referenced in the file are expanded, so that secrets can be kept out
+    of it.
+    """
+    try:
+        with open(path) as f:
+            targets = load_yaml(f, DeployTargets, case_style="camel").targets
+    except Exception as e:
+        raise TransformationConfigError(f"Failed to read targets file {path}: {e}")
+    if not targets:
+        raise TransformationConfigError(f"Targets file {path} has no targets.")
+    labels = [target.label(obj) for target in targets]
+    duplicates = sorted({label for label in labels if labels.count(label) > 1})
+    if duplicates:
+        raise TransformationConfigError(f"Targets must have unique names in {path}: {', '.join(duplicates)}")
+    return targets
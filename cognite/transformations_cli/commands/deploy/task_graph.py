@@ -0,0 +1,84 @@
+import contextvars
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+class TaskGraph:
+    """
+    Named tasks run on a thread pool, each started as soon as the tasks it depends on have finished. A task is called
+    with the results of its dependencies, in the order they were given.
+
+    When a task fails, no further tasks are started, and the error of the first failed task is raised once the running
+    tasks have finished.
+
+    Attributes:
+        results -- result per finished task
+        timings -- start and end time in seconds since the graph started, per finished task
+    """
+
+    def __init__(self) -> None:
+        self._tasks: Dict[str, Tuple[Callable[..., Any], List[str]]] = dict()
+        self.results: Dict[str, Any] = dict()
+        self.timings: Dict[str, Tuple[float, float]] = dict()
+
+    def add(self, name: str, action: Callable[..., Any], dependencies: Sequence[str] = ()) -> None:
+        if name in self._tasks:
+            raise ValueError(f"Task {name} is already in the graph")
+        unknown = [dependency for dependency in dependencies if dependency not in self._tasks]
+        if unknown:
+            # Dependencies are added first, which also keeps the graph acyclic
+            raise ValueError(f"Task {name} depends on tasks not in the graph: {', '.join(unknown)}")
+        self._tasks[name] = (action, list(dependencies))
+
+    def _run_task(self, name: str, start: float) -> Any:
+        action, dependencies = self._tasks[name]
+        task_start = time.monotonic() - start
+        result = action(*[self.results[dependency] for dependency in dependencies])
+        self.timings[name] = (task_start, time.monotonic() - start)
+        return result
+
+    def run(self) -> Dict[str, Any]:
+        start = time.monotonic()
+        pending = list(self._tasks)
+        running: Dict[Future, str] = dict()
+        error: Optional[BaseException] = None
+        with ThreadPoolExecutor(max_workers=max(1, len(self._tasks))) as executor:
+            while running or (pending and error is None):
+                if error is None:
+                    ready = [name for name in pending if all(d in self.results for d in self._tasks[name][1])]
+                    for name in ready:
+                        pending.remove(name)
+                        # Tasks see the context variables of the caller, e.g. the target label of the deploy
+                        context = contextvars.copy_context()
+                        running[executor.submit(context.run, self._run_task, name, start)] = name
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    if future.exception() is not None:
+                        error = error or future.exception()
+                    else:
+                        self.results[name] = future.result()
+        if error is not None:
+            raise error
+        return self.results
+
+    def critical_path(self) -> List[str]:
+        """
+        The chain of tasks that determined how long the graph ran: the task that finished last, preceded by its
+        dependency that finished last, and so on.
+        """
+        if not self.timings:
+            return []
+        path = [max(self.timings, key=lambda name: self.timings[name][1])]
+        dependencies = self._tasks[path[-1]][1]
+        while dependencies:
+            path.append(max(dependencies, key=lambda name: self.timings[name][1]))
+            dependencies = self._tasks[path[-1]][1]
+        return path[::-1]
+
+    def format_critical_path(self) -> str:
+        path = self.critical_path()
+        steps = " -> ".join(f"{name} {self.timings[name][1] - self.timings[name][0]:.2f}s" for name in path)
+        total = self.timings[path[-1]][1] if path else 0.0
+        return f"Critical path ({total:.2f}s): {steps}"
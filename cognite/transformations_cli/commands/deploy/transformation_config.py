@@ -1,10 +1,19 @@
-import glob
+import json
 import os
-from typing import Dict, List, Optional, Union
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from hashlib import sha256
+from typing import Dict, List, Optional, Tuple, Union
 
 from regex import regex
 
-from cognite.transformations_cli.commands.deploy.load_yaml import load_yaml
+from cognite.transformations_cli.commands.deploy.load_yaml import (
+    load_yaml,
+    load_yaml_dict,
+    parse_yaml_with_placeholders,
+)
+from cognite.transformations_cli.commands.deploy.manifest_discovery import find_manifest_files
+from cognite.transformations_cli.commands.deploy.parse_cache import CachedDocument, ParseCache
 from cognite.transformations_cli.commands.deploy.transformation_types import (
     AuthConfig,
     DestinationConfig,
@@ -16,6 +25,16 @@ from cognite.transformations_cli.commands.deploy.transformation_types import (
 )
 from cognite.transformations_cli.commands.deploy.transformation_types_legacy import TransformationConfigLegacy
 
+# Below this number of manifests, starting worker processes costs more than parsing serially
+MIN_FILES_PER_PARSE_WORKER = 32
+
+LEGACY_PATTERN = regex.compile(r"^legacy:\s*true\s*$", flags=regex.MULTILINE | regex.IGNORECASE)
+
+PARSE_ERROR_MESSAGE = "Failed to parse transformation config, please check that you conform required fields and format"
+
+# A parsed config, with the document it was built from when it is to be cached
+ParsedManifest = Tuple[TransformationConfig, Optional[CachedDocument]]
+
 
 def _validate_destination_type(external_id: str, destination_type: DestinationConfigType) -> None:
     flat_destination_type = destination_type if isinstance(destination_type, DestinationType) else destination_type.type
@@ -77,37 +96,107 @@ def _validate_config(config: TransformationConfig) -> None:
     _validate_data_set_id(config.data_set_id, config.data_set_external_id)
 
 
-def _parse_transformation_config(path: str, legacy_mode: bool = False) -> TransformationConfig:
-    r = regex.compile(r"^legacy:\s*true\s*$", flags=regex.MULTILINE | regex.IGNORECASE)
+def is_legacy_manifest(data: str, legacy_mode: bool = False) -> bool:
+    return legacy_mode or LEGACY_PATTERN.search(data) is not None
+
+
+def from_legacy_config(legacy_config: TransformationConfigLegacy) -> TransformationConfig:
+    config = legacy_config.to_new()
+    # to_new() resolves the environment variables named in the manifest, so fingerprint the converted config
+    config._file_hash = sha256(json.dumps(asdict(config), default=str).encode("utf-8")).hexdigest()
+    return config
+
+
+def _parse_transformation_config(path: str, legacy_mode: bool = False, keep_document: bool = False) -> ParsedManifest:
     with open(path) as f:
         data = f.read()
-        if legacy_mode or r.search(data) is not None:
-            legacy_config = load_yaml(data, TransformationConfigLegacy, case_style="camel")
-            return legacy_config.to_new()
+        if is_legacy_manifest(data, legacy_mode):
+            return from_legacy_config(load_yaml(data, TransformationConfigLegacy, case_style="camel")), None
+        elif keep_document:
+            # The document keeps its environment variable references, so that it can be cached without their values
+            document = parse_yaml_with_placeholders(data, case_style="camel")
+            return _build_transformation_config(document), document
         else:
-            return load_yaml(data, TransformationConfig, case_style="camel")
-
-
-def parse_transformation_configs(base_dir: Optional[str], legacy_mode: bool = False) -> Dict[str, TransformationConfig]:
+            return load_yaml(data, TransformationConfig, case_style="camel"), None
+
+
+def _build_transformation_config(document: CachedDocument) -> TransformationConfig:
+    config_dict, source_hash = document
+    return load_yaml_dict(config_dict, TransformationConfig, source_hash, "camel")
+
+
+def _parse_and_validate(args: Tuple[str, bool, bool]) -> Union[ParsedManifest, str]:
+    """
+    Parse and validate one manifest. Errors are returned as messages rather than raised, so that they cross process
+    boundaries unchanged.
+    """
+    file_path, legacy_mode, keep_document = args
+    try:
+        parsed_conf, document = _parse_transformation_config(file_path, legacy_mode, keep_document)
+        # This will raise exceptions if invalid
+        _validate_config(parsed_conf)
+        return parsed_conf, document
+    except Exception as e:
+        return f"{PARSE_ERROR_MESSAGE}: {e}"
+
+
+def _build_and_validate(document: CachedDocument) -> TransformationConfig:
+    """
+    Build and validate the config of a cached document, expanding its environment variables.
+    """
+    try:
+        config = _build_transformation_config(document)
+        _validate_config(config)
+    except Exception as e:
+        raise TransformationConfigError(f"{PARSE_ERROR_MESSAGE}: {e}")
+    return config
+
+
+def parse_transformation_configs(
+    base_dir: Optional[str],
+    legacy_mode: bool = False,
+    parse_workers: int = 1,
+    parse_cache: Optional[ParseCache] = None,
+) -> Dict[str, TransformationConfig]:
+    """
+    Args:
+        parse_workers: Number of processes used to parse the manifests. Small trees are parsed in this process.
+        parse_cache: Cache of parsed manifests. Only the manifests without a valid entry are parsed, and the cache is
+            updated with them. The caller saves the cache.
+    """
     if base_dir is None:
         base_dir = "."
 
     if os.path.isdir(base_dir) is False:
         raise TransformationConfigError(f"Transformation root folder not found: {base_dir}")
 
-    transformations: Dict[str, TransformationConfig] = dict()
-    yaml_paths: List[str] = glob.glob(f"{base_dir}/**/*.yaml", recursive=True) + glob.glob(
-        f"{base_dir}/**/*.yml", recursive=True
-    )
-
-    for file_path in yaml_paths:
-        try:
-            parsed_conf = _parse_transformation_config(file_path, legacy_mode)
-            # This will raise exceptions if invalid
-            _validate_config(parsed_conf)
-            transformations[file_path] = parsed_conf
-        except Exception as e:
-            raise TransformationConfigError(
-                f"Failed to parse transformation config, please check that you conform required fields and format: {e}"
-            )
-    return transformations
+    yaml_paths = find_manifest_files(base_dir)
+    cached: Dict[str, TransformationConfig] = dict()
+    if parse_cache is not None:
+        for file_path in yaml_paths:
+            cached_document = parse_cache.lookup(file_path, legacy_mode)
+            if cached_document is not None:
+                cached[file_path] = _build_and_validate(cached_document)
+    parse_paths = [file_path for file_path in yaml_paths if file_path not in cached]
+    tasks = [(file_path, legacy_mode, parse_cache is not None) for file_path in parse_paths]
+    workers = min(parse_workers, len(tasks) // MIN_FILES_PER_PARSE_WORKER)
+    results: List[Union[ParsedManifest, str]] = []
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_parse_and_validate, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    else:
+        for task in tasks:
+            results.append(_parse_and_validate(task))
+            if isinstance(results[-1], str):
+                break
+
+    parsed: Dict[str, TransformationConfig] = dict()
+    for file_path, result in zip(parse_paths, results):
+        if isinstance(result, str):
+            raise TransformationConfigError(result)
+        parsed[file_path] = result[0]
+        if parse_cache is not None:
+            parse_cache.store(file_path, *result)
+    if parse_cache is not None:
+        parse_cache.forget_except(yaml_paths)
+    return {file_path: cached[file_path] if file_path in cached else parsed[file_path] for file_path in yaml_paths}
@@ -1,9 +1,10 @@
 import os
 import sys
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Any, Collection, Dict, List, Optional, Tuple, Union
 
 from cognite.client import CogniteClient
 from cognite.client.data_classes import (
+    DataSetList,
     OidcCredentials,
     Transformation,
     TransformationDestination,
@@ -11,6 +12,7 @@ from cognite.client.data_classes import (
     TransformationSchedule,
     TransformationUpdate,
 )
+from cognite.client.data_classes.transformations import SessionDetails
 from cognite.client.data_classes.transformations.common import (
     DataModelInfo,
     Edges,
@@ -22,6 +24,8 @@ from cognite.client.data_classes.transformations.common import (
 )
 from cognite.client.exceptions import CogniteAPIError, CogniteDuplicatedError, CogniteNotFoundError
 
+from cognite.transformations_cli.commands.deploy.batching import AdaptiveBatcher
+from cognite.transformations_cli.commands.deploy.query_store import QueryStore
 from cognite.transformations_cli.commands.deploy.transformation_types import (
     ActionType,
     AuthConfig,
@@ -37,8 +41,9 @@ from cognite.transformations_cli.commands.deploy.transformation_types import (
     ScheduleConfig,
     SequenceRowsDestinationConfig,
     TransformationConfig,
+    TransformationConfigError,
 )
-from cognite.transformations_cli.commands.utils import chunk_items, exit_with_cognite_api_error
+from cognite.transformations_cli.commands.utils import exit_with_cognite_api_error, request_slot
 
 TupleResult = List[Tuple[str, str]]
 StandardResult = List[str]
@@ -49,6 +54,8 @@ def to_transformation(
     conf_path: str,
     config: TransformationConfig,
     cluster: str = "europe-west1-1",
+    data_set_ids: Optional[Dict[str, int]] = None,
+    queries: Optional[QueryStore] = None,
 ) -> Transformation:
     return Transformation(
         name=config.name,
@@ -57,32 +64,62 @@ def to_transformation(
         conflict_mode=to_action(config.action),
         is_public=config.shared,
         ignore_null_fields=config.ignore_null_fields,
-        query=to_query(conf_path, config.query),
+        query=queries.query(conf_path) if queries else to_query(conf_path, config.query),
         source_oidc_credentials=to_read_oidc(config.authentication, cluster),
         destination_oidc_credentials=to_write_oidc(config.authentication, cluster),
-        data_set_id=to_data_set_id(client, config.data_set_id, config.data_set_external_id),
+        data_set_id=to_data_set_id(client, config.data_set_id, config.data_set_external_id, data_set_ids),
         tags=config.tags,
     )
 
 
+def get_data_set_ids(client: CogniteClient, data_set_external_ids: Collection[str]) -> Dict[str, int]:
+    """
+    Resolve data set external ids to ids with one request, exiting with all the missing external ids if any of them
+    can not be found.
+    """
+    external_ids = sorted(set(data_set_external_ids))
+    if not external_ids:
+        return dict()
+    err = ""
+    try:
+        data_sets = DataSetList(
+            [
+                ds
+                for batch in AdaptiveBatcher.for_api(client.data_sets, "retrieve").run(
+                    lambda b: client.data_sets.retrieve_multiple(external_ids=b, ignore_unknown_ids=True), external_ids
+                )
+                for ds in batch
+            ]
+        )
+    except CogniteAPIError as e:
+        err = f" ({e})"
+        data_sets = DataSetList([])
+    data_set_ids = {ds.external_id: ds.id for ds in data_sets if ds.external_id and ds.id}
+    missing = [ext_id for ext_id in external_ids if ext_id not in data_set_ids]
+    if missing:
+        sys.exit(
+            f"Invalid data set external id, please verify if it exists or you have the required capability: {', '.join(missing)}{err}"
+        )
+    return data_set_ids
+
+
 def to_data_set_id(
     client: CogniteClient,
     data_set_id: Optional[int],
     data_set_external_id: Optional[str],
+    data_set_ids: Optional[Dict[str, int]] = None,
 ) -> Optional[int]:
-    err = ""
+    """
+    Args:
+        data_set_ids: Memo of resolved data set external ids, shared between conversions. Missing entries are
+            retrieved and added to it.
+    """
     if data_set_external_id:
-        try:
-            data_set = client.data_sets.retrieve(external_id=data_set_external_id)
-        except CogniteAPIError as e:
-            err = f" ({e})"
-            data_set = None
-        if data_set:
-            return data_set.id
-        else:
-            sys.exit(
-                f"Invalid data set external id, please verify if it exists or you have the required capability: {data_set_external_id}{err}"
-            )
+        if data_set_ids is None:
+            data_set_ids = dict()
+        if data_set_external_id not in data_set_ids:
+            data_set_ids.update(get_data_set_ids(client, [data_set_external_id]))
+        return data_set_ids[data_set_external_id]
     return data_set_id
 
 
@@ -139,15 +176,14 @@ def to_destination(destination: DestinationConfigType) -> TransformationDestinat
 
 
 def to_query(conf_path: str, query: Union[str, QueryConfig]) -> str:
-    try:
-        dir_path = os.path.dirname(conf_path)
-        if isinstance(query, QueryConfig):
-            sql_path = os.path.join(dir_path, query.file)
+    if isinstance(query, QueryConfig):
+        sql_path = os.path.join(os.path.dirname(conf_path), query.file)
+        try:
             with open(sql_path, "r") as f:
                 return f.read()
-        return query
-    except:
-        sys.exit("Please provide a valid path for sql file.")
+        except OSError as e:
+            raise TransformationConfigError(f"Please provide a valid path for sql file. {conf_path}: {sql_path} ({e})")
+    return query
 
 
 def stringify_scopes(scopes: Optional[List[str]]) -> Optional[str]:
@@ -215,61 +251,221 @@ def to_notification(transformation_external_id: str, destination: str) -> Transf
     return TransformationNotification(transformation_external_id=transformation_external_id, destination=destination)
 
 
+def get_existing_transformations(
+    client: CogniteClient, all_ext_ids: List[str], max_workers: int = 1
+) -> List[Transformation]:
+    batches = AdaptiveBatcher.for_api(client.transformations, "retrieve").run(
+        lambda b: client.transformations.retrieve_multiple(external_ids=b, ignore_unknown_ids=True),
+        all_ext_ids,
+        max_workers,
+    )
+    return [t for batch in batches for t in batch]
+
+
 def get_existing_transformation_ext_ids(client: CogniteClient, all_ext_ids: List[str]) -> List[str]:
-    return [
-        t.external_id
-        for t in client.transformations.retrieve_multiple(external_ids=all_ext_ids, ignore_unknown_ids=True)
-    ]
+    return [t.external_id for t in get_existing_transformations(client, all_ext_ids)]
 
 
 def get_new_transformation_ids(all_ext_ids: List[str], existig_ext_ids: List[str]) -> List[str]:
     return list(set(all_ext_ids) - set(existig_ext_ids))
 
 
-def get_existing_schedules_dict(client: CogniteClient, all_ext_ids: List[str]) -> Dict[str, TransformationSchedule]:
-    return {
-        s.external_id: s
-        for s in client.transformations.schedules.retrieve_multiple(external_ids=all_ext_ids, ignore_unknown_ids=True)
-    }
+def get_existing_schedules_dict(
+    client: CogniteClient, all_ext_ids: List[str], max_workers: int = 1
+) -> Dict[str, TransformationSchedule]:
+    batches = AdaptiveBatcher.for_api(client.transformations.schedules, "retrieve").run(
+        lambda b: client.transformations.schedules.retrieve_multiple(external_ids=b, ignore_unknown_ids=True),
+        all_ext_ids,
+        max_workers,
+    )
+    return {s.external_id: s for batch in batches for s in batch}
 
 
 def get_existing_notifications_dict(
-    client: CogniteClient, all_ext_ids: List[str]
+    client: CogniteClient,
+    all_ext_ids: List[str],
+    existing_transformations: Optional[List[Transformation]] = None,
 ) -> Dict[str, List[TransformationNotification]]:
-    existing_notifications = dict()
-    for ext_id in all_ext_ids:
-        notifications = client.transformations.notifications.list(transformation_external_id=ext_id, limit=-1)
-        if notifications:
-            existing_notifications[ext_id] = notifications
+    """
+    Fetch the existing notifications of the given transformations, keyed by transformation external id.
+
+    All notifications are listed in one paginated pass and matched to the transformations by id, instead of listing
+    the notifications of every transformation separately.
+    """
+    if existing_transformations is None:
+        existing_transformations = get_existing_transformations(client, all_ext_ids)
+    requested_ext_ids = set(all_ext_ids)
+    ext_ids_by_id = {t.id: t.external_id for t in existing_transformations if t.external_id in requested_ext_ids}
+    if not ext_ids_by_id:
+        return dict()
+
+    existing_notifications: Dict[str, List[TransformationNotification]] = dict()
+    with request_slot():
+        notifications = client.transformations.notifications.list(limit=-1)
+    for notification in notifications:
+        ext_id = ext_ids_by_id.get(notification.transformation_id)
+        if ext_id is not None:
+            existing_notifications.setdefault(ext_id, []).append(notification)
     return existing_notifications
 
 
+def _without_none(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _without_none(v) for k, v in value.items() if v is not None}
+    return value
+
+
+def _dump_destination(destination: Optional[TransformationDestination]) -> Any:
+    return _without_none(destination.dump(camel_case=True)) if destination is not None else None
+
+
+def _credentials_changed(credentials: OidcCredentials, session: Optional[SessionDetails]) -> bool:
+    # The session tells which client and project the credentials belong to, but not which secret they use
+    return (
+        session is None
+        or session.client_id != credentials.client_id
+        or session.project_name != credentials.cdf_project_name
+    )
+
+
+def get_changed_fields(
+    desired: Transformation, existing: Transformation, credentials_unchanged: bool = False
+) -> List[str]:
+    """
+    Compare a transformation from a manifest with the existing one and return the names of the fields to update.
+
+    Fields which are not set on the desired transformation are left untouched, except the data set id which is cleared
+    when not provided. Secrets are never returned by the API, so credentials are always updated, unless
+    credentials_unchanged tells they did not change since the last deploy. They are then only updated when they
+    belong to another client or project than the existing session.
+    """
+    changed = []
+    for field in ["name", "conflict_mode", "query", "is_public", "ignore_null_fields"]:
+        value = getattr(desired, field)
+        if value is not None and value != getattr(existing, field):
+            changed.append(field)
+    if desired.destination is not None and _dump_destination(desired.destination) != _dump_destination(
+        existing.destination
+    ):
+        changed.append("destination")
+    if desired.data_set_id != existing.data_set_id:
+        changed.append("data_set_id")
+    if desired.tags is not None and sorted(desired.tags) != sorted(existing.tags or []):
+        changed.append("tags")
+    for field, session in [
+        ("source_oidc_credentials", existing.source_session),
+        ("destination_oidc_credentials", existing.destination_session),
+    ]:
+        credentials = getattr(desired, field)
+        if credentials is not None and (not credentials_unchanged or _credentials_changed(credentials, session)):
+            changed.append(field)
+    return changed
+
+
+def to_transformation_update(
+    client: CogniteClient, desired: Transformation, changed_fields: List[str], sessions_cache: Dict[str, Any]
+) -> TransformationUpdate:
+    update = TransformationUpdate(external_id=desired.external_id)
+    for field in changed_fields:
+        if field not in ["source_oidc_credentials", "destination_oidc_credentials"]:
+            getattr(update, field).set(getattr(desired, field))
+
+    if "source_oidc_credentials" in changed_fields or "destination_oidc_credentials" in changed_fields:
+        # Exchange credentials for session nonces the same way the SDK does when updating a full Transformation
+        credentials = Transformation(
+            external_id=desired.external_id,
+            source_oidc_credentials=(
+                desired.source_oidc_credentials if "source_oidc_credentials" in changed_fields else None
+            ),
+            destination_oidc_credentials=(
+                desired.destination_oidc_credentials if "destination_oidc_credentials" in changed_fields else None
+            ),
+        )
+        credentials._cognite_client = client
+        credentials._process_credentials(sessions_cache=sessions_cache, keep_none=True)
+        if credentials.source_nonce:
+            update.source_nonce.set(credentials.source_nonce)
+        elif credentials.source_oidc_credentials:
+            update.source_oidc_credentials.set(credentials.source_oidc_credentials)
+        if credentials.destination_nonce:
+            update.destination_nonce.set(credentials.destination_nonce)
+        elif credentials.destination_oidc_credentials:
+            update.destination_oidc_credentials.set(credentials.destination_oidc_credentials)
+    return update
+
+
+def plan_transformations(
+    transformations: List[Transformation],
+    existing_transformations: List[Transformation],
+    new_ext_ids: List[str],
+    unchanged_credentials: Collection[str] = (),
+) -> Tuple[List[Tuple[Transformation, List[str]]], List[Transformation]]:
+    """
+    Bucket the requested transformations into the existing ones to update, together with their changed fields, and
+    the new ones to create. Existing transformations without changes are left out.
+    """
+    existing_by_ext_id = {t.external_id: t for t in existing_transformations}
+    new_ext_ids_set = set(new_ext_ids)
+
+    items_to_update = []
+    for tr in transformations:
+        if tr.external_id in existing_by_ext_id:
+            changed_fields = get_changed_fields(
+                tr, existing_by_ext_id[tr.external_id], tr.external_id in unchanged_credentials
+            )
+            if changed_fields:
+                items_to_update.append((tr, changed_fields))
+    items_to_create = [tr for tr in transformations if tr.external_id in new_ext_ids_set]
+    return items_to_update, items_to_create
+
+
 def upsert_transformations(
     client: CogniteClient,
     transformations: List[Transformation],
     existing_ext_ids: List[str],
     new_ext_ids: List[str],
+    max_workers: int = 1,
+    existing_transformations: Optional[List[Transformation]] = None,
+    unchanged_credentials: Collection[str] = (),
 ) -> Tuple[StandardResult, StandardResult, StandardResult]:
+    """
+    Create the new transformations and update the changed fields of the existing ones. Existing transformations
+    without changes are skipped.
+
+    Args:
+        existing_transformations: The existing transformations as retrieved from CDF, fetched when not provided.
+        unchanged_credentials: External ids of transformations whose credentials did not change since the last
+            deploy. Their credentials are only sent when they belong to another client or project than the existing
+            session.
+    """
     try:
-        items_to_update = [tr for tr in transformations if tr.external_id in existing_ext_ids]
-        items_to_create = [tr for tr in transformations if tr.external_id in new_ext_ids]
-
-        for u in chunk_items(items_to_update):
-            client.transformations.update(u)
-            # Partial update for data set id to be able to clear data set id field when requested.
-            dataset_update = [
-                # Clear data set id if it is not provided, else set data set id with a new value
-                TransformationUpdate(external_id=du.external_id).data_set_id.set(du.data_set_id)
-                for du in u
-            ]
-            client.transformations.update(dataset_update)
+        existing_ext_ids_set = set(existing_ext_ids)
+        if existing_transformations is None:
+            existing_transformations = (
+                get_existing_transformations(client, existing_ext_ids, max_workers) if existing_ext_ids else []
+            )
+        existing_by_ext_id = {t.external_id: t for t in existing_transformations}
+        items_to_update, items_to_create = plan_transformations(
+            transformations,
+            [existing_by_ext_id.get(ext_id, Transformation(external_id=ext_id)) for ext_id in existing_ext_ids_set],
+            new_ext_ids,
+            unchanged_credentials,
+        )
+
+        def update_chunk(u: List[Tuple[Transformation, List[str]]]) -> None:
+            sessions_cache: Dict[str, Any] = dict()
+            client.transformations.update(
+                [to_transformation_update(client, tr, changed_fields, sessions_cache) for tr, changed_fields in u]
+            )
 
-        for c in chunk_items(items_to_create):
-            client.transformations.create(c)
+        AdaptiveBatcher.for_api(client.transformations, "update").run(update_chunk, items_to_update, max_workers)
+        AdaptiveBatcher.for_api(client.transformations, "create").run(
+            client.transformations.create, items_to_create, max_workers
+        )
 
         return (
             [],
-            [t.external_id for t in items_to_update],
+            [t.external_id for t, _ in items_to_update],
             [t.external_id for t in items_to_create],
         )
     except (CogniteDuplicatedError, CogniteNotFoundError, CogniteAPIError) as e:
@@ -277,69 +473,111 @@ def upsert_transformations(
     return [], [], []
 
 
-def upsert_schedules(
-    client: CogniteClient,
+def is_schedule_changed(existing: TransformationSchedule, requested: TransformationSchedule) -> bool:
+    return existing.interval != requested.interval or bool(existing.is_paused) != bool(requested.is_paused)
+
+
+def plan_schedules(
     existing_schedules_dict: Dict[str, TransformationSchedule],
     requested_schedules_dict: Dict[str, TransformationSchedule],
     existing_transformations_ext_ids: List[str],
     new_transformations_ext_ids: List[str],
-) -> Tuple[StandardResult, StandardResult, StandardResult]:
+) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Return the external ids of the schedules to delete, update and create.
+    """
     to_delete = []
     to_update = []
     to_create = []
-    try:
-        for ext_id in existing_transformations_ext_ids:
-            if ext_id in existing_schedules_dict and ext_id not in requested_schedules_dict:
-                to_delete.append(ext_id)
-            elif ext_id in existing_schedules_dict:
+    for ext_id in existing_transformations_ext_ids:
+        if ext_id in existing_schedules_dict and ext_id not in requested_schedules_dict:
+            to_delete.append(ext_id)
+        elif ext_id in existing_schedules_dict:
+            if is_schedule_changed(existing_schedules_dict[ext_id], requested_schedules_dict[ext_id]):
                 to_update.append(ext_id)
-            elif ext_id in requested_schedules_dict:
-                to_create.append(ext_id)
-        to_create += [ext_id for ext_id in new_transformations_ext_ids if ext_id in requested_schedules_dict]
+        elif ext_id in requested_schedules_dict:
+            to_create.append(ext_id)
+    to_create += [ext_id for ext_id in new_transformations_ext_ids if ext_id in requested_schedules_dict]
+    return to_delete, to_update, to_create
+
 
-        for d in chunk_items(to_delete):
-            client.transformations.schedules.delete(external_id=d)
+def upsert_schedules(
+    client: CogniteClient,
+    existing_schedules_dict: Dict[str, TransformationSchedule],
+    requested_schedules_dict: Dict[str, TransformationSchedule],
+    existing_transformations_ext_ids: List[str],
+    new_transformations_ext_ids: List[str],
+    max_workers: int = 1,
+) -> Tuple[StandardResult, StandardResult, StandardResult]:
+    to_delete, to_update, to_create = plan_schedules(
+        existing_schedules_dict,
+        requested_schedules_dict,
+        existing_transformations_ext_ids,
+        new_transformations_ext_ids,
+    )
+    try:
+        schedules = client.transformations.schedules
+        AdaptiveBatcher.for_api(schedules, "delete").run(
+            lambda d: schedules.delete(external_id=d), to_delete, max_workers
+        )
         schedules_update_list = [requested_schedules_dict[ext_id] for ext_id in to_update]
-        for u in chunk_items(schedules_update_list):
-            client.transformations.schedules.update(u)
+        AdaptiveBatcher.for_api(schedules, "update").run(schedules.update, schedules_update_list, max_workers)
         schedules_create_list = [requested_schedules_dict[ext_id] for ext_id in to_create]
-        for c in chunk_items(schedules_create_list):
-            client.transformations.schedules.create(c)
+        AdaptiveBatcher.for_api(schedules, "create").run(schedules.create, schedules_create_list, max_workers)
     except (CogniteDuplicatedError, CogniteNotFoundError, CogniteAPIError) as e:
         exit_with_cognite_api_error(e)
     return to_delete, to_update, to_create
 
 
+def plan_notifications(
+    existing_notifications_dict: Dict[str, List[TransformationNotification]],
+    requested_notifications_dict: Dict[str, List[TransformationNotification]],
+    existing_transformations_ext_ids: List[str],
+    new_transformations_ext_ids: List[str],
+) -> Tuple[Dict[int, Tuple[str, str]], List[TransformationNotification]]:
+    """
+    Return the notifications to delete, keyed by id with their transformation external id and destination, and the
+    notifications to create.
+    """
+    to_delete = dict()
+    to_create = []
+    for ext_id in new_transformations_ext_ids:
+        if ext_id in requested_notifications_dict:
+            to_create += requested_notifications_dict[ext_id]
+
+    for ext_id in existing_transformations_ext_ids:
+        existing_notif = existing_notifications_dict.get(ext_id, [])
+        requested_notif = requested_notifications_dict.get(ext_id, [])
+        existing_destinations = [e.destination for e in existing_notif]
+        requested_destinations = [e.destination for e in requested_notif]
+
+        to_delete.update(
+            {e.id: (ext_id, e.destination) for e in existing_notif if e.destination not in requested_destinations}
+        )
+        to_create += [e for e in requested_notif if e.destination not in existing_destinations]
+    return to_delete, to_create
+
+
 def upsert_notifications(
     client: CogniteClient,
     existing_notifications_dict: Dict[str, List[TransformationNotification]],
     requested_notifications_dict: Dict[str, List[TransformationNotification]],
     existing_transformations_ext_ids: List[str],
     new_transformations_ext_ids: List[str],
+    max_workers: int = 1,
 ) -> Tuple[TupleResult, TupleResult, TupleResult]:
     try:
-        to_delete = dict()
-        to_create = []
-        for ext_id in new_transformations_ext_ids:
-            if ext_id in requested_notifications_dict:
-                to_create += requested_notifications_dict[ext_id]
-
-        for ext_id in existing_transformations_ext_ids:
-            existing_notif = existing_notifications_dict.get(ext_id, [])
-            requested_notif = requested_notifications_dict.get(ext_id, [])
-            existing_destinations = [e.destination for e in existing_notif]
-            requested_destinations = [e.destination for e in requested_notif]
-
-            to_delete.update(
-                {e.id: (ext_id, e.destination) for e in existing_notif if e.destination not in requested_destinations}
-            )
-            to_create += [e for e in requested_notif if e.destination not in existing_destinations]
+        to_delete, to_create = plan_notifications(
+            existing_notifications_dict,
+            requested_notifications_dict,
+            existing_transformations_ext_ids,
+            new_transformations_ext_ids,
+        )
         to_delete_external_ids = list(to_delete.keys())
 
-        for d in chunk_items(to_delete_external_ids):
-            client.transformations.notifications.delete(d)
-        for c in chunk_items(to_create):
-            client.transformations.notifications.create(c)
+        notifications = client.transformations.notifications
+        AdaptiveBatcher.for_api(notifications, "delete").run(notifications.delete, to_delete_external_ids, max_workers)
+        AdaptiveBatcher.for_api(notifications, "create").run(notifications.create, to_create, max_workers)
         return (
             [to_delete[key] for key in to_delete],
             [],
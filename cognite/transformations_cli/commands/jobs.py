@@ -1,7 +1,8 @@
 from typing import Dict, List, Optional
 
 import click
-from cognite.client.data_classes import TransformationJob
+from cognite.client import CogniteClient
+from cognite.client.data_classes import TransformationJob, TransformationJobList
 from cognite.client.exceptions import CogniteAPIError, CogniteNotFoundError
 
 from cognite.transformations_cli.clients import get_client
@@ -13,6 +14,15 @@ from cognite.transformations_cli.commands.utils import (
 )
 
 
+def list_jobs(
+    client: CogniteClient, id: Optional[int], external_id: Optional[str], limit: int = 10
+) -> TransformationJobList:
+    """
+    The latest jobs of a transformation, or of all transformations when no id is given.
+    """
+    return client.transformations.jobs.list(limit=limit, transformation_id=id, transformation_external_id=external_id)
+
+
 def log_jobs(id_str: Optional[str], items: List[TransformationJob]) -> None:
     if id_str:
         click.echo(f"Resulting jobs for transformation with {id_str}:")
@@ -26,8 +36,8 @@ def log_jobs(id_str: Optional[str], items: List[TransformationJob]) -> None:
 @click.option("-i", "--interactive", is_flag=True, help="Display only 10 jobs at a time, paging through them.")
 @click.pass_obj
 def jobs(obj: Dict, id: Optional[int], external_id: Optional[str], limit: int = 10, interactive: bool = False) -> None:
-    client = get_client(obj)
     is_id_exclusive(id, external_id)
+    client = get_client(obj)
     try:
         id_str = None
         if id:
@@ -41,9 +51,7 @@ def jobs(obj: Dict, id: Optional[int], external_id: Optional[str], limit: int =
         else:
             click.echo("Listing the latest jobs for all transformations:")
 
-        jobs = client.transformations.jobs.list(
-            limit=limit, transformation_id=id, transformation_external_id=external_id
-        )
+        jobs = list_jobs(client, id, external_id, limit)
 
         if jobs:
             if interactive:
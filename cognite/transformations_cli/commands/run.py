@@ -1,13 +1,16 @@
 import sys
 import time
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 import click
+from cognite.client import CogniteClient
+from cognite.client.data_classes import TransformationJob
 from cognite.client.exceptions import CogniteAPIError, CogniteNotFoundError
 
 from cognite.transformations_cli.clients import get_client
 from cognite.transformations_cli.commands.utils import (
     exit_with_cognite_api_error,
+    get_job_metrics,
     is_id_exclusive,
     is_id_provided,
     print_jobs,
@@ -16,6 +19,34 @@ from cognite.transformations_cli.commands.utils import (
 )
 
 
+def run_transformation(
+    client: CogniteClient,
+    id: Optional[int],
+    external_id: Optional[str],
+    watch: bool = False,
+    watch_only: bool = False,
+    time_out: int = (12 * 60 * 60),
+) -> Tuple[Optional[TransformationJob], float]:
+    """
+    Start a job of the transformation, or with watch_only take its latest job, and wait for the job to complete when
+    watching. Returns the job, None if there is no job to watch, and the time spent in seconds.
+    """
+    if not watch_only:
+        duration_start = time.time()
+        started = client.transformations.run(
+            transformation_id=id, transformation_external_id=external_id, wait=watch, timeout=time_out
+        )
+        return started, time.time() - duration_start
+    jobs = client.transformations.jobs.list(transformation_id=id, transformation_external_id=external_id)
+    duration_start = time.time()
+    job = jobs[0].wait(timeout=time_out) if jobs else None
+    return job, time.time() - duration_start
+
+
+def has_timed_out(job: TransformationJob, duration: float, time_out: int) -> bool:
+    return duration > (time_out + 1) and job.status != "Completed"
+
+
 @click.command(help="Start and/or watch transformation jobs")
 @click.option("--id", help="The id of the transformation to run. Either this or --external-id must be specified.")
 @click.option(
@@ -41,31 +72,15 @@ def run(
     watch_only: bool = False,
     time_out: int = (12 * 60 * 60),
 ) -> None:
-    client = get_client(obj)
     is_id_provided(id, external_id)
     is_id_exclusive(id, external_id)
+    client = get_client(obj)
     try:
-        job = None
         # TODO Investigate why id requires type casting as it doesn't in "jobs command"
         id = int(id) if id else None
-        if not watch_only:
-            duration_start = time.time()
-            job = client.transformations.run(
-                transformation_id=id, transformation_external_id=external_id, wait=watch, timeout=time_out
-            )
-            duration_end = time.time()
-        else:
-            jobs = client.transformations.jobs.list(transformation_id=id, transformation_external_id=external_id)
-
-            duration_start = time.time()
-            job = jobs[0].wait(timeout=time_out) if jobs else None
-            duration_end = time.time()
+        job, duration = run_transformation(client, id, external_id, watch, watch_only, time_out)
         if job:
-            metrics = [
-                m
-                for m in client.transformations.jobs.list_metrics(id=job.id)
-                if m.name != "requestsWithoutRetries" and m.name != "requests"
-            ]
+            metrics = get_job_metrics(client, job.id)
             click.echo("Job details:")
             click.echo(print_jobs([job]))
             click.echo("SQL Query:")
@@ -79,7 +94,7 @@ def run(
                 if job.status == "Failed":
                     # Error already been printed so just exit.
                     sys.exit(1)
-                if duration_end - duration_start > (time_out + 1) and job.status != "Completed":
+                if has_timed_out(job, duration, time_out):
                     click.echo(f"Transformation job runtime exceeds the provided timeout: {time_out} seconds")
                     sys.exit(1)
     # Handle AttributeError because SDK fails here:
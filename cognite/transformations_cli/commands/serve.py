@@ -0,0 +1,207 @@
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import traceback
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import click
+
+from cognite.transformations_cli.serve_client import SERVE_SOCKET_ENV
+
+# Commands run by the server, the others run in the forwarding process
+SERVED_COMMANDS = ("deploy", "jobs", "list", "query", "run", "show")
+
+
+class ForwardedStream(io.TextIOBase):
+    """
+    Text stream sending what is written to it to the forwarding process, as its stdout or stderr.
+    """
+
+    encoding = "utf-8"
+    errors = "strict"
+
+    def __init__(self, send: Callable[[Dict[str, Any]], None], name: str, isatty: bool):
+        self._send = send
+        self._name = name
+        self._isatty = isatty
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if not isinstance(text, str):
+            # As text streams do, click tells text and binary streams apart this way
+            raise TypeError(f"write() argument must be str, not {type(text).__name__}")
+        if text:
+            self._send({self._name: text})
+        return len(text)
+
+    def isatty(self) -> bool:
+        return self._isatty
+
+
+def fallback_reason(args: List[str]) -> Optional[str]:
+    """
+    Why the command should run in the forwarding process instead, None when the server runs it.
+    """
+    from cognite.transformations_cli.commands.base import transformations_cli
+
+    # With the settings of the group, click keeps the help option of a command once it was built for a context
+    context = click.Context(transformations_cli, resilient_parsing=True, **transformations_cli.context_settings)
+    try:
+        _, command_args, _ = transformations_cli.make_parser(context).parse_args(list(args))
+    except click.ClickException:
+        # Usage errors are reported by the server as they would be by the command
+        return None
+    if not command_args:
+        return None
+    name = command_args[0]
+    command = transformations_cli.get_command(context, name)
+    if command is None:
+        return None
+    if name not in SERVED_COMMANDS:
+        return f"{name} is not served"
+    if command.make_context(name, command_args[1:], parent=context, resilient_parsing=True).params.get("interactive"):
+        return "interactive commands read from the terminal"
+    return None
+
+
+@contextmanager
+def request_environment(request: Dict[str, Any], send: Callable[[Dict[str, Any]], None]) -> Iterator[None]:
+    """
+    Run the context with the working directory, environment and output streams of the forwarding process.
+    """
+    cwd = os.getcwd()
+    environ = dict(os.environ)
+    streams = sys.stdout, sys.stderr
+    try:
+        os.chdir(request["cwd"])
+        os.environ.clear()
+        os.environ.update(request["env"])
+        sys.stdout = ForwardedStream(send, "stdout", request.get("stdoutIsatty", False))
+        sys.stderr = ForwardedStream(send, "stderr", request.get("stderrIsatty", False))
+        yield
+    finally:
+        sys.stdout, sys.stderr = streams
+        os.environ.clear()
+        os.environ.update(environ)
+        os.chdir(cwd)
+
+
+def run_command(args: List[str], prog_name: str) -> int:
+    """
+    Run a command as the transformations-cli entry point would, returning its exit code.
+    """
+    from cognite.transformations_cli.commands.base import transformations_cli
+
+    try:
+        transformations_cli.main(args, prog_name=prog_name)
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        # Printed by the interpreter when the process exits with a message
+        sys.stderr.write(f"{e.code}\n")
+        return 1
+    except Exception:
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+class CommandHandler(socketserver.StreamRequestHandler):
+    server: "CommandServer"
+
+    def handle(self) -> None:
+        lock = threading.Lock()
+
+        def send(frame: Dict[str, Any]) -> None:
+            with lock:
+                self.wfile.write(json.dumps(frame).encode("utf-8") + b"\n")
+                self.wfile.flush()
+
+        request = json.loads(self.rfile.readline())
+        reason = fallback_reason(request["args"])
+        if reason is not None:
+            send({"fallback": reason})
+            return
+        # Commands share the environment, working directory and streams of the process, they run one at a time
+        if not self.server.command_lock.acquire(blocking=False):
+            send({"fallback": "the server is busy"})
+            return
+        try:
+            with request_environment(request, send):
+                exit_code = run_command(request["args"], request.get("progName", "transformations-cli"))
+        finally:
+            self.server.command_lock.release()
+        send({"exitCode": exit_code})
+
+
+class CommandServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Server running the commands forwarded over a Unix socket in this process, so that they share its imports,
+    clients and tokens.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str):
+        self.command_lock = threading.Lock()
+        # Only the owner may run commands in the server
+        umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, CommandHandler)
+        finally:
+            os.umask(umask)
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.server_address):  # type: ignore
+            os.remove(self.server_address)  # type: ignore
+
+
+def remove_stale_socket(socket_path: str) -> None:
+    if not os.path.exists(socket_path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except OSError:
+        os.remove(socket_path)
+        return
+    finally:
+        probe.close()
+    sys.exit(f"A transformations-cli server is already listening on {socket_path}.")
+
+
+@click.command(help="Serve commands forwarded over a Unix socket from a resident process keeping its clients warm")
+@click.option(
+    "--socket",
+    "socket_path",
+    required=True,
+    envvar=SERVE_SOCKET_ENV,
+    help=f"Path of the Unix socket to listen on. Commands are forwarded to it when the '{SERVE_SOCKET_ENV}' "
+    "environment variable is set to the same path.",
+)
+def serve(socket_path: str) -> None:
+    if not hasattr(socket, "AF_UNIX"):
+        sys.exit("serve requires Unix domain sockets, which are not available on this platform.")
+    remove_stale_socket(socket_path)
+    server = CommandServer(socket_path)
+
+    def stop(signum: int, frame: Any) -> None:
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    click.echo(f"Serving {', '.join(SERVED_COMMANDS)} on {socket_path}", err=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -1,12 +1,20 @@
 import sys
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
 import click
+from cognite.client import CogniteClient
+from cognite.client.data_classes import (
+    Transformation,
+    TransformationJob,
+    TransformationJobMetric,
+    TransformationNotificationList,
+)
 from cognite.client.exceptions import CogniteAPIError, CogniteNotFoundError
 
 from cognite.transformations_cli.clients import get_client
 from cognite.transformations_cli.commands.utils import (
     exit_with_cognite_api_error,
+    get_job_metrics,
     get_transformation,
     is_id_exclusive,
     print_jobs,
@@ -17,6 +25,23 @@ from cognite.transformations_cli.commands.utils import (
 )
 
 
+def show_transformation(
+    client: CogniteClient, id: Optional[int], external_id: Optional[str]
+) -> Tuple[Transformation, TransformationNotificationList]:
+    tr = get_transformation(client=client, id=id, external_id=external_id)
+    notifications = client.transformations.notifications.list(
+        transformation_id=id, transformation_external_id=external_id, limit=-1
+    )
+    return tr, notifications
+
+
+def show_job(client: CogniteClient, job_id: int) -> Tuple[TransformationJob, List[TransformationJobMetric]]:
+    job = client.transformations.jobs.retrieve(id=job_id)
+    if job is None:
+        sys.exit(f"Cognite API error has occurred: Job with id {job_id} not found.")
+    return job, get_job_metrics(client, job_id)
+
+
 @click.command(help="Show details of a transformation")
 @click.option("--id", help="The id of the transformation to show. Either this or --external-id can be specified.")
 @click.option(
@@ -25,23 +50,18 @@ from cognite.transformations_cli.commands.utils import (
 @click.option("--job-id", help="The id of the job to show. Include this to show job details.")
 @click.pass_obj
 def show(obj: Dict, id: Optional[int], external_id: Optional[str], job_id: Optional[int]) -> None:
-    client = get_client(obj)
     is_id_exclusive(id, external_id)
     if not (id or external_id or job_id):
         click.echo("Please provide id, external_id or job_id")
         sys.exit(1)
+    client = get_client(obj)
     try:
-        tr = None
-        job = None
         if id or external_id:
             # TODO Investigate why id requires type casting as it doesn't in "jobs command"
             id = int(id) if id else None
-            tr = get_transformation(client=client, id=id, external_id=external_id)
+            tr, notifications = show_transformation(client, id, external_id)
             click.echo("Transformation details:")
             click.echo(print_transformations([tr]))
-            notifications = client.transformations.notifications.list(
-                transformation_id=id, transformation_external_id=external_id, limit=-1
-            )
             if tr.query:
                 click.echo("SQL Query:")
                 click.echo(print_sql(tr.query))
@@ -50,13 +70,7 @@ def show(obj: Dict, id: Optional[int], external_id: Optional[str], job_id: Optio
                 click.echo(print_notifications(notifications))
         if job_id:
             click.echo()
-            job_id = int(job_id)
-            job = client.transformations.jobs.retrieve(id=int(job_id))
-            metrics = [
-                m
-                for m in client.transformations.jobs.list_metrics(id=job_id)
-                if m.name != "requestsWithoutRetries" and m.name != "requests"
-            ]
+            job, metrics = show_job(client, int(job_id))
             click.echo("Job details:")
             click.echo(print_jobs([job]))
             click.echo("SQL Query:")
@@ -1,7 +1,11 @@
+import contextvars
 import datetime
 import sys
 import textwrap
-from typing import Callable, Iterator, List, Optional, TypeVar
+import threading
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, List, Optional, TypeVar
 
 import click
 import sqlparse
@@ -44,6 +48,14 @@ def is_id_provided(id: Optional[int], external_id: Optional[str], should_exit: b
     return True
 
 
+def get_job_metrics(client: CogniteClient, job_id: int) -> List[TransformationJobMetric]:
+    return [
+        m
+        for m in client.transformations.jobs.list_metrics(id=job_id)
+        if m.name != "requestsWithoutRetries" and m.name != "requests"
+    ]
+
+
 def exit_with_cognite_api_error(e: Exception) -> None:
     sys.exit(f"Cognite API error has occurred: {e}")
     return None  # To suppress mypy error
@@ -157,6 +169,43 @@ def print_jobs(jobs: List[TransformationJob]) -> str:
 
 
 T = TypeVar("T")
+R = TypeVar("R")
+
+# Slots for the API requests sent concurrently by the running deploy, shared by all the threads it starts
+_request_slots: contextvars.ContextVar[Optional[threading.BoundedSemaphore]] = contextvars.ContextVar(
+    "request_slots", default=None
+)
+_holding_slot = threading.local()
+
+
+@contextmanager
+def limit_requests(max_requests: int) -> Iterator[None]:
+    """
+    Allow at most max_requests requests in flight at a time in the context, across all the threads started in it.
+    """
+    token = _request_slots.set(threading.BoundedSemaphore(max_requests))
+    try:
+        yield
+    finally:
+        _request_slots.reset(token)
+
+
+@contextmanager
+def request_slot() -> Iterator[None]:
+    """
+    Hold one of the request slots of the context, if requests are limited, while sending a request. A thread already
+    holding a slot keeps it, so that its requests never wait for themselves.
+    """
+    slots = _request_slots.get()
+    if slots is None or getattr(_holding_slot, "held", False):
+        yield
+        return
+    with slots:
+        _holding_slot.held = True
+        try:
+            yield
+        finally:
+            _holding_slot.held = False
 
 
 def chunk_items(items: List[T], n: int = 5) -> Iterator[List[T]]:
@@ -164,6 +213,29 @@ def chunk_items(items: List[T], n: int = 5) -> Iterator[List[T]]:
         yield items[i : i + n]
 
 
+def run_concurrently(action: Callable[[T], R], items: Iterable[T], max_workers: int = 1) -> List[R]:
+    """
+    Apply action to every item using a bounded thread pool.
+
+    Results are returned in the order of the input items. When an action fails, pending items are cancelled and the
+    error of the first failed item (in input order) is raised once the running actions have finished. Actions run in
+    a copy of the context of the caller.
+    """
+    items = list(items)
+    if max_workers <= 1 or len(items) <= 1:
+        return [action(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, action, item) for item in items]
+        _, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+        for future in not_done:
+            future.cancel()
+    for future in futures:
+        if not future.cancelled() and future.exception() is not None:
+            raise future.exception()  # type: ignore
+    return [future.result() for future in futures]
+
+
 def paginate(items: List[T], action: Callable[[List[T]], None]) -> None:
     for chunk in chunk_items(items):
         click.clear()
@@ -0,0 +1,280 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from cognite.client._http_client import HTTPClient
+
+
+@dataclass
+class RecordedRequest:
+    """
+    An API request sent by a Cognite client, with each of its attempts as (start, end, status). Times are in seconds
+    from time.perf_counter.
+    """
+
+    method: str
+    url: str
+    start: float
+    end: float = 0.0
+    status: Optional[int] = None
+    items: int = 0
+    request_bytes: int = 0
+    response_bytes: int = 0
+    error: Optional[str] = None
+    attempts: List[Tuple[float, float, Optional[int]]] = field(default_factory=list)
+    thread_id: int = 0
+    thread_name: str = ""
+
+    @property
+    def seconds(self) -> float:
+        return self.end - self.start
+
+    @property
+    def retries(self) -> int:
+        return max(0, len(self.attempts) - 1)
+
+
+def count_items(kwargs: Dict[str, Any], response: Any) -> int:
+    """
+    The number of items sent by the request, or else received in its response.
+    """
+    payload = kwargs.get("json")
+    if isinstance(payload, dict) and isinstance(payload.get("items"), list):
+        return len(payload["items"])
+    try:
+        content = response.json() if response is not None else None
+    except ValueError:
+        return 0
+    if isinstance(content, dict) and isinstance(content.get("items"), list):
+        return len(content["items"])
+    return 0
+
+
+def _request_bytes(kwargs: Dict[str, Any]) -> int:
+    # The SDK serializes, and may compress, the payload before sending it
+    data = kwargs.get("data")
+    if isinstance(data, str):
+        return len(data.encode("utf-8"))
+    return len(data) if isinstance(data, (bytes, bytearray)) else 0
+
+
+def _response_bytes(kwargs: Dict[str, Any], response: Any) -> int:
+    if response is None:
+        return 0
+    length = getattr(response, "headers", {}).get("Content-Length")
+    if length is not None and str(length).isdigit():
+        return int(length)
+    # Reading a streamed response here would consume it before the caller does
+    if kwargs.get("stream"):
+        return 0
+    content = getattr(response, "content", None)
+    return len(content) if isinstance(content, (bytes, bytearray)) else 0
+
+
+_listeners: List[Callable[[RecordedRequest], None]] = []
+_listeners_lock = threading.Lock()
+_original_methods: Optional[Tuple[Callable, Callable]] = None
+_current = threading.local()
+
+
+def _notify(request: RecordedRequest) -> None:
+    with _listeners_lock:
+        listeners = list(_listeners)
+    for listener in listeners:
+        listener(request)
+
+
+def _install() -> None:
+    global _original_methods
+    request, do_request = HTTPClient.request, HTTPClient._do_request
+    _original_methods = request, do_request
+
+    def recorded_request(http_client: HTTPClient, method: str, url: str, **kwargs: Any) -> Any:
+        thread = threading.current_thread()
+        recorded = RecordedRequest(
+            method, url, time.perf_counter(), thread_id=threading.get_ident(), thread_name=thread.name
+        )
+        _current.request = recorded
+        response = None
+        try:
+            response = request(http_client, method, url, **kwargs)
+            return response
+        except Exception as e:
+            recorded.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current.request = None
+            recorded.end = time.perf_counter()
+            recorded.status = getattr(response, "status_code", None)
+            recorded.items = count_items(kwargs, response)
+            recorded.request_bytes = _request_bytes(kwargs)
+            recorded.response_bytes = _response_bytes(kwargs, response)
+            _notify(recorded)
+
+    def recorded_do_request(http_client: HTTPClient, method: str, url: str, **kwargs: Any) -> Any:
+        recorded = getattr(_current, "request", None)
+        start = time.perf_counter()
+        response = None
+        try:
+            response = do_request(http_client, method, url, **kwargs)
+            return response
+        finally:
+            if recorded is not None:
+                recorded.attempts.append((start, time.perf_counter(), getattr(response, "status_code", None)))
+
+    HTTPClient.request = recorded_request  # type: ignore
+    HTTPClient._do_request = recorded_do_request  # type: ignore
+
+
+def _uninstall() -> None:
+    global _original_methods
+    if _original_methods is not None:
+        HTTPClient.request, HTTPClient._do_request = _original_methods  # type: ignore
+        _original_methods = None
+
+
+@contextmanager
+def recording_requests(listener: Callable[[RecordedRequest], None]) -> Iterator[None]:
+    """
+    Call the listener with each request sent by every Cognite client, from all threads, while the context is active.
+    Contexts may overlap, e.g. a deploy report recorded while the whole command is traced.
+    """
+    with _listeners_lock:
+        if not _listeners:
+            _install()
+        _listeners.append(listener)
+    try:
+        yield
+    finally:
+        with _listeners_lock:
+            _listeners.remove(listener)
+            if not _listeners:
+                _uninstall()
+
+
+def _endpoint(url: str) -> str:
+    # The path in the project, e.g. /transformations/jobs/123, the same for every cluster and project
+    path = urlparse(url).path
+    segments = path.split("/")
+    if "projects" in segments:
+        return "/" + "/".join(segments[segments.index("projects") + 2 :])
+    if "v1" in segments:
+        return "/" + "/".join(segments[segments.index("v1") + 1 :])
+    return path or "/"
+
+
+class RequestTrace:
+    """
+    The API requests sent while tracing, in the Chrome Trace Event format read by chrome://tracing, Perfetto and
+    speedscope. Each request is a complete event on the track of the thread that sent it, with one nested event per
+    attempt when it was retried.
+    """
+
+    def __init__(self, command: Optional[str] = None) -> None:
+        self.command = command
+        self.requests: List[RecordedRequest] = []
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def record(self, request: RecordedRequest) -> None:
+        with self._lock:
+            self.requests.append(request)
+
+    def _microseconds(self, seconds: float) -> float:
+        return round((seconds - self._start) * 1e6, 1)
+
+    def to_events(self) -> List[Dict[str, Any]]:
+        pid = os.getpid()
+        with self._lock:
+            requests = sorted(self.requests, key=lambda r: r.start)
+        events: List[Dict[str, Any]] = [
+            {"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "transformations-cli"}}
+        ]
+        threads: Dict[int, int] = dict()
+        for request in requests:
+            if request.thread_id not in threads:
+                threads[request.thread_id] = len(threads) + 1
+                events.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": pid,
+                        "tid": threads[request.thread_id],
+                        "args": {"name": request.thread_name},
+                    }
+                )
+            tid = threads[request.thread_id]
+            endpoint = _endpoint(request.url)
+            args: Dict[str, Any] = {
+                "method": request.method,
+                "endpoint": endpoint,
+                "url": request.url,
+                "status": request.status,
+                "items": request.items,
+                "requestBytes": request.request_bytes,
+                "responseBytes": request.response_bytes,
+                "retries": request.retries,
+            }
+            if request.error:
+                args["error"] = request.error
+            events.append(
+                {
+                    "name": f"{request.method} {endpoint}",
+                    "cat": "http",
+                    "ph": "X",
+                    "ts": self._microseconds(request.start),
+                    "dur": round((request.end - request.start) * 1e6, 1),
+                    "pid": pid,
+                    "tid": tid,
+                    "args": args,
+                }
+            )
+            if request.retries:
+                for number, (start, end, status) in enumerate(request.attempts, start=1):
+                    events.append(
+                        {
+                            "name": f"attempt {number}",
+                            "cat": "http.attempt",
+                            "ph": "X",
+                            "ts": self._microseconds(start),
+                            "dur": round((end - start) * 1e6, 1),
+                            "pid": pid,
+                            "tid": tid,
+                            "args": {"status": status},
+                        }
+                    )
+        return events
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "traceEvents": self.to_events(),
+                "displayTimeUnit": "ms",
+                "otherData": {"command": self.command, "requests": len(self.requests)},
+            }
+        )
+
+    def save(self, path: str) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.to_json())
+        os.replace(tmp_path, path)
+
+
+@contextmanager
+def request_tracing(path: str, command: Optional[str] = None) -> Iterator[RequestTrace]:
+    """
+    Trace the requests sent in the context, and write the trace to the file when it exits, also when the command
+    fails.
+    """
+    trace = RequestTrace(command)
+    try:
+        with recording_requests(trace.record):
+            yield trace
+    finally:
+        trace.save(path)
@@ -0,0 +1,76 @@
+import json
+import os
+import shutil
+import socket
+import sys
+from typing import Any, Dict, List, Optional
+
+# Environment variable with the socket of a running `serve` process, commands are forwarded to it when it is set
+SERVE_SOCKET_ENV = "TRANSFORMATIONS_SERVE_SOCKET"
+
+
+def program_name() -> str:
+    """
+    The name click shows in usage messages for this process, e.g. transformations-cli or python -m
+    cognite.transformations_cli.
+    """
+    package = getattr(sys.modules["__main__"], "__package__", None)
+    if not package:
+        return os.path.basename(sys.argv[0])
+    name = os.path.splitext(os.path.basename(sys.argv[0]))[0]
+    module = package if name == "__main__" else f"{package}.{name}"
+    return f"python -m {module}"
+
+
+def command_request(args: List[str], prog_name: str) -> Dict[str, Any]:
+    """
+    The request running a command in the `serve` process as it would run in this one.
+    """
+    environ = dict(os.environ)
+    # Help texts are wrapped to the width of the terminal of this process, not the one of the server
+    columns, lines = shutil.get_terminal_size()
+    environ.setdefault("COLUMNS", str(columns))
+    environ.setdefault("LINES", str(lines))
+    return {
+        "args": args,
+        "progName": prog_name,
+        "cwd": os.getcwd(),
+        "env": environ,
+        "stdoutIsatty": sys.stdout.isatty(),
+        "stderrIsatty": sys.stderr.isatty(),
+    }
+
+
+def forward_command(socket_path: str, args: List[str], prog_name: Optional[str] = None) -> Optional[int]:
+    """
+    Run a command in the `serve` process listening on the socket, writing its output to stdout and stderr. Returns
+    the exit code of the command, or None when the command should run in this process instead: no server listens on
+    the socket, the server is busy or does not serve the command.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    stdout, stderr = sys.stdout, sys.stderr
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(socket_path)
+    except OSError:
+        connection.close()
+        return None
+    with connection, connection.makefile("rb") as responses:
+        request = command_request(args, prog_name or program_name())
+        connection.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        for line in responses:
+            frame = json.loads(line)
+            if "stdout" in frame:
+                stdout.write(frame["stdout"])
+                stdout.flush()
+            elif "stderr" in frame:
+                stderr.write(frame["stderr"])
+                stderr.flush()
+            elif "exitCode" in frame:
+                return int(frame["exitCode"])
+            elif "fallback" in frame:
+                return None
+    # The command may have had effects already, running it again here could repeat them
+    stderr.write(f"The transformations-cli server on {socket_path} stopped before the command completed.\n")
+    return 1
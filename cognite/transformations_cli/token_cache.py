@@ -0,0 +1,101 @@
+import json
+import os
+import tempfile
+import time
+from hashlib import sha256
+from typing import Any, Dict, List, Optional, Tuple
+
+from cognite.client.credentials import OAuthClientCredentials
+
+# Cached tokens are only reused while they stay valid for this long, so that a command never starts with a token
+# about to expire
+TOKEN_CACHE_MIN_TTL_SECONDS = 60
+
+
+def token_cache_key(
+    token_url: str, client_id: str, client_secret: str, scopes: Optional[List[str]], audience: Optional[str]
+) -> str:
+    """
+    Identify the tokens of a client. The secret is part of the key, so that tokens are only reused by callers knowing
+    it, and the key is a hash, so that the secret is never written to the cache file.
+    """
+    return sha256(json.dumps([token_url, client_id, client_secret, scopes, audience]).encode("utf-8")).hexdigest()
+
+
+class TokenCache:
+    """
+    Access tokens shared by consecutive CLI invocations, stored in a file only readable by its owner.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path) as f:
+                if os.name == "posix" and os.fstat(f.fileno()).st_mode & 0o077:
+                    # Tokens readable by other users are not trusted, the file is replaced on the next save
+                    return dict()
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return dict()
+        return entries if isinstance(entries, dict) else dict()
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        entry = self._read().get(key)
+        try:
+            token, expires_at = entry["accessToken"], float(entry["expiresAt"])  # type: ignore
+        except (TypeError, KeyError, ValueError):
+            return None
+        if expires_at - time.time() < TOKEN_CACHE_MIN_TTL_SECONDS:
+            return None
+        return token, expires_at
+
+    def put(self, key: str, token: str, expires_at: float) -> None:
+        now = time.time()
+        entries = {k: v for k, v in self._read().items() if isinstance(v, dict) and v.get("expiresAt", 0) > now}
+        entries[key] = {"accessToken": token, "expiresAt": expires_at}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        tmp_path = None
+        try:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            # A unique temporary file per writer, concurrent invocations may save at the same time
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tokens-")
+            os.chmod(tmp_path, 0o600)
+            with open(fd, "w") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # The cache is an optimisation, a token that cannot be cached is still used
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+class CachedOAuthClientCredentials(OAuthClientCredentials):
+    """
+    OAuthClientCredentials reusing the tokens fetched by earlier CLI invocations from a token cache file, and adding
+    the tokens it fetches to it.
+    """
+
+    def __init__(
+        self,
+        cache_path: str,
+        token_url: str,
+        client_id: str,
+        client_secret: str,
+        scopes: List[str],
+        **token_custom_args: Any,
+    ):
+        super().__init__(token_url, client_id, client_secret, scopes, **token_custom_args)
+        self.token_cache = TokenCache(cache_path)
+        self.token_cache_key = token_cache_key(
+            token_url, client_id, client_secret, scopes, token_custom_args.get("audience")
+        )
+
+    def _refresh_access_token(self) -> Tuple[str, float]:
+        cached = self.token_cache.get(self.token_cache_key)
+        if cached is not None:
+            return cached
+        token, expires_at = super()._refresh_access_token()
+        self.token_cache.put(self.token_cache_key, token, expires_at)
+        return token, expires_at
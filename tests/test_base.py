@@ -0,0 +1,40 @@
+import json
+import subprocess
+import sys
+from typing import List
+
+import pytest
+from click import Context
+from click.testing import CliRunner
+
+from cognite.transformations_cli.commands.base import SUBCOMMANDS, transformations_cli
+
+# Dependencies of the subcommands, which the CLI should not import before a subcommand is invoked
+HEAVY_MODULES = ["cognite.client", "sqlparse", "tabulate", "dacite", "yaml", "regex"]
+
+IMPORTED_MODULES = """
+import json, sys
+from cognite.transformations_cli.commands.base import transformations_cli
+try:
+    transformations_cli(sys.argv[1:], prog_name="transformations-cli")
+except SystemExit:
+    pass
+print(json.dumps(sorted(sys.modules)), file=sys.stderr)
+"""
+
+
+@pytest.mark.parametrize("args", [["--version"], ["--help"], ["no-such-command"]])
+def test_startup_does_not_import_subcommands(args: List[str]) -> None:
+    result = subprocess.run([sys.executable, "-c", IMPORTED_MODULES, *args], capture_output=True, text=True, check=True)
+    modules = json.loads(result.stderr.splitlines()[-1])
+    assert [name for name in HEAVY_MODULES if name in modules] == []
+
+
+def test_subcommands_are_loaded_when_invoked() -> None:
+    result = CliRunner().invoke(transformations_cli, ["--help"])
+    assert all(name in result.output for name in SUBCOMMANDS)
+
+    context = Context(transformations_cli)
+    for name, (_, short_help) in SUBCOMMANDS.items():
+        command = transformations_cli.get_command(context, name)
+        assert command is not None and command.help == short_help
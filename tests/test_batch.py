@@ -0,0 +1,109 @@
+import json
+import threading
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+import click
+import pytest
+from click.testing import CliRunner
+from cognite.client.data_classes import TransformationJob, TransformationJobList
+from cognite.client.exceptions import CogniteNotFoundError
+
+from cognite.transformations_cli.commands import batch as batch_module
+from cognite.transformations_cli.commands.base import transformations_cli
+
+OBJ_ARGS = ["--cluster", "westeurope-1", "--cdf-project-name", "project"]
+
+
+def test_operations_are_read_from_yaml_and_ndjson(tmp_path: Path) -> None:
+    operations_file = tmp_path / "ops.yaml"
+    operations_file.write_text(
+        "operations:\n  - command: run\n    externalId: a\n    watch: true\n  - command: show\n    jobId: 3\n"
+    )
+    with open(operations_file) as f:
+        operations = batch_module.read_operations(f)
+    assert [(op.command, op.external_id, op.watch, op.job_id) for op in operations] == [
+        ("run", "a", True, None),
+        ("show", None, False, 3),
+    ]
+
+    result = CliRunner().invoke(
+        transformations_cli, ["batch"], input='{"command": "run", "id": 1}\n\n{"command": "list"}\n{"id": 2}\n'
+    )
+    assert result.exit_code == 1
+    assert str(result.exception).splitlines() == [
+        "Invalid operations:",
+        "line 3: unknown command list, use one of delete, jobs, run, show",
+        'line 4: Invalid config: Missing mandatory field "command"',
+    ]
+
+
+def test_results_stream_as_operations_complete(monkeypatch: pytest.MonkeyPatch) -> None:
+    reported = threading.Event()
+    deleted: List[Tuple[Optional[int], Optional[str], bool]] = []
+
+    def run_transformation(client: Any, id: int, external_id: str, watch: bool, *args: Any) -> Any:
+        if external_id == "slow":
+            # Only completes once another operation has been reported
+            assert reported.wait(5)
+            return TransformationJob(id=10, status="Failed", error="boom"), 1.0
+        raise CogniteNotFoundError([{"externalId": external_id}])
+
+    def delete_transformation(client: Any, id: Optional[int], external_id: Optional[str], schedule: bool) -> None:
+        deleted.append((id, external_id, schedule))
+
+    echo = click.echo
+
+    def report(message: str) -> None:
+        echo(message)
+        reported.set()
+
+    monkeypatch.setattr(batch_module, "get_client", lambda obj: None)
+    monkeypatch.setattr(batch_module, "run_transformation", run_transformation)
+    monkeypatch.setattr(batch_module, "get_job_metrics", lambda client, job_id: [])
+    monkeypatch.setattr(batch_module, "delete_transformation", delete_transformation)
+    monkeypatch.setattr(batch_module.click, "echo", report)
+
+    operations = [
+        {"command": "run", "externalId": "slow", "watch": True},
+        {"command": "delete", "id": 5, "deleteSchedule": True},
+        {"command": "run", "externalId": "missing"},
+        {"command": "delete"},
+    ]
+    result = CliRunner().invoke(
+        transformations_cli,
+        [*OBJ_ARGS, "batch", "--max-workers", "4"],
+        input="\n".join(json.dumps(op) for op in operations),
+    )
+
+    # Depending on the click version, the output also has the exit message
+    results = [json.loads(line) for line in result.output.splitlines() if line.startswith("{")]
+    assert result.exit_code == 1
+    assert str(result.exception) == "3 of 4 operations failed."
+    order = [r["index"] for r in results]
+    assert sorted(order) == [0, 1, 2, 3] and order[0] != 0
+    by_index = {r["index"]: r for r in results}
+    assert by_index[0]["error"] == "Job Failed, error details: boom"
+    assert by_index[1] == {"index": 1, "command": "delete", "succeeded": True, "deleted": {"id": 5}}
+    assert by_index[2]["error"].startswith("Cognite API error has occurred:")
+    assert by_index[3]["error"] == "Please provide one of id and external id."
+    assert deleted == [(5, None, True)]
+
+
+def test_jobs_are_listed_as_the_jobs_command_lists_them(monkeypatch: pytest.MonkeyPatch) -> None:
+    listed: List[Tuple[Optional[int], Optional[str], int]] = []
+
+    def list_jobs(client: Any, id: Optional[int], external_id: Optional[str], limit: int) -> TransformationJobList:
+        listed.append((id, external_id, limit))
+        return TransformationJobList([TransformationJob(id=1, status="Completed")])
+
+    monkeypatch.setattr(batch_module, "get_client", lambda obj: None)
+    monkeypatch.setattr(batch_module, "list_jobs", list_jobs)
+    result = CliRunner().invoke(
+        transformations_cli, [*OBJ_ARGS, "batch"], input='{"command": "jobs", "externalId": "a", "limit": 5}\n'
+    )
+    assert result.exit_code == 0
+    output = json.loads(result.output)
+    assert (output["index"], output["command"], output["succeeded"]) == (0, "jobs", True)
+    assert [(job["id"], job["status"]) for job in output["jobs"]] == [(1, "Completed")]
+    assert listed == [(None, "a", 5)]
@@ -0,0 +1,52 @@
+from typing import List
+
+import pytest
+from cognite.client.data_classes import Transformation
+from cognite.client.exceptions import CogniteAPIError
+
+from cognite.transformations_cli.commands.deploy.batching import AdaptiveBatcher, estimate_size
+
+
+def test_batches_respect_item_limit() -> None:
+    batcher: AdaptiveBatcher[int] = AdaptiveBatcher(item_limit=3)
+    assert batcher.batches(list(range(7))) == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+def test_batches_respect_request_size() -> None:
+    transformations = [
+        Transformation(external_id=f"tr{i}", query="select 1" if i % 2 else "x" * 1000) for i in range(6)
+    ]
+    batcher: AdaptiveBatcher[Transformation] = AdaptiveBatcher(item_limit=1000, max_bytes=1400)
+    batches = batcher.batches(transformations)
+    assert [len(b) for b in batches] == [2, 2, 2]
+    assert all(sum(estimate_size(t) for t in b) <= 1400 for b in batches)
+
+    # An item larger than the budget is sent on its own
+    assert AdaptiveBatcher(item_limit=1000, max_bytes=10).batches(transformations[:2]) == [
+        [transformations[0]],
+        [transformations[1]],
+    ]
+
+
+@pytest.mark.parametrize("code", [413, 429])
+def test_run_shrinks_batches(code: int) -> None:
+    sent: List[List[int]] = []
+
+    def action(batch: List[int]) -> int:
+        if len(batch) > 2:
+            raise CogniteAPIError("Too large", code=code)
+        sent.append(batch)
+        return len(batch)
+
+    batcher: AdaptiveBatcher[int] = AdaptiveBatcher(item_limit=8)
+    assert batcher.run(action, list(range(10))) == [2, 2, 2, 2, 2]
+    assert [i for batch in sent for i in batch] == list(range(10))
+    assert batcher.item_limit == 2
+
+
+def test_run_raises_other_errors() -> None:
+    def action(batch: List[int]) -> None:
+        raise CogniteAPIError("Bad request", code=400)
+
+    with pytest.raises(CogniteAPIError, match="Bad request"):
+        AdaptiveBatcher(item_limit=8).run(action, list(range(10)))
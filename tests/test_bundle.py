@@ -0,0 +1,121 @@
+import json
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+from click.testing import CliRunner
+
+from cognite.transformations_cli.commands.compile import compile
+from cognite.transformations_cli.commands.deploy import deploy as deploy_module
+from cognite.transformations_cli.commands.deploy.bundle import compile_bundle, load_bundle
+from cognite.transformations_cli.commands.deploy.deploy import deploy
+from cognite.transformations_cli.commands.deploy.transformation_config import parse_transformation_configs
+
+MANIFEST = """
+externalId: bundled
+name: ${TEST_BUNDLE_NAME}
+query:
+    file: bundled.sql
+authentication:
+    clientId: ${TEST_BUNDLE_CLIENT_ID}
+    clientSecret: ${TEST_BUNDLE_CLIENT_SECRET}
+    tokenUrl: url
+    scopes:
+        - scope
+    cdfProjectName: project
+destination:
+    type: nodes
+    view:
+        space: space
+        externalId: view
+        version: 1
+    instanceSpace: instances
+shared: ${TEST_BUNDLE_SHARED}
+tags:
+    - "${TEST_BUNDLE_NAME}"
+"""
+
+LEGACY_MANIFEST = """
+legacy: true
+externalId: legacy
+name: legacy
+query: legacy.sql
+apiKey: TEST_BUNDLE_API_KEY
+destination: assets
+"""
+
+OBJ = {"cluster": "westeurope-1", "cdf_project_name": "test-project"}
+
+
+def set_environment(monkeypatch: pytest.MonkeyPatch, stage: str) -> None:
+    monkeypatch.setenv("TEST_BUNDLE_NAME", f"{stage}-name")
+    monkeypatch.setenv("TEST_BUNDLE_CLIENT_ID", f"{stage}-client")
+    monkeypatch.setenv("TEST_BUNDLE_CLIENT_SECRET", f"{stage}-secret")
+    monkeypatch.setenv("TEST_BUNDLE_SHARED", "false")
+    monkeypatch.setenv("TEST_BUNDLE_API_KEY", f"{stage}-api-key")
+
+
+@pytest.fixture
+def manifests(tmp_path: Path) -> Path:
+    root = tmp_path / "manifests"
+    root.mkdir()
+    (root / "bundled.yaml").write_text(MANIFEST)
+    (root / "bundled.sql").write_text("select 1")
+    (root / "legacy.yaml").write_text(LEGACY_MANIFEST)
+    (root / "legacy.sql").write_text("select 2")
+    return root
+
+
+def test_bundle_keeps_environment_variables_unresolved(manifests: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    set_environment(monkeypatch, "dev")
+    text = json.dumps(compile_bundle(str(manifests)))
+    assert "dev-" not in text
+    assert '{"$env": "${TEST_BUNDLE_CLIENT_SECRET}"}' in text
+    assert "select 1" in text and "select 2" in text
+
+
+def test_bundle_deploys_like_the_manifests(manifests: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    set_environment(monkeypatch, "dev")
+    bundle = compile_bundle(str(manifests))
+    bundle_path = manifests.parent / "bundle.json"
+    bundle_path.write_text(json.dumps(bundle))
+
+    set_environment(monkeypatch, "prod")
+    expected = parse_transformation_configs(str(manifests))
+    shutil.rmtree(manifests)
+    configs = load_bundle(str(bundle_path))
+
+    assert list(configs) == list(expected)
+    for path, config in configs.items():
+        assert config.query == {"bundled": "select 1", "legacy": "select 2"}[config.external_id]
+        config.query = expected[path].query
+        assert config == expected[path]
+        assert config._file_hash == expected[path]._file_hash
+    assert configs[str(manifests / "bundled.yaml")].authentication.client_secret == "prod-secret"
+    assert configs[str(manifests / "bundled.yaml")].tags == ["${TEST_BUNDLE_NAME}"]
+    assert configs[str(manifests / "legacy.yaml")].authentication.read.api_key == "prod-api-key"
+
+
+def test_compile_and_deploy_bundle(manifests: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    deployed: List[Dict[str, Any]] = []
+    monkeypatch.setattr(deploy_module, "get_client", lambda obj, timeout: None)
+    monkeypatch.setattr(
+        deploy_module, "deploy_transformation_configs", lambda _, __, configs, *args: deployed.append(configs)
+    )
+    set_environment(monkeypatch, "dev")
+    bundle_path = str(tmp_path / "bundle.json")
+    runner = CliRunner()
+
+    result = runner.invoke(compile, [str(manifests), "-o", bundle_path])
+    assert result.exit_code == 0, result.output
+    assert "Number of manifests compiled into" in result.output
+
+    result = runner.invoke(deploy, ["--bundle", bundle_path], obj=OBJ)
+    assert result.exit_code == 0, result.output
+    assert sorted(conf.external_id for conf in deployed[0].values()) == ["bundled", "legacy"]
+
+    (manifests / "bundled.sql").unlink()
+    result = runner.invoke(compile, [str(manifests), "-o", bundle_path])
+    assert result.exit_code != 0
+    assert "Please provide a valid path for sql file." in result.output
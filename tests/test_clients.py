@@ -1,5 +1,62 @@
-from cognite.client import CogniteClient
+from typing import Dict, Optional
+
+import pytest
+from click.testing import CliRunner
+from cognite.client import CogniteClient, global_config
+from cognite.client.data_classes import OidcCredentials
+
+from cognite.transformations_cli import clients as clients_module
+from cognite.transformations_cli.clients import client_registry, get_client
+from cognite.transformations_cli.commands.delete import delete
+from cognite.transformations_cli.commands.deploy import deploy as deploy_module
+from cognite.transformations_cli.commands.deploy.transformation_config import TransformationConfigError
+from cognite.transformations_cli.commands.run import run
 
 
 def test_oidc_client(client: CogniteClient) -> None:
     assert len(client.iam.token.inspect().projects) >= 1
+
+
+@pytest.fixture
+def offline_obj() -> Dict[str, Optional[str]]:
+    client_registry.clear()
+    yield {
+        "client_id": "client",
+        "client_secret": "secret",
+        "token_url": "https://idp/token",
+        "scopes": None,
+        "audience": None,
+        "cdf_project_name": "project",
+        "cluster": "westeurope-1",
+    }
+    client_registry.clear()
+
+
+def test_clients_are_shared(offline_obj: Dict[str, Optional[str]], monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(global_config, "max_connection_pool_size", global_config.max_connection_pool_size)
+    client = get_client({**offline_obj, "max_connections": 8}, 90)
+
+    assert get_client(offline_obj, 90) is client
+    assert get_client(offline_obj, 60) is not client
+    assert get_client({**offline_obj, "client_secret": "other"}, 90) is not client
+    assert get_client({**offline_obj, "cdf_project_name": "other"}, 90) is not client
+    assert global_config.max_connection_pool_size == 8
+
+    # Each distinct set of transformation credentials gets one client, whatever the number of checks
+    created = []
+    monkeypatch.setattr(clients_module, "CogniteClient", lambda config: created.append(config))
+    credentials = OidcCredentials("client", "secret", "scope", "https://idp/token", cdf_project_name="project")
+    for _ in range(3):
+        with pytest.raises(TransformationConfigError):
+            deploy_module.verify_oidc_credentials("write", credentials, "westeurope-1")
+    assert len(created) == 1
+
+
+@pytest.mark.parametrize("command", [run, delete])
+def test_invalid_arguments_do_not_create_a_client(
+    command: object, offline_obj: Dict[str, Optional[str]], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(clients_module, "CogniteClient", lambda config: pytest.fail("Client created"))
+    result = CliRunner().invoke(command, [], obj=offline_obj)  # type: ignore
+    assert result.exit_code == 1
+    assert str(result.exception) == "Please provide one of id and external id."
@@ -1,12 +1,16 @@
 import os
 from pathlib import Path
 
+import pytest
+
+from cognite.transformations_cli.commands.deploy import transformation_config
 from cognite.transformations_cli.commands.deploy.transformation_config import parse_transformation_configs
 from cognite.transformations_cli.commands.deploy.transformation_types import (
     ActionType,
     DestinationType,
     ReadWriteAuthentication,
     ScheduleConfig,
+    TransformationConfigError,
 )
 from cognite.transformations_cli.commands.deploy.transformations_api import to_destination
 
@@ -400,6 +404,27 @@ def test_parse_transformation_configs() -> None:
     pass
 
 
+def test_parse_transformation_configs_in_worker_processes(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(transformation_config, "MIN_FILES_PER_PARSE_WORKER", 1)
+    for i in range(8):
+        (tmp_path / f"trans_{i}.yaml").write_text(
+            f"externalId: tr{i}\nname: tr{i}\nquery: select {i}\nauthentication:\n  apiKey: key\ndestination: assets\n"
+        )
+
+    serial = parse_transformation_configs(str(tmp_path))
+    parallel = parse_transformation_configs(str(tmp_path), parse_workers=4)
+    assert list(parallel) == list(serial)
+    assert list(parallel.values()) == list(serial.values())
+    assert [c._file_hash for c in parallel.values()] == [c._file_hash for c in serial.values()]
+
+    (tmp_path / "trans_3.yaml").write_text("externalId: tr3\nname: tr3\n")
+    with pytest.raises(TransformationConfigError) as serial_error:
+        parse_transformation_configs(str(tmp_path))
+    with pytest.raises(TransformationConfigError) as parallel_error:
+        parse_transformation_configs(str(tmp_path), parse_workers=4)
+    assert parallel_error.value.message == serial_error.value.message
+
+
 def test_to_transformation() -> None:
     pass
 
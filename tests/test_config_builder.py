@@ -0,0 +1,191 @@
+import copy
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Tuple
+
+import dacite
+import pytest
+
+from cognite.transformations_cli.commands.deploy import config_builder
+from cognite.transformations_cli.commands.deploy.config_builder import DACITE_CONFIG, build_config
+from cognite.transformations_cli.commands.deploy.load_yaml import InvalidConfigError, load_yaml
+from cognite.transformations_cli.commands.deploy.transformation_types import ScheduleConfig, TransformationConfig
+from cognite.transformations_cli.commands.deploy.transformation_types_legacy import TransformationConfigLegacy
+
+AUTH = {"client_id": "id", "client_secret": "secret", "token_url": "url", "scopes": ["a", "b"], "cdf_project_name": "p"}
+
+CONFIGS: List[Tuple[type, Dict[str, Any]]] = [
+    (
+        TransformationConfig,
+        {
+            "external_id": "raw",
+            "name": "raw",
+            "query": {"file": "query.sql"},
+            "authentication": {"read": {"api_key": "key"}, "write": {"api_key": "key"}},
+            "schedule": {"interval": "* * * * *", "is_paused": True},
+            "destination": {"type": "raw", "database": "db", "table": "table"},
+            "data_set_id": 1,
+            "notifications": ["a@b.c"],
+            "action": "delete",
+            "tags": ["x"],
+        },
+    ),
+    (
+        TransformationConfig,
+        {
+            "external_id": "nodes",
+            "name": "nodes",
+            "query": "select 1",
+            "authentication": AUTH,
+            "schedule": "* * * * *",
+            "destination": {"type": "nodes", "view": {"space": "s", "external_id": "v", "version": 1}},
+            "data_set_external_id": "ds",
+            "shared": False,
+            "ignore_null_fields": False,
+        },
+    ),
+    (
+        TransformationConfig,
+        {
+            "external_id": "edges",
+            "name": "edges",
+            "query": "select 1",
+            "authentication": AUTH,
+            "destination": {
+                "type": "edges",
+                "view": {"space": "s", "external_id": "v", "version": "1"},
+                "instance_space": "i",
+                "edge_type": {"space": "s", "external_id": "e"},
+            },
+        },
+    ),
+    (
+        TransformationConfig,
+        {
+            "external_id": "instances",
+            "name": "instances",
+            "query": "select 1",
+            "authentication": AUTH,
+            "destination": {
+                "type": "instances",
+                "data_model": {"space": "s", "external_id": "m", "version": 2, "destination_type": "t"},
+            },
+        },
+    ),
+    (
+        TransformationConfig,
+        {
+            "external_id": "simple",
+            "name": "simple",
+            "query": "select 1",
+            "authentication": AUTH,
+            "destination": "sequence_rows",
+        },
+    ),
+    (
+        TransformationConfigLegacy,
+        {
+            "legacy": True,
+            "external_id": "legacy",
+            "name": "legacy",
+            "query": "query.sql",
+            "authentication": {"read": AUTH, "write": AUTH},
+            "schedule": "* * * * *",
+            "destination": {"type": "raw", "raw_database": "db", "raw_table": "table"},
+            "notifications": ["a@b.c"],
+            "action": "Delete",
+        },
+    ),
+    (
+        TransformationConfigLegacy,
+        {
+            "external_id": "legacy",
+            "name": "legacy",
+            "query": "query.sql",
+            "api_key": {"read": "r", "write": "w"},
+            "destination": "assets",
+        },
+    ),
+]
+
+WRONG_VALUES = [None, 1, 1.5, True, "text", "nodes", ["text"], [1], {"type": "raw"}, {"unknown": 1}]
+
+
+def variants(data: Any) -> Iterator[Any]:
+    """
+    Yield copies of the data with one key dropped, added or replaced, at every level.
+    """
+    if isinstance(data, dict):
+        yield {**data, "unknown_key": 1}
+        for key, value in data.items():
+            yield {k: v for k, v in data.items() if k != key}
+            for wrong in WRONG_VALUES:
+                yield {**data, key: copy.deepcopy(wrong)}
+            for variant in variants(value):
+                yield {**data, key: variant}
+    elif isinstance(data, list):
+        for i, value in enumerate(data):
+            for variant in variants(value):
+                yield data[:i] + [variant] + data[i + 1 :]
+
+
+def outcome(build: Any) -> Any:
+    try:
+        return build()
+    except Exception as e:
+        # Values built by collections of strings contain the address of a generator
+        message = re.sub(r"0x[0-9a-f]+", "0x", str(e))
+        return type(e), message, getattr(e, "field_path", None)
+
+
+@pytest.mark.parametrize("config_type, data", CONFIGS)
+def test_same_results_as_dacite(config_type: type, data: Dict[str, Any]) -> None:
+    for variant in [data, *variants(data)]:
+        expected = outcome(lambda: dacite.from_dict(config_type, copy.deepcopy(variant), DACITE_CONFIG))
+        actual = outcome(lambda: build_config(config_type, copy.deepcopy(variant)))
+        assert actual == expected, variant
+        if not isinstance(expected, tuple):
+            assert type(actual.destination) is type(expected.destination)
+
+
+@pytest.mark.parametrize(
+    "manifest, message",
+    [
+        ("externalId: a\nname: a\nquery: q\nauthentication: {}\ndestination: assets\nfoo: 1\n", 'parameter "foo"'),
+        ("externalId: a\nname: a\nquery: q\nauthentication:\n  apiKey: 1\ndestination: assets\n", "Wrong type for"),
+        ("externalId: a\nquery: q\nauthentication:\n  apiKey: k\ndestination: assets\n", 'field "name"'),
+    ],
+)
+def test_load_yaml_errors(manifest: str, message: str) -> None:
+    with pytest.raises(InvalidConfigError, match=message):
+        load_yaml(manifest, TransformationConfig, case_style="camel")
+
+
+def test_plans_compiled_concurrently(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config_builder, "_compiler", config_builder._PlanCompiler())
+    monkeypatch.setattr(config_builder, "_plans", dict())
+    compile_dataclass = config_builder._PlanCompiler._compile_dataclass
+    compiling, built = threading.Event(), threading.Event()
+
+    def paused_compile_dataclass(self: Any, data_class: Any) -> Any:
+        # The first compilation pauses midway, while another thread builds a config
+        if data_class is ScheduleConfig and not compiling.is_set():
+            compiling.set()
+            built.wait(0.5)
+        return compile_dataclass(self, data_class)
+
+    monkeypatch.setattr(config_builder._PlanCompiler, "_compile_dataclass", paused_compile_dataclass)
+    config_type, data = CONFIGS[0]
+    expected = dacite.from_dict(config_type, copy.deepcopy(data), DACITE_CONFIG)
+
+    def build() -> Any:
+        return outcome(lambda: build_config(config_type, copy.deepcopy(data)))
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        first = executor.submit(build)
+        assert compiling.wait(5)
+        second = build()
+        built.set()
+    assert first.result() == expected
+    assert second == expected
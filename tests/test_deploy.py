@@ -1,17 +1,20 @@
 import uuid
 from pathlib import Path
 from typing import Dict, List, Optional
+from unittest.mock import MagicMock
 
 import pytest
 from click.testing import CliRunner
 from cognite.client import CogniteClient
 from cognite.client.data_classes import (
     DataSet,
+    OidcCredentials,
     Transformation,
     TransformationJobStatus,
     TransformationNotification,
     TransformationSchedule,
 )
+from cognite.client.data_classes.transformations import SessionDetails
 from cognite.client.data_classes.transformations.common import (
     Edges,
     Instances,
@@ -20,8 +23,17 @@ from cognite.client.data_classes.transformations.common import (
     TransformationDestination,
 )
 
-from cognite.transformations_cli.commands.deploy.deploy import deploy
+from cognite.transformations_cli.commands.deploy import deploy as deploy_module
+from cognite.transformations_cli.commands.deploy.credentials_cache import VerifiedCredentialsCache
+from cognite.transformations_cli.commands.deploy.deploy import deploy, verify_all_credentials
+from cognite.transformations_cli.commands.deploy.transformation_types import TransformationConfigError
 from cognite.transformations_cli.commands.deploy.transformations_api import (
+    get_changed_fields,
+    get_data_set_ids,
+    get_existing_notifications_dict,
+    is_schedule_changed,
+    plan_transformations,
+    to_data_set_id,
     upsert_notifications,
     upsert_schedules,
     upsert_transformations,
@@ -643,3 +655,183 @@ def test_upsert_schedules(
     # Clean up after the test
     client.transformations.schedules.delete(external_id=test_transformation_ext_ids, ignore_unknown_ids=True)
     client.transformations.delete(external_id=test_transformation_ext_ids, ignore_unknown_ids=True)
+
+
+def test_get_existing_notifications_dict_lists_once() -> None:
+    client = MagicMock()
+    existing = [Transformation(id=i, external_id=f"tr{i}") for i in range(1, 4)]
+    client.transformations.notifications.list.return_value = [
+        TransformationNotification(id=10, transformation_id=1, destination="a@transformations-cli.com"),
+        TransformationNotification(id=11, transformation_id=3, destination="b@transformations-cli.com"),
+        TransformationNotification(id=12, transformation_id=1, destination="c@transformations-cli.com"),
+        TransformationNotification(id=13, transformation_id=99, destination="d@transformations-cli.com"),
+    ]
+
+    notifications = get_existing_notifications_dict(client, ["tr1", "tr2", "tr3"], existing)
+
+    client.transformations.notifications.list.assert_called_once_with(limit=-1)
+    assert {ext_id: [n.id for n in notifs] for ext_id, notifs in notifications.items()} == {
+        "tr1": [10, 12],
+        "tr3": [11],
+    }
+
+
+def test_get_data_set_ids_resolves_once() -> None:
+    client = MagicMock()
+    client.data_sets.retrieve_multiple.return_value = [
+        DataSet(id=1, external_id="ds1"),
+        DataSet(id=2, external_id="ds2"),
+    ]
+
+    data_set_ids = get_data_set_ids(client, ["ds2", "ds1", "ds2", "ds1"])
+    assert data_set_ids == {"ds1": 1, "ds2": 2}
+    client.data_sets.retrieve_multiple.assert_called_once_with(external_ids=["ds1", "ds2"], ignore_unknown_ids=True)
+
+    assert to_data_set_id(client, None, "ds2", data_set_ids) == 2
+    assert to_data_set_id(client, 5, None, data_set_ids) == 5
+    assert client.data_sets.retrieve_multiple.call_count == 1
+
+
+def test_get_data_set_ids_reports_all_missing() -> None:
+    client = MagicMock()
+    client.data_sets.retrieve_multiple.return_value = [DataSet(id=1, external_id="ds1")]
+
+    with pytest.raises(SystemExit, match="missing1, missing2"):
+        get_data_set_ids(client, ["missing2", "ds1", "missing1"])
+
+
+def test_get_changed_fields() -> None:
+    credentials = OidcCredentials(
+        client_id="client", client_secret="secret", scopes="scope", token_uri="url", cdf_project_name="project"
+    )
+    existing = Transformation(
+        external_id="tr1",
+        name="tr1",
+        query="select 1",
+        destination=TransformationDestination.raw("db", "table"),
+        conflict_mode="upsert",
+        is_public=True,
+        ignore_null_fields=False,
+        data_set_id=1,
+        tags=["b", "a"],
+        source_session=SessionDetails(session_id=1, client_id="client", project_name="project"),
+        destination_session=SessionDetails(session_id=2, client_id="other-client", project_name="project"),
+    )
+    desired = Transformation(
+        external_id="tr1",
+        name="tr1",
+        query="select 1",
+        destination=TransformationDestination.raw("db", "table"),
+        conflict_mode="upsert",
+        is_public=True,
+        ignore_null_fields=False,
+        data_set_id=1,
+        tags=["a", "b"],
+        source_oidc_credentials=credentials,
+        destination_oidc_credentials=credentials,
+    )
+    assert get_changed_fields(desired, existing) == ["source_oidc_credentials", "destination_oidc_credentials"]
+    assert get_changed_fields(desired, existing, credentials_unchanged=True) == ["destination_oidc_credentials"]
+
+    desired.query = "select 2"
+    desired.destination = TransformationDestination.raw("db", "other-table")
+    desired.data_set_id = None
+    desired.tags = []
+    desired.source_oidc_credentials = None
+    desired.destination_oidc_credentials = None
+    assert get_changed_fields(desired, existing) == ["query", "destination", "data_set_id", "tags"]
+
+
+def test_rotated_secret_is_sent() -> None:
+    existing = Transformation(
+        external_id="tr1",
+        name="tr1",
+        query="select 1",
+        source_session=SessionDetails(session_id=1, client_id="client", project_name="project"),
+        destination_session=SessionDetails(session_id=2, client_id="client", project_name="project"),
+    )
+    rotated = OidcCredentials(
+        client_id="client", client_secret="rotated-secret", scopes="scope", token_uri="url", cdf_project_name="project"
+    )
+    desired = Transformation(
+        external_id="tr1",
+        name="tr1",
+        query="select 1",
+        source_oidc_credentials=rotated,
+        destination_oidc_credentials=rotated,
+    )
+
+    updated, created = plan_transformations([desired], [existing], [])
+
+    assert updated == [(desired, ["source_oidc_credentials", "destination_oidc_credentials"])]
+    assert created == []
+    # Only a state file showing the credentials unchanged leaves them out
+    assert plan_transformations([desired], [existing], [], ["tr1"]) == ([], [])
+
+
+def test_upsert_transformations_skips_unchanged() -> None:
+    client = MagicMock()
+    existing = [
+        Transformation(external_id="tr1", name="tr1", query="select 1"),
+        Transformation(external_id="tr2", name="tr2", query="select 2"),
+    ]
+    desired = [
+        Transformation(external_id="tr1", name="tr1", query="select 1"),
+        Transformation(external_id="tr2", name="tr2", query="select 22"),
+    ]
+
+    _, updated, created = upsert_transformations(client, desired, ["tr1", "tr2"], [], 1, existing)
+
+    assert updated == ["tr2"]
+    assert created == []
+    client.transformations.update.assert_called_once()
+    (updates,) = client.transformations.update.call_args.args
+    assert [u.dump() for u in updates] == [{"externalId": "tr2", "update": {"query": {"set": "select 22"}}}]
+
+
+def test_is_schedule_changed() -> None:
+    existing = TransformationSchedule(external_id="tr1", interval="5 4 * * *", is_paused=False)
+    assert not is_schedule_changed(existing, TransformationSchedule(external_id="tr1", interval="5 4 * * *"))
+    assert is_schedule_changed(existing, TransformationSchedule(external_id="tr1", interval="5 2 * * *"))
+    assert is_schedule_changed(
+        existing, TransformationSchedule(external_id="tr1", interval="5 4 * * *", is_paused=True)
+    )
+
+
+def test_verify_all_credentials_deduplicates(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    def credentials(client_id: str) -> OidcCredentials:
+        return OidcCredentials(
+            client_id=client_id, client_secret="secret", scopes="scope", token_uri="url", cdf_project_name="project"
+        )
+
+    verified: List[str] = []
+
+    def fake_verify(type: str, credentials: OidcCredentials, cluster: str) -> None:
+        verified.append(type)
+        if credentials.client_id == "invalid":
+            raise TransformationConfigError(f"Credentials for {type} failed to validate")
+
+    monkeypatch.setattr(deploy_module, "verify_oidc_credentials", fake_verify)
+    transformations = [
+        Transformation(
+            name=f"tr{i}",
+            source_oidc_credentials=credentials("reader"),
+            destination_oidc_credentials=credentials("writer"),
+        )
+        for i in range(10)
+    ]
+    cache = VerifiedCredentialsCache(str(tmp_path / "credentials.json"), ttl=60)
+
+    verify_all_credentials(transformations, "westeurope-1", max_workers=4, cache=cache)
+    assert sorted(verified) == ["tr0 read", "tr0 write"]
+
+    verified.clear()
+    verify_all_credentials(transformations, "westeurope-1", cache=VerifiedCredentialsCache(cache.path, ttl=60))
+    assert verified == []
+    verify_all_credentials(transformations, "westeurope-1", cache=VerifiedCredentialsCache(cache.path, ttl=0))
+    assert sorted(verified) == ["tr0 read", "tr0 write"]
+
+    transformations[3].source_oidc_credentials = credentials("invalid")
+    transformations[7].source_oidc_credentials = credentials("invalid")
+    with pytest.raises(TransformationConfigError, match="Credentials for tr3 read failed"):
+        verify_all_credentials(transformations, "westeurope-1", max_workers=4)
@@ -0,0 +1,95 @@
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+from click.testing import CliRunner
+from cognite.client.data_classes import TransformationNotification, TransformationSchedule
+
+from cognite.transformations_cli.commands.deploy import deploy as deploy_module
+from cognite.transformations_cli.commands.deploy.deploy import deploy
+from cognite.transformations_cli.commands.deploy.deploy_plan import RemoteSnapshot
+from cognite.transformations_cli.commands.deploy.transformation_config import parse_transformation_configs
+from cognite.transformations_cli.commands.deploy.transformations_api import to_transformation
+
+MANIFEST = """
+externalId: {external_id}
+name: {external_id}
+query: select 1
+authentication:
+    apiKey: testApiKey
+destination: assets
+dataSetExternalId: ds
+"""
+
+OBJ = {"cluster": "westeurope-1", "cdf_project_name": "test-project"}
+TARGET = "westeurope-1/test-project"
+
+
+def plan_output(output: str) -> Dict[str, Any]:
+    return json.loads(output[output.index("{") :])
+
+
+@pytest.fixture
+def manifests(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(deploy_module, "get_client", lambda obj, timeout: None)
+    directory = tmp_path / "manifests"
+    directory.mkdir()
+    for ext_id in ["tr1", "tr2"]:
+        (directory / f"{ext_id}.yaml").write_text(MANIFEST.format(external_id=ext_id))
+    with open(directory / "tr1.yaml", "a") as f:
+        f.write("schedule: '0 * * * *'\nnotifications:\n  - a@transformations-cli.com\n")
+    return directory
+
+
+def test_plan_with_snapshot(manifests: Path, tmp_path: Path) -> None:
+    configs = parse_transformation_configs(str(manifests))
+    existing = {
+        conf.external_id: to_transformation(None, path, conf, OBJ["cluster"], {"ds": 1})  # type: ignore
+        for path, conf in configs.items()
+    }
+    snapshot = RemoteSnapshot(
+        TARGET,
+        list(existing.values()),
+        [TransformationSchedule(external_id="tr1", interval="0 * * * *", is_paused=False)],
+        {"tr1": [TransformationNotification(id=1, transformation_id=1, destination="a@transformations-cli.com")]},
+        {"ds": 1},
+    )
+    snapshot_file = str(tmp_path / "snapshot.json")
+    snapshot.save(snapshot_file)
+    runner = CliRunner()
+
+    result = runner.invoke(deploy, [str(manifests), "--plan", "--snapshot", snapshot_file], obj=OBJ)
+    assert result.exit_code == 0, result.output
+    assert plan_output(result.output) == {"target": TARGET, "operations": []}
+
+    existing["tr2"].query = "select 2"
+    snapshot = RemoteSnapshot(TARGET, [existing["tr2"]], [], {}, {"ds": 1})
+    snapshot.save(snapshot_file)
+
+    result = runner.invoke(deploy, [str(manifests), "--plan", "--snapshot", snapshot_file], obj=OBJ)
+    assert result.exit_code == 2, result.output
+    assert plan_output(result.output)["operations"] == [
+        {"resource": "transformation", "action": "update", "externalId": "tr2", "fields": ["query"]},
+        {"resource": "transformation", "action": "create", "externalId": "tr1"},
+        {"resource": "schedule", "action": "create", "externalId": "tr1", "interval": "0 * * * *", "isPaused": False},
+        {
+            "resource": "notification",
+            "action": "create",
+            "externalId": "tr1",
+            "destination": "a@transformations-cli.com",
+        },
+    ]
+
+
+def test_plan_rejects_snapshot_of_other_target(manifests: Path, tmp_path: Path) -> None:
+    snapshot_file = str(tmp_path / "snapshot.json")
+    RemoteSnapshot("westeurope-1/other", [], [], {}, {"ds": 1}).save(snapshot_file)
+
+    result = CliRunner().invoke(deploy, [str(manifests), "--plan", "--snapshot", snapshot_file], obj=OBJ)
+    assert result.exit_code == 1
+    assert "was captured from westeurope-1/other" in result.output
+
+    result = CliRunner().invoke(deploy, [str(manifests), "--snapshot", snapshot_file], obj=OBJ)
+    assert result.exit_code == 1
+    assert "can only be used together with --plan" in result.output
@@ -0,0 +1,114 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+from cognite.client._http_client import HTTPClient, HTTPClientConfig
+
+from cognite.transformations_cli.commands.deploy.deploy_report import (
+    DeployReport,
+    classify_request,
+    deploy_reporting,
+    report_drift,
+    report_phase,
+)
+
+BASE_URL = "https://westeurope-1.cognitedata.com/api/v1/projects/test-project"
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, content: Dict[str, Any]):
+        self.status_code = status_code
+        self.content = content
+
+    def json(self) -> Dict[str, Any]:
+        return self.content
+
+
+class FakeSession:
+    def __init__(self, responses: List[FakeResponse]):
+        self.responses = responses
+
+    def request(self, method: str, url: str, **kwargs: Any) -> FakeResponse:
+        return self.responses.pop(0)
+
+
+def http_client(responses: List[FakeResponse]) -> HTTPClient:
+    config = HTTPClientConfig({429}, 0, 0, 5, 5, 0, 0)
+    return HTTPClient(config, FakeSession(responses), lambda headers: None)  # type: ignore
+
+
+@pytest.mark.parametrize(
+    "method, path, expected",
+    [
+        ("POST", "/transformations/byids", ("transformations", "retrieve")),
+        ("POST", "/transformations", ("transformations", "create")),
+        ("POST", "/transformations/schedules/delete", ("transformations/schedules", "delete")),
+        ("GET", "/transformations/notifications", ("transformations/notifications", "list")),
+        ("GET", "/transformations/jobs/123", ("transformations/jobs", "retrieve")),
+    ],
+)
+def test_classify_request(method: str, path: str, expected: Any) -> None:
+    assert classify_request(method, BASE_URL + path) == expected
+    assert classify_request("GET", "https://westeurope-1.cognitedata.com/api/v1/token/inspect") == ("token", "inspect")
+
+
+def test_requests_are_recorded_with_retries() -> None:
+    report = DeployReport()
+    client = http_client(
+        [FakeResponse(429, {}), FakeResponse(200, {"items": [{}, {}]}), FakeResponse(200, {"items": [{}]})]
+    )
+    with report.recording():
+        client.request("POST", f"{BASE_URL}/transformations", json={"items": [{}, {}]})
+        client.request("GET", f"{BASE_URL}/transformations")
+        with report_phase("parse"):
+            pass
+    assert HTTPClient.request.__name__ == "request"
+
+    content = report.to_dict()
+    for stats in content["api"]["transformations"].values():
+        assert stats.pop("seconds") >= 0
+    assert content["api"] == {
+        "transformations": {
+            "create": {"calls": 1, "items": 2, "retries": 1},
+            "list": {"calls": 1, "items": 1, "retries": 0},
+        }
+    }
+    assert content["retries"] == 1
+    assert "parse" in content["phases"]
+    assert [r["operation"] for r in content["slowestRequests"]] in (["create", "list"], ["list", "create"])
+    assert 'transformations_cli_deploy_api_retries{resource="transformations",operation="create"} 1' in (
+        report.to_prometheus()
+    )
+
+
+def test_report_is_written_when_the_deploy_fails(tmp_path: Path) -> None:
+    report_file = tmp_path / "report.json"
+    prometheus_file = tmp_path / "deploy.prom"
+    with pytest.raises(SystemExit):
+        with deploy_reporting(False, str(report_file), str(prometheus_file)):
+            exit("failed")
+
+    content = json.loads(report_file.read_text())
+    assert (content["success"], content["exitCode"]) == (False, 1)
+    assert "transformations_cli_deploy_success 0" in prometheus_file.read_text()
+
+
+def test_plan_with_drift_is_reported_as_success(tmp_path: Path) -> None:
+    report_file = tmp_path / "report.json"
+    prometheus_file = tmp_path / "deploy.prom"
+    with pytest.raises(SystemExit):
+        with deploy_reporting(False, str(report_file), str(prometheus_file)):
+            report_drift()
+            exit(2)
+
+    content = json.loads(report_file.read_text())
+    assert (content["success"], content["exitCode"], content["drift"]) == (True, 2, True)
+    assert "transformations_cli_deploy_success 1" in prometheus_file.read_text()
+    assert "transformations_cli_deploy_drift 1" in prometheus_file.read_text()
+
+    # Exit code 2 without drift is still a failure
+    with pytest.raises(SystemExit):
+        with deploy_reporting(False, str(report_file)):
+            exit(2)
+    assert json.loads(report_file.read_text())["success"] is False
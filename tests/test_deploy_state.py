@@ -0,0 +1,114 @@
+import json
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+from click.testing import CliRunner
+
+from cognite.transformations_cli.commands.deploy import deploy as deploy_module
+from cognite.transformations_cli.commands.deploy.deploy import deploy
+from cognite.transformations_cli.commands.deploy.deploy_state import STATE_VERSION, DeployState, hash_text
+from cognite.transformations_cli.commands.deploy.transformation_config import parse_transformation_configs
+
+MANIFEST = """
+externalId: {external_id}
+name: {external_id}
+query:
+    file: {external_id}.sql
+authentication:
+    apiKey: testApiKey
+destination: assets
+"""
+
+OBJ = {"cluster": "westeurope-1", "cdf_project_name": "test-project"}
+
+
+@pytest.fixture
+def deployed(monkeypatch: pytest.MonkeyPatch) -> List[List[str]]:
+    calls: List[List[str]] = []
+
+    def fake_deploy(client: Any, cluster: str, configs: Dict[str, Any], *args: Any) -> None:
+        calls.append(sorted(conf.external_id for conf in configs.values()))
+
+    monkeypatch.setattr(deploy_module, "get_client", lambda obj, timeout: None)
+    monkeypatch.setattr(deploy_module, "deploy_transformation_configs", fake_deploy)
+    return calls
+
+
+def write_manifest(directory: Path, external_id: str, query: str) -> None:
+    (directory / f"{external_id}.yaml").write_text(MANIFEST.format(external_id=external_id))
+    (directory / f"{external_id}.sql").write_text(query)
+
+
+def test_deploy_with_state_file_skips_unchanged(tmp_path: Path, deployed: List[List[str]]) -> None:
+    manifests = tmp_path / "manifests"
+    manifests.mkdir()
+    state_file = str(tmp_path / "state.json")
+    write_manifest(manifests, "tr1", "select 1")
+    write_manifest(manifests, "tr2", "select 2")
+    runner = CliRunner()
+
+    result = runner.invoke(deploy, [str(manifests), "--state-file", state_file], obj=OBJ)
+    assert result.exit_code == 0, result.output
+    assert set(DeployState.load(state_file, "westeurope-1/test-project").entries) == {"tr1", "tr2"}
+
+    result = runner.invoke(deploy, [str(manifests), "--state-file", state_file], obj=OBJ)
+    assert result.exit_code == 0, result.output
+    assert "Number of transformations unchanged since the last deploy: 2" in result.output
+
+    # Changing only the SQL file makes the manifest changed
+    (manifests / "tr2.sql").write_text("select 22")
+    write_manifest(manifests, "tr3", "select 3")
+    runner.invoke(deploy, [str(manifests), "--state-file", state_file], obj=OBJ)
+
+    (manifests / "tr1.yaml").unlink()
+    result = runner.invoke(deploy, [str(manifests), "--state-file", state_file], obj=OBJ)
+    assert "Number of removed manifests dropped from the state file: 1" in result.output
+    assert set(DeployState.load(state_file, "westeurope-1/test-project").entries) == {"tr2", "tr3"}
+
+    # A state file written for another project is ignored
+    runner.invoke(deploy, [str(manifests), "--state-file", state_file], obj={**OBJ, "cdf_project_name": "other"})
+
+    assert deployed == [["tr1", "tr2"], ["tr2", "tr3"], ["tr2", "tr3"]]
+
+
+def test_state_file_of_an_older_version_is_discarded(tmp_path: Path) -> None:
+    state_file = tmp_path / "state.json"
+    target = "westeurope-1/test-project"
+    entries = {"tr1": {"fingerprint": "abc"}}
+    content = {"version": STATE_VERSION - 1, "target": target, "salt": "salt", "transformations": entries}
+    state_file.write_text(json.dumps(content))
+    assert DeployState.load(str(state_file), target).entries == {}
+
+    state_file.write_text(json.dumps({**content, "version": STATE_VERSION}))
+    assert DeployState.load(str(state_file), target).entries == entries
+
+
+def test_state_file_does_not_reveal_secrets(tmp_path: Path) -> None:
+    secret = "known-secret"
+    (tmp_path / "tr1.yaml").write_text(
+        MANIFEST.format(external_id="tr1").replace(
+            "apiKey: testApiKey",
+            f"clientId: client\n    clientSecret: {secret}\n    tokenUrl: url\n    cdfProjectName: project",
+        )
+    )
+    (tmp_path / "tr1.sql").write_text("select 1")
+    (config,) = parse_transformation_configs(str(tmp_path)).values()
+    state_file = tmp_path / "state.json"
+    state = DeployState("westeurope-1/test-project")
+    state.record(config, state.fingerprint_config(config, hash_text("select 1")), hash_text("select 1"))
+    state.save(str(state_file))
+
+    content = state_file.read_text()
+    entry = json.loads(content)["transformations"]["tr1"]
+    assert secret not in content
+    plain_hashes = {hash_text(secret), hash_text(json.dumps(asdict(config.authentication), sort_keys=True))}
+    assert entry["credentials"] not in plain_hashes
+    # The fingerprints are keyed by the salt of each state file
+    assert DeployState("westeurope-1/test-project").fingerprint_credentials(config) != entry["credentials"]
+
+    loaded = DeployState.load(str(state_file), "westeurope-1/test-project")
+    assert not loaded.credentials_changed(config)
+    config.authentication.client_secret = "rotated-secret"  # type: ignore
+    assert loaded.credentials_changed(config)
@@ -0,0 +1,104 @@
+import pytest
+
+from cognite.transformations_cli.commands.deploy import load_yaml as load_yaml_module
+from cognite.transformations_cli.commands.deploy.load_yaml import InvalidConfigError, load_yaml
+from cognite.transformations_cli.commands.deploy.transformation_types import TransformationConfig
+
+MANIFEST = """
+externalId: ${TEST_EXTERNAL_ID}
+name: prefix ${TEST_EXTERNAL_ID}
+query: ${TEST_EXTERNAL_ID} suffix
+authentication:
+    apiKey: ${TEST_API_KEY}
+destination: assets
+shared: ${TEST_SHARED}
+tags:
+    - "${TEST_EXTERNAL_ID}"
+"""
+
+INVALID_MANIFESTS = [
+    "externalId: a\nname: b: c\n",
+    "externalId: [a\nname: b\n",
+    "externalId: a\n\tname: b\n",
+]
+
+
+@pytest.fixture(autouse=True)
+def env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("TEST_EXTERNAL_ID", "my-transformation")
+    monkeypatch.setenv("TEST_API_KEY", "my-key")
+    monkeypatch.setenv("TEST_SHARED", "False")
+
+
+def with_python_loader(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(load_yaml_module, "EnvLoader", load_yaml_module.PyEnvLoader)
+    monkeypatch.setattr(load_yaml_module, "SafeLoader", load_yaml_module.PySafeLoader)
+
+
+def test_env_expansion() -> None:
+    config = load_yaml(MANIFEST, TransformationConfig, case_style="camel")
+    assert config.external_id == "my-transformation"
+    # Only values starting with a variable are expanded
+    assert config.name == "prefix ${TEST_EXTERNAL_ID}"
+    assert config.query == "my-transformation suffix"
+    assert config.shared is False
+    assert config.tags == ["${TEST_EXTERNAL_ID}"]
+
+
+def test_loaders_give_the_same_config(monkeypatch: pytest.MonkeyPatch) -> None:
+    config = load_yaml(MANIFEST, TransformationConfig, case_style="camel")
+    with_python_loader(monkeypatch)
+    python_config = load_yaml(MANIFEST, TransformationConfig, case_style="camel")
+    assert config == python_config
+    assert config._file_hash == python_config._file_hash
+
+
+@pytest.mark.parametrize("manifest", INVALID_MANIFESTS)
+def test_loaders_give_the_same_errors(manifest: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    with pytest.raises(Exception) as error:
+        load_yaml(manifest, TransformationConfig, case_style="camel")
+    with_python_loader(monkeypatch)
+    with pytest.raises(Exception) as python_error:
+        load_yaml(manifest, TransformationConfig, case_style="camel")
+    assert type(error.value) is type(python_error.value)
+    assert str(error.value) == str(python_error.value)
+
+
+def test_invalid_yaml_location() -> None:
+    with pytest.raises(InvalidConfigError, match="Invalid YAML at line 2, column 8"):
+        load_yaml("externalId: a\nname: b: c\n", TransformationConfig, case_style="camel")
+
+
+NESTED_MANIFEST = """
+base: &base
+  clientId: ${TEST_EXTERNAL_ID}
+  tokenUrl: url
+externalId: a
+authentication:
+  read:
+    <<: *base
+    cdfProjectName: p
+  write: *base
+destination:
+  type: nodes
+  view: {space: s, externalId: v, version: 1}
+matrix:
+  - [1, {innerKey: 2}]
+  - someKey: [{deepKey: 3}]
+"""
+
+
+@pytest.mark.parametrize("case_style", ["snake", "hyphen", "camel"])
+def test_normalise_matches_two_pass_translation(case_style: str) -> None:
+    data, _ = load_yaml_module._normalise_yaml(NESTED_MANIFEST, case_style)
+    assert data == load_yaml_module._to_snake_case(load_yaml_module._parse_yaml(NESTED_MANIFEST), case_style)
+    assert load_yaml_module._normalise_yaml("", case_style)[0] == load_yaml_module._to_snake_case(None, case_style)
+
+
+def test_fingerprint_covers_expanded_values(monkeypatch: pytest.MonkeyPatch) -> None:
+    _, fingerprint = load_yaml_module._normalise_yaml(MANIFEST, "camel")
+    assert load_yaml_module._normalise_yaml(MANIFEST, "camel")[1] == fingerprint
+
+    monkeypatch.setenv("TEST_API_KEY", "other-key")
+    assert load_yaml_module._normalise_yaml(MANIFEST, "camel")[1] != fingerprint
+    assert load_yaml_module._normalise_yaml(MANIFEST, "camel", expand_envvars=False)[1] != fingerprint
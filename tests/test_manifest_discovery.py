@@ -0,0 +1,98 @@
+import os
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from cognite.transformations_cli.commands.deploy import manifest_discovery
+from cognite.transformations_cli.commands.deploy.manifest_discovery import (
+    find_manifest_files,
+    is_ignored,
+    parse_ignore_rules,
+)
+
+
+def touch(root: Path, *paths: str) -> None:
+    for path in paths:
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_text("")
+
+
+def relative(root: Path, paths: List[str]) -> List[str]:
+    return [os.path.relpath(path, root).replace(os.sep, "/") for path in paths]
+
+
+@pytest.mark.parametrize(
+    "pattern, path, is_dir, ignored",
+    [
+        ("node_modules/", "node_modules", True, True),
+        ("node_modules/", "a/node_modules", True, True),
+        ("node_modules/", "node_modules", False, False),
+        ("*.yml", "a/b/c.yml", False, True),
+        ("*.yml", "a/b/c.yaml", False, False),
+        ("/build", "build", True, True),
+        ("/build", "a/build", True, False),
+        ("a/*.yaml", "a/b.yaml", False, True),
+        ("a/*.yaml", "a/b/c.yaml", False, False),
+        ("a/**/c.yaml", "a/c.yaml", False, True),
+        ("a/**/c.yaml", "a/b/d/c.yaml", False, True),
+        ("**/vendor", "x/y/vendor", True, True),
+        ("vendor/**", "vendor/x.yaml", False, True),
+        ("test_?.yaml", "test_1.yaml", False, True),
+        ("test_[0-4].yaml", "test_5.yaml", False, False),
+        ("test_[!0-4].yaml", "test_5.yaml", False, True),
+        ("# comment", "# comment", False, False),
+        ("\\#file.yaml", "#file.yaml", False, True),
+    ],
+)
+def test_ignore_patterns(pattern: str, path: str, is_dir: bool, ignored: bool) -> None:
+    assert is_ignored(parse_ignore_rules(pattern), path, is_dir) == ignored
+
+
+def test_ignore_negation() -> None:
+    rules = parse_ignore_rules("*.yaml\n!keep.yaml\n")
+    assert is_ignored(rules, "drop.yaml", False)
+    assert not is_ignored(rules, "a/keep.yaml", False)
+
+
+def test_find_manifest_files(tmp_path: Path) -> None:
+    touch(
+        tmp_path,
+        "b.yml",
+        "a.yaml",
+        "notes.txt",
+        "team/z.yaml",
+        "team/drafts/draft.yaml",
+        "team/keep.yaml",
+        "node_modules/pkg/config.yaml",
+        ".git/config.yaml",
+        ".hidden.yaml",
+        "sub/.transformationsignore",
+        "sub/x.yaml",
+        "sub/generated.yaml",
+    )
+    (tmp_path / ".transformationsignore").write_text("node_modules/\n/team/drafts\n")
+    (tmp_path / "sub" / ".transformationsignore").write_text("generated.yaml\n")
+
+    assert relative(tmp_path, find_manifest_files(str(tmp_path))) == [
+        "a.yaml",
+        "b.yml",
+        "sub/x.yaml",
+        "team/keep.yaml",
+        "team/z.yaml",
+    ]
+
+
+def test_find_manifest_files_prunes_ignored_directories(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    touch(tmp_path, "a.yaml", "node_modules/deep/er/config.yaml")
+    (tmp_path / ".transformationsignore").write_text("node_modules/\n")
+    visited: List[str] = []
+    walk = manifest_discovery._walk
+
+    def tracking_walk(directory: str, *args: object) -> None:
+        visited.append(directory)
+        walk(directory, *args)  # type: ignore
+
+    monkeypatch.setattr(manifest_discovery, "_walk", tracking_walk)
+    assert relative(tmp_path, find_manifest_files(str(tmp_path))) == ["a.yaml"]
+    assert visited == [str(tmp_path)]
@@ -0,0 +1,142 @@
+import os
+import stat
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from cognite.transformations_cli.commands.deploy import transformation_config
+from cognite.transformations_cli.commands.deploy.parse_cache import ParseCache
+from cognite.transformations_cli.commands.deploy.transformation_config import parse_transformation_configs
+
+MANIFEST = """
+externalId: {external_id}
+name: {external_id}
+query:
+    file: {external_id}.sql
+authentication:
+    clientId: ${{TEST_PARSE_CACHE_CLIENT_ID}}
+    clientSecret: secret
+    tokenUrl: url
+    scopes:
+        - scope
+    cdfProjectName: project
+destination: assets
+"""
+
+LEGACY_MANIFEST = """
+legacy: true
+externalId: legacy
+name: legacy
+query: legacy.sql
+apiKey: TEST_PARSE_CACHE_API_KEY
+destination: assets
+"""
+
+
+@pytest.fixture
+def parsed(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    monkeypatch.setenv("TEST_PARSE_CACHE_CLIENT_ID", "client")
+    monkeypatch.setenv("TEST_PARSE_CACHE_API_KEY", "key")
+    paths: List[str] = []
+    parse_and_validate = transformation_config._parse_and_validate
+
+    def record(args: tuple) -> object:
+        paths.append(os.path.basename(args[0]))
+        return parse_and_validate(args)
+
+    monkeypatch.setattr(transformation_config, "_parse_and_validate", record)
+    return paths
+
+
+def write(root: Path, external_id: str, manifest: str = MANIFEST) -> None:
+    (root / f"{external_id}.yaml").write_text(manifest.format(external_id=external_id))
+    (root / f"{external_id}.sql").write_text(f"select '{external_id}'")
+
+
+def deploy_parse(root: Path, cache_path: Path) -> List[str]:
+    cache = ParseCache(str(cache_path))
+    configs = parse_transformation_configs(str(root), parse_cache=cache)
+    cache.save()
+    return sorted(conf.external_id for conf in configs.values())
+
+
+def test_unchanged_manifests_are_not_parsed(tmp_path: Path, parsed: List[str]) -> None:
+    root = tmp_path / "manifests"
+    root.mkdir()
+    write(root, "a")
+    write(root, "b")
+    cache_path = tmp_path / "cache"
+
+    assert deploy_parse(root, cache_path) == ["a", "b"]
+    assert parsed == ["a.yaml", "b.yaml"]
+    assert stat.S_IMODE(os.stat(cache_path).st_mode) == 0o600
+
+    parsed.clear()
+    assert deploy_parse(root, cache_path) == ["a", "b"]
+    assert parsed == []
+
+    (root / "b.yaml").write_text(MANIFEST.format(external_id="b").replace("name: b", "name: renamed"))
+    assert deploy_parse(root, cache_path) == ["a", "b"]
+    assert parsed == ["b.yaml"]
+
+    os.remove(root / "b.yaml")
+    assert deploy_parse(root, cache_path) == ["a"]
+    assert list(ParseCache(str(cache_path)).entries) == [str(root / "a.yaml")]
+
+
+def test_sql_changes_invalidate_and_environment_is_expanded_on_load(
+    tmp_path: Path, parsed: List[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    write(tmp_path, "a")
+    write(tmp_path, "b")
+    cache_path = tmp_path / "cache.pickle"
+    deploy_parse(tmp_path, cache_path)
+
+    parsed.clear()
+    (tmp_path / "a.sql").write_text("select 'changed'")
+    deploy_parse(tmp_path, cache_path)
+    assert parsed == ["a.yaml"]
+
+    # Same size and possibly the same mtime, told apart by the content hash
+    parsed.clear()
+    (tmp_path / "b.sql").write_text("select 'B'")
+    deploy_parse(tmp_path, cache_path)
+    assert parsed == ["b.yaml"]
+
+    # Cached documents keep their references, expanded in the environment of each deploy
+    parsed.clear()
+    monkeypatch.setenv("TEST_PARSE_CACHE_CLIENT_ID", "other-client")
+    cache = ParseCache(str(cache_path))
+    configs = parse_transformation_configs(str(tmp_path), parse_cache=cache)
+    assert parsed == []
+    assert {conf.authentication.client_id for conf in configs.values()} == {"other-client"}
+    assert "other-client" not in cache_path.read_text() and "${TEST_PARSE_CACHE_CLIENT_ID}" in cache_path.read_text()
+
+
+def test_untrusted_cache_is_ignored(tmp_path: Path, parsed: List[str]) -> None:
+    write(tmp_path, "a")
+    cache_path = tmp_path / "cache"
+    deploy_parse(tmp_path, cache_path)
+
+    parsed.clear()
+    os.chmod(cache_path, 0o666)
+    deploy_parse(tmp_path, cache_path)
+    assert parsed == ["a.yaml"]
+    assert stat.S_IMODE(os.stat(cache_path).st_mode) == 0o600
+
+    # Caches of earlier versions are not loaded, and are replaced
+    parsed.clear()
+    cache_path.write_bytes(b"\x80\x05not json")
+    os.chmod(cache_path, 0o600)
+    deploy_parse(tmp_path, cache_path)
+    assert parsed == ["a.yaml"]
+    assert ParseCache(str(cache_path)).entries
+
+
+def test_legacy_manifests_are_always_parsed(tmp_path: Path, parsed: List[str]) -> None:
+    write(tmp_path, "legacy", LEGACY_MANIFEST)
+    cache_path = tmp_path / "cache"
+    deploy_parse(tmp_path, cache_path)
+    deploy_parse(tmp_path, cache_path)
+    assert parsed == ["legacy.yaml", "legacy.yaml"]
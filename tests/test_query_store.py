@@ -0,0 +1,60 @@
+from pathlib import Path
+from typing import Dict, Union
+
+import pytest
+
+from cognite.transformations_cli.commands.deploy.deploy_state import hash_text
+from cognite.transformations_cli.commands.deploy.query_store import QueryStore
+from cognite.transformations_cli.commands.deploy.transformation_types import (
+    AuthConfig,
+    DestinationType,
+    QueryConfig,
+    TransformationConfig,
+    TransformationConfigError,
+)
+
+
+def to_config(external_id: str, query: Union[str, QueryConfig]) -> TransformationConfig:
+    return TransformationConfig(
+        external_id=external_id,
+        name=external_id,
+        query=query,
+        authentication=AuthConfig("key", None, None, None, None, None, None),
+        schedule=None,
+        destination=DestinationType.assets,
+        data_set_id=None,
+        data_set_external_id=None,
+    )
+
+
+def test_shared_sql_files_are_read_once(tmp_path: Path) -> None:
+    (tmp_path / "shared.sql").write_text("select 1")
+    (tmp_path / "copy.sql").write_text("select 1")
+    (tmp_path / "nested").mkdir()
+    configs: Dict[str, TransformationConfig] = {
+        str(tmp_path / "a.yaml"): to_config("a", QueryConfig("shared.sql")),
+        str(tmp_path / "nested" / "b.yaml"): to_config("b", QueryConfig("../shared.sql")),
+        str(tmp_path / "c.yaml"): to_config("c", QueryConfig("copy.sql")),
+        str(tmp_path / "d.yaml"): to_config("d", "select 1"),
+    }
+
+    queries = QueryStore.load(configs)
+
+    assert len(queries.file_hashes) == 2
+    assert queries.queries == {hash_text("select 1"): "select 1"}
+    assert {queries.query_hash(path) for path in configs} == {hash_text("select 1")}
+    assert queries.query(str(tmp_path / "nested" / "b.yaml")) == "select 1"
+
+
+def test_all_missing_sql_files_are_reported(tmp_path: Path) -> None:
+    configs = {
+        str(tmp_path / "a.yaml"): to_config("a", QueryConfig("a.sql")),
+        str(tmp_path / "b.yaml"): to_config("b", QueryConfig("b.sql")),
+        str(tmp_path / "c.yaml"): to_config("c", "select 1"),
+    }
+
+    with pytest.raises(TransformationConfigError) as e:
+        QueryStore.load(configs)
+
+    assert "2 manifest(s)" in e.value.message
+    assert str(tmp_path / "a.sql") in e.value.message and str(tmp_path / "b.sql") in e.value.message
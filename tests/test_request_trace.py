@@ -0,0 +1,76 @@
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+
+from click.testing import CliRunner
+from cognite.client._http_client import HTTPClient, HTTPClientConfig
+
+from cognite.transformations_cli.commands.base import transformations_cli
+from cognite.transformations_cli.commands.deploy.deploy_report import DeployReport
+from cognite.transformations_cli.request_trace import request_tracing
+
+BASE_URL = "https://westeurope-1.cognitedata.com/api/v1/projects/test-project"
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, content: Dict[str, Any]):
+        self.status_code = status_code
+        self.content = json.dumps(content).encode("utf-8")
+        self.headers: Dict[str, str] = dict()
+
+    def json(self) -> Dict[str, Any]:
+        return json.loads(self.content)
+
+
+class FakeSession:
+    def __init__(self, responses: List[FakeResponse]):
+        self.responses = responses
+
+    def request(self, method: str, url: str, **kwargs: Any) -> FakeResponse:
+        return self.responses.pop(0)
+
+
+def http_client(responses: List[FakeResponse]) -> HTTPClient:
+    config = HTTPClientConfig({429}, 0, 0, 5, 5, 0, 0)
+    return HTTPClient(config, FakeSession(responses), lambda headers: None)  # type: ignore
+
+
+def test_requests_are_traced_as_chrome_trace_events(tmp_path: Path) -> None:
+    trace_file = tmp_path / "trace.json"
+    client = http_client(
+        [FakeResponse(429, {}), FakeResponse(200, {"items": [{}, {}]}), FakeResponse(200, {"items": [{}]})]
+    )
+    report = DeployReport()
+    with request_tracing(str(trace_file), "deploy"):
+        with report.recording():
+            client.request("POST", f"{BASE_URL}/transformations", data=b"0123456789", json={"items": [{}, {}]})
+        thread = threading.Thread(target=client.request, args=("GET", f"{BASE_URL}/transformations/jobs/12"))
+        thread.start()
+        thread.join()
+    assert HTTPClient.request.__name__ == "request"
+
+    trace = json.loads(trace_file.read_text())
+    assert trace["otherData"] == {"command": "deploy", "requests": 2}
+    requests = [event for event in trace["traceEvents"] if event.get("cat") == "http"]
+    assert [event["name"] for event in requests] == ["POST /transformations", "GET /transformations/jobs/12"]
+    assert requests[0]["ph"] == "X" and requests[0]["dur"] >= 0 and requests[0]["tid"] != requests[1]["tid"]
+    assert {key: requests[0]["args"][key] for key in ["status", "items", "requestBytes", "retries"]} == {
+        "status": 200,
+        "items": 2,
+        "requestBytes": 10,
+        "retries": 1,
+    }
+    assert requests[1]["args"]["responseBytes"] == len(b'{"items": [{}]}')
+    attempts = [event for event in trace["traceEvents"] if event.get("cat") == "http.attempt"]
+    assert [event["args"]["status"] for event in attempts] == [429, 200]
+    # The deploy report only recorded the requests sent while it was recording
+    assert report.to_dict()["api"]["transformations"]["create"]["retries"] == 1
+    assert "transformations/jobs" not in report.to_dict()["api"]
+
+
+def test_trace_is_written_when_the_command_fails(tmp_path: Path) -> None:
+    trace_file = tmp_path / "trace.json"
+    result = CliRunner().invoke(transformations_cli, ["--trace", str(trace_file), "run"])
+    assert result.exit_code == 1
+    assert json.loads(trace_file.read_text())["otherData"] == {"command": "run", "requests": 0}
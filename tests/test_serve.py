@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from cognite.transformations_cli.commands.serve import CommandServer
+from cognite.transformations_cli.serve_client import forward_command
+
+
+@pytest.fixture
+def socket_path(tmp_path: Path) -> Iterator[str]:
+    path = str(tmp_path / "serve.sock")
+    server = CommandServer(path)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield path
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+
+def test_commands_are_served_as_run_directly(
+    socket_path: str, capsys: pytest.CaptureFixture, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("COLUMNS", "100")
+    direct = subprocess.run(
+        [sys.executable, "-m", "cognite.transformations_cli", "--help"], capture_output=True, text=True, check=True
+    )
+    assert forward_command(socket_path, ["--help"], "python -m cognite.transformations_cli") == 0
+    assert capsys.readouterr().out == direct.stdout
+
+    assert forward_command(socket_path, ["--cluster", "westeurope-1", "run"], "transformations-cli") == 1
+    assert capsys.readouterr().err == "Please provide one of id and external id.\n"
+
+    assert forward_command(socket_path, ["run", "--no-such-option"], "transformations-cli") == 2
+    assert capsys.readouterr().err.startswith("Usage: transformations-cli run [OPTIONS]\n")
+    assert os.path.exists(socket_path)
+
+
+def test_unserved_commands_fall_back(socket_path: str, tmp_path: Path) -> None:
+    assert forward_command(socket_path, ["jobs", "--interactive"]) is None
+    assert forward_command(socket_path, ["compile", "manifests", "bundle.json"]) is None
+    assert forward_command(str(tmp_path / "missing.sock"), ["run"]) is None
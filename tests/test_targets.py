@@ -0,0 +1,106 @@
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import pytest
+from click.testing import CliRunner
+
+from cognite.transformations_cli.commands.deploy import bundle as bundle_module
+from cognite.transformations_cli.commands.deploy import deploy as deploy_module
+from cognite.transformations_cli.commands.deploy.deploy import deploy
+
+MANIFEST = """
+externalId: {external_id}
+name: {external_id}
+query:
+    file: shared.sql
+authentication:
+    clientId: client
+    clientSecret: ${{TEST_TARGETS_SECRET}}
+    tokenUrl: url
+    scopes:
+        - scope
+    cdfProjectName: ${{TEST_TARGETS_PROJECT}}
+destination: assets
+"""
+
+TARGETS = """
+targets:
+    - name: dev
+      cdfProjectName: dev-project
+      env:
+          - name: TEST_TARGETS_PROJECT
+            value: dev-project
+    - cdfProjectName: prod-project
+      cluster: other-cluster
+      clientSecret: ${TEST_TARGETS_PROD_CLIENT_SECRET}
+      env:
+          - name: TEST_TARGETS_PROJECT
+            value: prod-project
+    - name: broken
+      cdfProjectName: broken-project
+"""
+
+OBJ = {"cluster": "westeurope-1", "cdf_project_name": "test-project", "client_secret": "global-secret"}
+
+
+@pytest.fixture
+def deployed(monkeypatch: pytest.MonkeyPatch) -> List[Tuple[str, str, List[str]]]:
+    calls: List[Tuple[str, str, List[str]]] = []
+
+    def get_client(obj: Dict, timeout: int) -> Dict:
+        if obj["cdf_project_name"] == "broken-project":
+            exit("Cognite client cannot be initialised: invalid credentials.")
+        return obj
+
+    def fake_deploy(client: Dict, cluster: str, configs: Dict[str, Any], *args: Any) -> None:
+        calls.append(
+            (
+                cluster,
+                client["client_secret"],
+                sorted(conf.authentication.cdf_project_name for conf in configs.values()),
+            )
+        )
+
+    monkeypatch.setenv("TEST_TARGETS_SECRET", "secret")
+    monkeypatch.setenv("TEST_TARGETS_PROJECT", "default-project")
+    monkeypatch.setenv("TEST_TARGETS_PROD_CLIENT_SECRET", "prod-secret")
+    monkeypatch.setattr(deploy_module, "get_client", get_client)
+    monkeypatch.setattr(deploy_module, "deploy_transformation_configs", fake_deploy)
+    return calls
+
+
+def test_deploy_to_targets(tmp_path: Path, deployed: List[Tuple[str, str, List[str]]], monkeypatch: Any) -> None:
+    manifests = tmp_path / "manifests"
+    manifests.mkdir()
+    for external_id in ["tr1", "tr2"]:
+        (manifests / f"{external_id}.yaml").write_text(MANIFEST.format(external_id=external_id))
+    (manifests / "shared.sql").write_text("select 1")
+    targets = tmp_path / "targets.yaml"
+    targets.write_text(TARGETS)
+    read: List[str] = []
+    read_manifest = bundle_module._read_manifest
+    monkeypatch.setattr(
+        bundle_module, "_read_manifest", lambda path, legacy: read.append(path) or read_manifest(path, legacy)
+    )
+
+    result = CliRunner().invoke(deploy, [str(manifests), "--targets", str(targets)], obj=OBJ)
+
+    assert result.exit_code == 1
+    assert len(read) == 2
+    assert sorted(deployed) == [
+        ("other-cluster", "prod-secret", ["prod-project", "prod-project"]),
+        ("westeurope-1", "global-secret", ["dev-project", "dev-project"]),
+    ]
+    assert "[broken] Deploy failed: Cognite client cannot be initialised: invalid credentials." in result.output
+    assert "other-cluster/prod-project  deployed" in result.output
+    assert "Deploy failed for 1 of 3 targets: broken" in result.output
+
+
+def test_targets_cannot_share_a_state_file(tmp_path: Path) -> None:
+    targets = tmp_path / "targets.yaml"
+    targets.write_text(TARGETS)
+    result = CliRunner().invoke(
+        deploy, [str(tmp_path), "--targets", str(targets), "--state-file", str(tmp_path / "state.json")], obj=OBJ
+    )
+    assert result.exit_code == 1
+    assert "set stateFile per target instead" in result.output
@@ -0,0 +1,132 @@
+import threading
+import time
+from typing import Any, List
+
+import pytest
+
+from cognite.transformations_cli.commands.deploy import deploy as deploy_module
+from cognite.transformations_cli.commands.deploy.batching import AdaptiveBatcher
+from cognite.transformations_cli.commands.deploy.task_graph import TaskGraph
+
+
+def test_independent_tasks_overlap() -> None:
+    started = threading.Event()
+    graph = TaskGraph()
+    graph.add("a", lambda: started.wait(5))
+    graph.add("b", lambda: started.set() or 2)
+    graph.add("c", lambda a, b: (a, b), ["a", "b"])
+
+    assert graph.run()["c"] == (True, 2)
+    assert graph.critical_path() == ["a", "c"]
+    assert graph.format_critical_path().startswith("Critical path (")
+
+
+def test_failed_task_stops_dependents() -> None:
+    ran: List[str] = []
+    graph = TaskGraph()
+    graph.add("fails", lambda: 1 / 0)
+    graph.add("slow", lambda: time.sleep(0.05) or ran.append("slow"))
+    graph.add("dependent", lambda _: ran.append("dependent"), ["fails"])
+
+    with pytest.raises(ZeroDivisionError):
+        graph.run()
+    assert ran == ["slow"]
+
+    with pytest.raises(ValueError):
+        graph.add("cycle", lambda: None, ["missing"])
+
+
+def test_deploy_overlaps_lookups_with_verification(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: List[str] = []
+    schedules_fetched = threading.Event()
+
+    def record(name: str, result: Any = None) -> Any:
+        def action(*args: Any, **kwargs: Any) -> Any:
+            calls.append(name)
+            return result
+
+        return action
+
+    def verify(*args: Any) -> None:
+        # Would time out if the lookups only started after the credentials were verified
+        assert schedules_fetched.wait(5)
+        calls.append("verify")
+
+    def fetch_schedules(*args: Any) -> dict:
+        schedules_fetched.set()
+        return {}
+
+    monkeypatch.setattr(deploy_module, "get_data_set_ids", record("data_sets", {}))
+    monkeypatch.setattr(deploy_module, "to_transformation", record("convert"))
+    monkeypatch.setattr(deploy_module, "verify_all_credentials", verify)
+    monkeypatch.setattr(deploy_module, "get_existing_transformations", record("existing_transformations", []))
+    monkeypatch.setattr(deploy_module, "get_existing_schedules_dict", fetch_schedules)
+    monkeypatch.setattr(deploy_module, "get_existing_notifications_dict", record("existing_notifications", {}))
+    monkeypatch.setattr(deploy_module, "upsert_transformations", record("transformations", ([], [], [])))
+    monkeypatch.setattr(deploy_module, "upsert_schedules", record("schedules", ([], [], [])))
+    monkeypatch.setattr(deploy_module, "upsert_notifications", record("notifications", ([], [], [])))
+    monkeypatch.setattr(deploy_module.QueryStore, "load", record("queries"))
+
+    deploy_module.deploy_transformation_configs(None, "cluster", {})  # type: ignore
+
+    assert calls.index("transformations") > calls.index("verify")
+    assert calls.index("schedules") > calls.index("transformations")
+    assert calls.index("notifications") > calls.index("transformations")
+
+
+def test_tasks_see_the_target_label(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture) -> None:
+    def returning(result: Any) -> Any:
+        return lambda *args, **kwargs: result
+
+    monkeypatch.setattr(deploy_module, "get_data_set_ids", returning({}))
+    monkeypatch.setattr(deploy_module, "verify_all_credentials", returning(None))
+    monkeypatch.setattr(deploy_module, "get_existing_transformations", returning([]))
+    monkeypatch.setattr(deploy_module, "get_existing_schedules_dict", returning({}))
+    monkeypatch.setattr(deploy_module, "get_existing_notifications_dict", returning({}))
+    monkeypatch.setattr(deploy_module, "upsert_transformations", returning(([], [], ["created"])))
+    monkeypatch.setattr(deploy_module, "upsert_schedules", returning(([], [], [])))
+    monkeypatch.setattr(deploy_module, "upsert_notifications", returning(([], [], [])))
+    monkeypatch.setattr(deploy_module.QueryStore, "load", returning(None))
+
+    token = deploy_module._target_label.set("target")
+    try:
+        deploy_module.deploy_transformation_configs(None, "cluster", {})  # type: ignore
+    finally:
+        deploy_module._target_label.reset(token)
+
+    # Printed by the task writing the transformations
+    assert "[target] Number of transformations created: 1" in capsys.readouterr().out
+
+
+def test_deploy_tasks_share_the_request_bound(monkeypatch: pytest.MonkeyPatch) -> None:
+    lock = threading.Lock()
+    in_flight: List[int] = [0, 0]
+
+    def request(batch: List[int]) -> None:
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight[0] -= 1
+
+    def requesting(result: Any) -> Any:
+        def action(*args: Any, **kwargs: Any) -> Any:
+            AdaptiveBatcher(1).run(request, list(range(4)), max_workers=2)
+            return result
+
+        return action
+
+    monkeypatch.setattr(deploy_module, "get_data_set_ids", requesting({}))
+    monkeypatch.setattr(deploy_module, "to_transformation", lambda *args: None)
+    monkeypatch.setattr(deploy_module, "verify_all_credentials", requesting(None))
+    monkeypatch.setattr(deploy_module, "get_existing_transformations", requesting([]))
+    monkeypatch.setattr(deploy_module, "get_existing_schedules_dict", requesting({}))
+    monkeypatch.setattr(deploy_module, "get_existing_notifications_dict", requesting({}))
+    monkeypatch.setattr(deploy_module, "upsert_transformations", requesting(([], [], [])))
+    monkeypatch.setattr(deploy_module, "upsert_schedules", requesting(([], [], [])))
+    monkeypatch.setattr(deploy_module, "upsert_notifications", requesting(([], [], [])))
+    monkeypatch.setattr(deploy_module.QueryStore, "load", lambda *args: None)
+
+    deploy_module.deploy_transformation_configs(None, "cluster", {}, max_workers=2)  # type: ignore
+    assert 0 < in_flight[1] <= 2
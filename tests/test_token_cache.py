@@ -0,0 +1,66 @@
+import os
+import stat
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+from cognite.client.credentials import OAuthClientCredentials
+
+from cognite.transformations_cli.token_cache import TOKEN_CACHE_MIN_TTL_SECONDS, CachedOAuthClientCredentials
+
+
+@pytest.fixture
+def fetched(monkeypatch: pytest.MonkeyPatch) -> List[float]:
+    expiries: List[float] = []
+
+    def fetch_token(self: OAuthClientCredentials) -> Tuple[str, float]:
+        expires_at = time.time() + (3600 if not expiries else 30)
+        expiries.append(expires_at)
+        return f"token-{len(expiries)}", expires_at
+
+    monkeypatch.setattr(OAuthClientCredentials, "_refresh_access_token", fetch_token)
+    return expiries
+
+
+def credentials(cache_path: Path, client_secret: str = "secret") -> CachedOAuthClientCredentials:
+    return CachedOAuthClientCredentials(str(cache_path), "https://idp/token", "client", client_secret, ["scope"])
+
+
+def test_tokens_are_shared_between_invocations(tmp_path: Path, fetched: List[float]) -> None:
+    cache_path = tmp_path / "cache" / "tokens.json"
+
+    assert credentials(cache_path).authorization_header() == ("Authorization", "Bearer token-1")
+    assert credentials(cache_path).authorization_header() == ("Authorization", "Bearer token-1")
+    assert len(fetched) == 1
+    assert stat.S_IMODE(os.stat(cache_path).st_mode) == 0o600
+    assert "secret" not in cache_path.read_text()
+
+    # Another secret gets its own token, which expires too soon to be reused
+    assert credentials(cache_path, "other").authorization_header() == ("Authorization", "Bearer token-2")
+    assert fetched[1] - time.time() < TOKEN_CACHE_MIN_TTL_SECONDS
+    assert credentials(cache_path, "other").authorization_header() == ("Authorization", "Bearer token-3")
+
+
+def test_cache_readable_by_others_is_ignored(tmp_path: Path, fetched: List[float]) -> None:
+    cache_path = tmp_path / "tokens.json"
+    credentials(cache_path).authorization_header()
+    os.chmod(cache_path, 0o644)
+
+    credentials(cache_path).authorization_header()
+    assert len(fetched) == 2
+    assert stat.S_IMODE(os.stat(cache_path).st_mode) == 0o600
+
+
+def test_unwritable_cache_does_not_fail(tmp_path: Path, fetched: List[float]) -> None:
+    (tmp_path / "file").write_text("")
+    read_only = tmp_path / "read-only"
+    read_only.mkdir(mode=0o500)
+    # Under a file instead of a directory, and in a directory the user cannot write to, unless root
+    cache_paths = [tmp_path / "file" / "cache" / "tokens.json"]
+    if os.geteuid() != 0:
+        cache_paths.append(read_only / "tokens.json")
+    for cache_path in cache_paths:
+        header = credentials(cache_path).authorization_header()
+        assert header == ("Authorization", f"Bearer token-{len(fetched)}")
+        assert not cache_path.exists()
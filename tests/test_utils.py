@@ -0,0 +1,54 @@
+import contextvars
+import threading
+import time
+from typing import List
+
+import pytest
+
+from cognite.transformations_cli.commands.utils import chunk_items, run_concurrently
+
+
+def test_run_concurrently_keeps_input_order() -> None:
+    def slow_square(x: int) -> int:
+        time.sleep(0.01 * (5 - x))
+        return x * x
+
+    assert run_concurrently(slow_square, range(5), max_workers=5) == [0, 1, 4, 9, 16]
+    assert run_concurrently(slow_square, range(5), max_workers=1) == [0, 1, 4, 9, 16]
+
+
+def test_run_concurrently_is_bounded() -> None:
+    lock = threading.Lock()
+    running: List[int] = [0, 0]
+
+    def track(_: List[int]) -> None:
+        with lock:
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+
+    run_concurrently(track, chunk_items(list(range(100))), max_workers=3)
+    assert running[1] <= 3
+
+
+def test_run_concurrently_stops_on_first_error() -> None:
+    started: List[int] = []
+
+    def fail_on_two(x: int) -> int:
+        started.append(x)
+        if x == 2:
+            raise ValueError(f"failed on {x}")
+        time.sleep(0.05)
+        return x
+
+    with pytest.raises(ValueError, match="failed on 2"):
+        run_concurrently(fail_on_two, range(50), max_workers=4)
+    assert len(started) < 50
+
+
+def test_run_concurrently_copies_the_context() -> None:
+    label: contextvars.ContextVar[str] = contextvars.ContextVar("label", default="")
+    label.set("target")
+    assert run_concurrently(lambda i: f"{label.get()} {i}", [1, 2], max_workers=2) == ["target 1", "target 2"]